@@ -32,6 +32,7 @@ from app.models import (
     TeamMembership,
     Todo,
     Notification,
+    RealtimeOutbox,
 )
 
 # Explicitly import each model module to ensure they're registered
@@ -40,6 +41,8 @@ import app.models.user  # noqa: F401
 import app.models.team  # noqa: F401
 import app.models.todo  # noqa: F401
 import app.models.notification  # noqa: F401
+import app.models.outbox  # noqa: F401
+from app.services.notification_retention import PARTITION_NAME
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -68,6 +71,13 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the monthly notification partitions, managed outside migrations, to the retention job"""
+    if type_ == "table" and reflected and compare_to is None and PARTITION_NAME.match(name):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -111,7 +121,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
-            include_object=None,  # Include all objects
+            include_object=include_object,
             render_as_batch=False,  # Use standard ALTER TABLE for PostgreSQL
         )
 
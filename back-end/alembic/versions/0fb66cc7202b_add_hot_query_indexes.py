@@ -0,0 +1,61 @@
+"""add indexes for hot query shapes
+
+Revision ID: 0fb66cc7202b
+Revises: ccf2e487e30a
+Create Date: 2026-10-17 23:58:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0fb66cc7202b'
+down_revision: Union[str, None] = 'ccf2e487e30a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and
+    # building concurrently keeps the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_todos_team_due_created',
+            'todos',
+            ['team_id', sa.text('due_date ASC NULLS LAST'), sa.text('created_at DESC'), 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_todos_assignee_id',
+            'todos',
+            ['assignee_id'],
+            postgresql_where=sa.text('assignee_id IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_notifications_user_created',
+            'notifications',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_team_memberships_user_created',
+            'team_memberships',
+            ['user_id', 'created_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_team_memberships_user_created', table_name='team_memberships', postgresql_concurrently=True)
+        op.drop_index('ix_notifications_user_created', table_name='notifications', postgresql_concurrently=True)
+        op.drop_index('ix_todos_assignee_id', table_name='todos', postgresql_concurrently=True)
+        op.drop_index('ix_todos_team_due_created', table_name='todos', postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""add unread notifications index
+
+Revision ID: 23505085dfa2
+Revises: 51f31b5e9fe4
+Create Date: 2026-10-18 00:09:21.417305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '23505085dfa2'
+down_revision: Union[str, None] = '51f31b5e9fe4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only unread rows are indexed, so the index stays small as users catch up;
+    # it serves the unread count and mark-read up to a cursor
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notifications_user_unread',
+            'notifications',
+            ['user_id', 'created_at', 'id'],
+            postgresql_where=sa.text('read = false'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_notifications_user_unread', table_name='notifications', postgresql_concurrently=True)
@@ -0,0 +1,121 @@
+"""add team todo counters
+
+Revision ID: 51f31b5e9fe4
+Revises: b2d87b5be343
+Create Date: 2026-10-18 00:01:22.169015
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '51f31b5e9fe4'
+down_revision: Union[str, None] = 'b2d87b5be343'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Applies one todo's contribution (+1 or -1) to the team counters. Rows that
+# drop to zero are removed so the tables only hold keys that are in use.
+APPLY_FUNCTION = """
+CREATE FUNCTION team_todo_counters_apply(
+    p_team_id uuid, p_status todostatus, p_assignee_id uuid, p_due_date timestamp, p_delta integer
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO team_todo_counts (team_id, status, assignee_id, count)
+    VALUES (p_team_id, p_status, p_assignee_id, p_delta)
+    ON CONFLICT (team_id, status, assignee_id)
+    DO UPDATE SET count = team_todo_counts.count + EXCLUDED.count;
+    DELETE FROM team_todo_counts
+    WHERE team_id = p_team_id AND status = p_status
+      AND assignee_id IS NOT DISTINCT FROM p_assignee_id AND count = 0;
+
+    IF p_due_date IS NOT NULL AND p_status <> 'DONE' THEN
+        INSERT INTO team_todo_due_counts (team_id, due_day, count)
+        VALUES (p_team_id, p_due_date::date, p_delta)
+        ON CONFLICT (team_id, due_day)
+        DO UPDATE SET count = team_todo_due_counts.count + EXCLUDED.count;
+        DELETE FROM team_todo_due_counts
+        WHERE team_id = p_team_id AND due_day = p_due_date::date AND count = 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGER_FUNCTION = """
+CREATE FUNCTION todos_maintain_team_counters() RETURNS trigger AS $$
+BEGIN
+    -- A todo removed with its team has nothing left to count
+    IF TG_OP <> 'INSERT' AND EXISTS (SELECT 1 FROM teams WHERE id = OLD.team_id) THEN
+        PERFORM team_todo_counters_apply(OLD.team_id, OLD.status, OLD.assignee_id, OLD.due_date, -1);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM team_todo_counters_apply(NEW.team_id, NEW.status, NEW.assignee_id, NEW.due_date, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_table('team_todo_counts',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('team_id', sa.UUID(), nullable=False),
+    sa.Column('status', postgresql.ENUM('BACKLOG', 'IN_PROGRESS', 'DONE', 'BLOCKED', name='todostatus', create_type=False), nullable=False),
+    sa.Column('assignee_id', sa.UUID(), nullable=True),
+    sa.Column('count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('team_id', 'status', 'assignee_id', name='uq_team_todo_counts_key', postgresql_nulls_not_distinct=True)
+    )
+    op.create_table('team_todo_due_counts',
+    sa.Column('team_id', sa.UUID(), nullable=False),
+    sa.Column('due_day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('team_id', 'due_day')
+    )
+
+    op.execute(APPLY_FUNCTION)
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER todos_team_counters_insert_delete"
+        " AFTER INSERT OR DELETE ON todos"
+        " FOR EACH ROW EXECUTE FUNCTION todos_maintain_team_counters()"
+    )
+    # Title or description edits leave the counters alone
+    op.execute(
+        "CREATE TRIGGER todos_team_counters_update"
+        " AFTER UPDATE OF team_id, status, assignee_id, due_date ON todos"
+        " FOR EACH ROW WHEN ((OLD.team_id, OLD.status, OLD.assignee_id, OLD.due_date)"
+        " IS DISTINCT FROM (NEW.team_id, NEW.status, NEW.assignee_id, NEW.due_date))"
+        " EXECUTE FUNCTION todos_maintain_team_counters()"
+    )
+
+    # Backfill from the existing todos. CREATE TRIGGER holds a lock that blocks
+    # writes to todos until this migration commits, so no write can be missed
+    op.execute(
+        "INSERT INTO team_todo_counts (team_id, status, assignee_id, count)"
+        " SELECT team_id, status, assignee_id, count(*) FROM todos"
+        " GROUP BY team_id, status, assignee_id"
+    )
+    op.execute(
+        "INSERT INTO team_todo_due_counts (team_id, due_day, count)"
+        " SELECT team_id, due_date::date, count(*) FROM todos"
+        " WHERE due_date IS NOT NULL AND status <> 'DONE'"
+        " GROUP BY team_id, due_date::date"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER todos_team_counters_update ON todos")
+    op.execute("DROP TRIGGER todos_team_counters_insert_delete ON todos")
+    op.execute("DROP FUNCTION todos_maintain_team_counters()")
+    op.execute("DROP FUNCTION team_todo_counters_apply(uuid, todostatus, uuid, timestamp, integer)")
+    op.drop_table('team_todo_due_counts')
+    op.drop_table('team_todo_counts')
@@ -0,0 +1,120 @@
+"""partition notifications by month
+
+Revision ID: 5e8a13c0f7d4
+Revises: 9c41d7e2a5b8
+Create Date: 2026-10-18 00:24:07.915233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a13c0f7d4'
+down_revision: Union[str, None] = '9c41d7e2a5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = 'id, user_id, team_id, todo_id, type, message, read, count, created_at'
+
+# One partition per UTC month, from the oldest stored notification through
+# three months ahead; later months are created by the retention job
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    month timestamp;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', least(
+                (SELECT min(created_at) FROM notifications_unpartitioned), now()
+            ) AT TIME ZONE 'UTC'),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+            interval '1 month'
+        )
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+            to_char(month, '"notifications_"YYYY_MM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END
+$$
+"""
+
+
+def _notification_columns() -> list[sa.Column]:
+    """Columns shared by the partitioned and the plain notifications table"""
+    return [
+        sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('team_id', sa.UUID(), nullable=True),
+        sa.Column('type', postgresql.ENUM(name='notificationtype', create_type=False), nullable=False),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('read', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('todo_id', sa.UUID(), nullable=True),
+        sa.Column('count', sa.Integer(), server_default=sa.text('1'), nullable=False),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    ]
+
+
+def _rename_existing(suffix: str) -> None:
+    """Move the current table and its named objects aside so the replacement can take the names"""
+    op.rename_table('notifications', f'notifications{suffix}')
+    op.execute(f'ALTER TABLE notifications{suffix} RENAME CONSTRAINT notifications_pkey TO notifications{suffix}_pkey')
+    op.execute(f'ALTER INDEX ix_notifications_user_created RENAME TO ix_notifications{suffix}_user_created')
+    op.execute(f'ALTER INDEX ix_notifications_user_unread RENAME TO ix_notifications{suffix}_user_unread')
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        'ix_notifications_user_created',
+        'notifications',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_notifications_user_unread',
+        'notifications',
+        ['user_id', 'created_at', 'id'],
+        postgresql_where=sa.text('read = false'),
+    )
+
+
+def upgrade() -> None:
+    # The table is rebuilt rather than converted in place: PostgreSQL cannot
+    # partition an existing table. The primary key must include the partition key.
+    _rename_existing('_unpartitioned')
+    op.create_table(
+        'notifications',
+        *_notification_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    _create_indexes()
+    op.execute(CREATE_PARTITIONS)
+    op.execute(
+        f'INSERT INTO notifications ({COLUMNS}) '
+        f"SELECT {COLUMNS.replace('created_at', 'coalesce(created_at, now())')} FROM notifications_unpartitioned"
+    )
+    op.drop_table('notifications_unpartitioned')
+
+
+def downgrade() -> None:
+    _rename_existing('_partitioned')
+    op.create_table(
+        'notifications',
+        *_notification_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    _create_indexes()
+    op.alter_column('notifications', 'created_at', nullable=True)
+    op.execute(f'INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_partitioned')
+    # Dropping the partitioned table drops every partition with it
+    op.drop_table('notifications_partitioned')
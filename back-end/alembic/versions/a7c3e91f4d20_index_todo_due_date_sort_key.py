@@ -0,0 +1,50 @@
+"""index the todo due date sort key
+
+Revision ID: a7c3e91f4d20
+Revises: 4cb76e7af055
+Create Date: 2026-10-18 14:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91f4d20'
+down_revision: Union[str, None] = '4cb76e7af055'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Undated todos sort as due at infinity and ties run created_at DESC, id DESC,
+    # so a due date page cursor is a leading range bound plus one row comparison.
+    # Built concurrently before the index it replaces is dropped
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_todos_team_due_key',
+            'todos',
+            [
+                'team_id',
+                sa.text("coalesce(due_date, 'infinity'::timestamp)"),
+                sa.text('created_at DESC'),
+                sa.text('id DESC'),
+            ],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_todos_team_due_created', table_name='todos', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_todos_team_due_created',
+            'todos',
+            ['team_id', sa.text('due_date ASC NULLS LAST'), sa.text('created_at DESC'), 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_todos_team_due_key', table_name='todos', postgresql_concurrently=True, if_exists=True)
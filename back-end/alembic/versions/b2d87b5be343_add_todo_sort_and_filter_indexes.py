@@ -0,0 +1,70 @@
+"""add todo sort and filter indexes
+
+Revision ID: b2d87b5be343
+Revises: ef543606d522
+Create Date: 2026-10-17 23:58:33.242336
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d87b5be343'
+down_revision: Union[str, None] = 'ef543606d522'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # New indexes are built before the ones they replace are dropped, all
+    # concurrently so the todos table stays writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_todos_team_created_id',
+            'todos',
+            ['team_id', 'created_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_todos_team_updated_id',
+            'todos',
+            ['team_id', 'updated_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_todos_assignee_team_status',
+            'todos',
+            ['assignee_id', 'team_id', 'status'],
+            postgresql_where=sa.text('assignee_id IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_todos_team_updated', table_name='todos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_todos_assignee_id', table_name='todos', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_todos_assignee_id',
+            'todos',
+            ['assignee_id'],
+            postgresql_where=sa.text('assignee_id IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_todos_team_updated',
+            'todos',
+            ['team_id', 'updated_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_todos_assignee_team_status', table_name='todos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_todos_team_updated_id', table_name='todos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_todos_team_created_id', table_name='todos', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,163 @@
+"""maintain team todo counters once per statement
+
+Revision ID: e4b9f27c6a15
+Revises: a7c3e91f4d20
+Create Date: 2026-10-18 15:03:11.284907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9f27c6a15'
+down_revision: Union[str, None] = 'a7c3e91f4d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Sums a statement's changes per counter key from its transition tables and
+# applies each key once, in key order. Concurrent statements then lock shared
+# counter rows in the same order and cannot deadlock on them, and a statement
+# touching many todos updates each counter row once instead of once per todo.
+# old_rows/new_rows only exist for the events that define them, so the source
+# of the changes is picked by TG_OP and run through EXECUTE.
+STATEMENT_FUNCTION = """
+CREATE FUNCTION todos_apply_team_counters() RETURNS trigger AS $$
+DECLARE
+    -- A todo removed with its team has nothing left to count
+    removed constant text := 'SELECT team_id, status, assignee_id, due_date, -1 AS delta FROM old_rows'
+        ' WHERE EXISTS (SELECT 1 FROM teams WHERE teams.id = old_rows.team_id)';
+    added constant text := 'SELECT team_id, status, assignee_id, due_date, 1 AS delta FROM new_rows';
+    changed_team_ids uuid[];
+BEGIN
+    EXECUTE format($sql$
+        WITH changes AS (%s),
+        counts AS (
+            INSERT INTO team_todo_counts (team_id, status, assignee_id, count)
+            SELECT team_id, status, assignee_id, sum(delta) FROM changes
+            GROUP BY team_id, status, assignee_id
+            HAVING sum(delta) <> 0
+            ORDER BY team_id, status, assignee_id
+            ON CONFLICT (team_id, status, assignee_id)
+            DO UPDATE SET count = team_todo_counts.count + EXCLUDED.count
+            RETURNING team_id
+        ),
+        due_counts AS (
+            INSERT INTO team_todo_due_counts (team_id, due_day, count)
+            SELECT team_id, due_date::date, sum(delta) FROM changes
+            WHERE due_date IS NOT NULL AND status <> 'DONE'
+            GROUP BY team_id, due_date::date
+            HAVING sum(delta) <> 0
+            ORDER BY team_id, due_date::date
+            ON CONFLICT (team_id, due_day)
+            DO UPDATE SET count = team_todo_due_counts.count + EXCLUDED.count
+            RETURNING team_id
+        )
+        SELECT array_agg(DISTINCT team_id) FROM (SELECT team_id FROM counts UNION ALL SELECT team_id FROM due_counts) applied
+    $sql$, CASE TG_OP
+        WHEN 'INSERT' THEN added
+        WHEN 'DELETE' THEN removed
+        ELSE removed || ' UNION ALL ' || added
+    END) INTO changed_team_ids;
+
+    -- Rows that drop to zero are removed so the tables only hold keys that are in use
+    IF changed_team_ids IS NOT NULL THEN
+        DELETE FROM team_todo_counts WHERE team_id = ANY (changed_team_ids) AND count = 0;
+        DELETE FROM team_todo_due_counts WHERE team_id = ANY (changed_team_ids) AND count = 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# The row-level versions from 51f31b5e9fe4, restored on downgrade
+APPLY_FUNCTION = """
+CREATE FUNCTION team_todo_counters_apply(
+    p_team_id uuid, p_status todostatus, p_assignee_id uuid, p_due_date timestamp, p_delta integer
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO team_todo_counts (team_id, status, assignee_id, count)
+    VALUES (p_team_id, p_status, p_assignee_id, p_delta)
+    ON CONFLICT (team_id, status, assignee_id)
+    DO UPDATE SET count = team_todo_counts.count + EXCLUDED.count;
+    DELETE FROM team_todo_counts
+    WHERE team_id = p_team_id AND status = p_status
+      AND assignee_id IS NOT DISTINCT FROM p_assignee_id AND count = 0;
+
+    IF p_due_date IS NOT NULL AND p_status <> 'DONE' THEN
+        INSERT INTO team_todo_due_counts (team_id, due_day, count)
+        VALUES (p_team_id, p_due_date::date, p_delta)
+        ON CONFLICT (team_id, due_day)
+        DO UPDATE SET count = team_todo_due_counts.count + EXCLUDED.count;
+        DELETE FROM team_todo_due_counts
+        WHERE team_id = p_team_id AND due_day = p_due_date::date AND count = 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+ROW_FUNCTION = """
+CREATE FUNCTION todos_maintain_team_counters() RETURNS trigger AS $$
+BEGIN
+    -- A todo removed with its team has nothing left to count
+    IF TG_OP <> 'INSERT' AND EXISTS (SELECT 1 FROM teams WHERE id = OLD.team_id) THEN
+        PERFORM team_todo_counters_apply(OLD.team_id, OLD.status, OLD.assignee_id, OLD.due_date, -1);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM team_todo_counters_apply(NEW.team_id, NEW.status, NEW.assignee_id, NEW.due_date, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER todos_team_counters_update ON todos")
+    op.execute("DROP TRIGGER todos_team_counters_insert_delete ON todos")
+    op.execute("DROP FUNCTION todos_maintain_team_counters()")
+    op.execute("DROP FUNCTION team_todo_counters_apply(uuid, todostatus, uuid, timestamp, integer)")
+
+    op.execute(STATEMENT_FUNCTION)
+    # Transition tables need one trigger per event and no column list, so
+    # updates that leave the counted columns alone cancel out to no change
+    op.execute(
+        "CREATE TRIGGER todos_team_counters_insert"
+        " AFTER INSERT ON todos REFERENCING NEW TABLE AS new_rows"
+        " FOR EACH STATEMENT EXECUTE FUNCTION todos_apply_team_counters()"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_team_counters_update"
+        " AFTER UPDATE ON todos REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+        " FOR EACH STATEMENT EXECUTE FUNCTION todos_apply_team_counters()"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_team_counters_delete"
+        " AFTER DELETE ON todos REFERENCING OLD TABLE AS old_rows"
+        " FOR EACH STATEMENT EXECUTE FUNCTION todos_apply_team_counters()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER todos_team_counters_delete ON todos")
+    op.execute("DROP TRIGGER todos_team_counters_update ON todos")
+    op.execute("DROP TRIGGER todos_team_counters_insert ON todos")
+    op.execute("DROP FUNCTION todos_apply_team_counters()")
+
+    op.execute(APPLY_FUNCTION)
+    op.execute(ROW_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER todos_team_counters_insert_delete"
+        " AFTER INSERT OR DELETE ON todos"
+        " FOR EACH ROW EXECUTE FUNCTION todos_maintain_team_counters()"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_team_counters_update"
+        " AFTER UPDATE OF team_id, status, assignee_id, due_date ON todos"
+        " FOR EACH ROW WHEN ((OLD.team_id, OLD.status, OLD.assignee_id, OLD.due_date)"
+        " IS DISTINCT FROM (NEW.team_id, NEW.status, NEW.assignee_id, NEW.due_date))"
+        " EXECUTE FUNCTION todos_maintain_team_counters()"
+    )
@@ -1,10 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, teams, todos, notifications, ai
+from app.api.v1.endpoints import auth, teams, todos, notifications, realtime, ai
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(teams.router, prefix="/teams", tags=["teams"])
 api_router.include_router(todos.router, prefix="/todos", tags=["todos"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
+api_router.include_router(realtime.router, prefix="/realtime", tags=["realtime"])
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
 
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.schemas.auth import Register, Login, AuthResponse, TokenPayload
@@ -9,15 +9,15 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def register(dto: Register, db: Session = Depends(get_db)):
+async def register(dto: Register, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
-    return AuthService.register(db, dto)
+    return await AuthService.register(db, dto)
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(dto: Login, db: Session = Depends(get_db)):
+async def login(dto: Login, db: AsyncSession = Depends(get_db)):
     """Login user"""
-    return AuthService.login(db, dto)
+    return await AuthService.login(db, dto)
 
 
 @router.get("/me")
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
-from app.schemas.notification import NotificationResponse
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.schemas.notification import (
+    NotificationResponse,
+    NotificationUnreadCount,
+    NotificationMarkRead,
+    NotificationMarkReadResponse,
+)
 from app.services.notification_service import NotificationService
 from uuid import UUID
 
@@ -11,9 +19,37 @@ router = APIRouter()
 
 @router.get("", response_model=list[NotificationResponse])
 async def list_notifications(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """List notifications for current user"""
-    return NotificationService.list_for_user(db, UUID(current_user["sub"]))
+    """List notifications for current user, newest first; the next page's cursor is in X-Next-Cursor"""
+    notifications, next_cursor = await NotificationService.list_for_user(
+        db, UUID(current_user["sub"]), limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return notifications
 
+
+@router.get("/unread-count", response_model=NotificationUnreadCount)
+async def unread_count(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Count unread notifications for current user"""
+    count = await NotificationService.unread_count(db, UUID(current_user["sub"]))
+    return ORJSONResponse(content={"count": count})
+
+
+@router.post("/read", response_model=NotificationMarkReadResponse)
+async def mark_read(
+    dto: NotificationMarkRead,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Mark notifications read by id or up to a list cursor, in one UPDATE"""
+    updated = await NotificationService.mark_read(db, UUID(current_user["sub"]), dto)
+    return ORJSONResponse(content={"updated": updated})
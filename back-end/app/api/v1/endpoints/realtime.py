@@ -0,0 +1,50 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.realtime.gateway import get_realtime_gateway
+from app.realtime.outbox import get_outbox_dispatcher
+from app.services.team_service import TeamService
+from app.schemas.realtime import ClientQueueMetricsResponse, OutboxMetricsResponse, RealtimeBatchMetricsResponse
+
+router = APIRouter()
+
+
+@router.get("/outbox", response_model=OutboxMetricsResponse)
+async def outbox_metrics(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Realtime outbox lag: queued events, age of the oldest one and this worker's delivery counters"""
+    return await get_outbox_dispatcher().metrics(db)
+
+
+@router.get("/batches", response_model=RealtimeBatchMetricsResponse)
+async def batch_metrics(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Batching counters for this worker's rooms of the caller's teams; empty while batching is off"""
+    batcher = get_realtime_gateway().batcher
+    if batcher is None:
+        return {"interval_ms": 0, "rooms": {}}
+    # Room names carry team ids, so other teams' rooms are left out
+    team_ids = await TeamService.get_team_ids_for_user(db, UUID(current_user["sub"]))
+    rooms = batcher.metrics()
+    return {
+        "interval_ms": batcher.interval_ms,
+        "rooms": {room: rooms[room] for room in (f"team-{team_id}" for team_id in team_ids) if room in rooms},
+    }
+
+
+@router.get("/queues", response_model=ClientQueueMetricsResponse)
+async def queue_metrics(current_user: dict = Depends(get_current_user)):
+    """Outbound queue depth of this worker's Socket.IO clients and how many were shed"""
+    guard = get_realtime_gateway().queue_guard
+    if guard is None:
+        return {
+            "high_water": 0, "clients": 0, "queued": 0, "max_queue_depth": 0, "over_high_water": 0,
+            "resyncs": 0, "disconnects": 0, "dropped_events": 0,
+        }
+    return guard.metrics()
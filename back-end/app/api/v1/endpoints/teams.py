@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from uuid import UUID
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.etag import CACHE_CONTROL, etag_matches, make_etag, not_modified
+from app.models.team import Team
 from app.schemas.team import (
     TeamCreate,
     TeamResponse,
     AddTeamMember,
     InviteTeamMember,
     TeamMembershipResponse,
+    TeamSummaryResponse,
 )
 from app.services.team_service import TeamService
 
@@ -18,30 +22,50 @@ router = APIRouter()
 @router.get("", response_model=list[dict])
 async def get_my_teams(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get all teams for current user"""
-    return TeamService.get_teams_for_user(db, UUID(current_user["sub"]))
+    return await TeamService.get_teams_for_user(db, UUID(current_user["sub"]))
 
 
 @router.post("", response_model=TeamResponse, status_code=201)
 async def create_team(
     dto: TeamCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a new team"""
-    return TeamService.create_team(db, UUID(current_user["sub"]), dto)
+    return await TeamService.create_team(db, UUID(current_user["sub"]), dto)
 
 
 @router.get("/{team_id}/members", response_model=list[TeamMembershipResponse])
 async def get_members(
     team_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get all members of a team"""
-    return TeamService.get_members(db, team_id, UUID(current_user["sub"]))
+    """Get all members of a team; answers 304 when If-None-Match carries the current ETag"""
+    user_id = UUID(current_user["sub"])
+    version = await TeamService.get_version(db, team_id, user_id, Team.members_version)
+    etag = make_etag("members", team_id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return await TeamService.get_members(db, team_id, user_id)
+
+
+@router.get("/{team_id}/summary", response_model=TeamSummaryResponse)
+async def get_summary(
+    team_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get todo counts per status and assignee, plus the overdue count"""
+    return await TeamService.get_summary(db, team_id, UUID(current_user["sub"]))
 
 
 @router.post("/{team_id}/members", response_model=TeamMembershipResponse)
@@ -49,10 +73,10 @@ async def add_member(
     team_id: UUID,
     dto: AddTeamMember,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Add a member to a team"""
-    return TeamService.add_member(db, team_id, UUID(current_user["sub"]), dto)
+    return await TeamService.add_member(db, team_id, UUID(current_user["sub"]), dto)
 
 
 @router.post("/{team_id}/invite", response_model=TeamMembershipResponse)
@@ -60,8 +84,8 @@ async def invite_member(
     team_id: UUID,
     dto: InviteTeamMember,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Invite a member to a team"""
-    return TeamService.invite_member(db, team_id, UUID(current_user["sub"]), dto)
+    return await TeamService.invite_member(db, team_id, UUID(current_user["sub"]), dto)
 
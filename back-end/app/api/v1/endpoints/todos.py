@@ -1,12 +1,29 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
 from uuid import UUID
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse
+from app.core.etag import CACHE_CONTROL, etag_matches, make_etag, not_modified
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.serialization import todo_changes_to_json, todo_to_json, todos_to_json
+from app.models.team import Team
+from app.models.todo import TodoStatus
+from app.schemas.todo import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoSort,
+    TodoListFilters,
+    TodoBulkRequest,
+    TodoBulkResponse,
+    TodoChangesResponse,
+)
 from app.services.todo_service import TodoService
+from app.services.team_service import TeamService
 from app.services.notification_service import NotificationService
-from app.realtime.gateway import get_realtime_gateway
 
 router = APIRouter()
 
@@ -14,35 +31,109 @@ router = APIRouter()
 @router.get("", response_model=list[TodoResponse])
 async def find_by_team(
     team_id: UUID = Query(..., alias="teamId"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    status: Optional[list[TodoStatus]] = Query(None),
+    assignee_id: Optional[UUID] = Query(None, alias="assigneeId"),
+    unassigned: bool = Query(False),
+    overdue: bool = Query(False),
+    due_after: Optional[datetime] = Query(None, alias="dueAfter"),
+    due_before: Optional[datetime] = Query(None, alias="dueBefore"),
+    sort: TodoSort = Query(TodoSort.DUE_DATE),
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get all todos for a team"""
-    return TodoService.find_all_for_team(db, team_id, UUID(current_user["sub"]))
+    """Get todos for a team, optionally filtered and sorted; pass limit/cursor to page through large teams
+
+    Answers 304 when If-None-Match carries the current ETag, without loading any todos;
+    overdue lists depend on the clock and carry no ETag.
+    """
+    user_id = UUID(current_user["sub"])
+    filters = TodoListFilters(
+        status=status,
+        assignee_id=assignee_id,
+        unassigned=unassigned,
+        overdue=overdue,
+        due_after=due_after,
+        due_before=due_before,
+        sort=sort,
+    )
+    # Todos become overdue as time passes, without any write bumping the version,
+    # so the overdue view is never answered from the client's copy
+    etag = None
+    if not filters.overdue:
+        # Read the version before the rows: a concurrent write can only make the ETag stale, never wrong
+        version = await TeamService.get_version(db, team_id, user_id, Team.todos_version)
+        etag = make_etag("todos", team_id, version, limit, cursor, filters.model_dump_json())
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    todos, next_cursor = await TodoService.find_all_for_team(
+        db, team_id, user_id, limit=limit, cursor=cursor, filters=filters
+    )
+    headers = {"Cache-Control": CACHE_CONTROL}
+    if etag is not None:
+        headers["ETag"] = etag
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(content=todos_to_json(todos), media_type="application/json", headers=headers)
+
+
+@router.get("/changes", response_model=TodoChangesResponse)
+async def changes(
+    team_id: UUID = Query(..., alias="teamId"),
+    since: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get todos changed and deleted since a sync cursor; omit since for a full snapshot"""
+    todos, deleted_ids, cursor, snapshot = await TodoService.changes_since(
+        db, team_id, UUID(current_user["sub"]), since=since
+    )
+    return Response(
+        content=todo_changes_to_json(todos, deleted_ids, cursor, snapshot),
+        media_type="application/json",
+    )
 
 
 @router.post("", response_model=TodoResponse, status_code=201)
 async def create(
     dto: TodoCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a new todo"""
-    realtime_gateway = get_realtime_gateway()
     notification_service = NotificationService()
-    return TodoService.create(
-        db, UUID(current_user["sub"]), dto, realtime_gateway, notification_service
+    todo = await TodoService.create(
+        db, UUID(current_user["sub"]), dto, notification_service
+    )
+    return ORJSONResponse(content=todo, status_code=201)
+
+
+@router.post("/bulk", response_model=TodoBulkResponse)
+async def bulk(
+    dto: TodoBulkRequest,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create, update and delete many todos of one team in a single transaction"""
+    notification_service = NotificationService()
+    result = await TodoService.bulk(
+        db, UUID(current_user["sub"]), dto, notification_service
     )
+    return ORJSONResponse(content=result)
 
 
 @router.get("/{id}", response_model=TodoResponse)
 async def find_one(
     id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get a single todo"""
-    return TodoService.find_one(db, id, UUID(current_user["sub"]))
+    todo = await TodoService.find_one(db, id, UUID(current_user["sub"]))
+    return Response(content=todo_to_json(todo), media_type="application/json")
 
 
 @router.patch("/{id}", response_model=TodoResponse)
@@ -50,26 +141,25 @@ async def update(
     id: UUID,
     dto: TodoUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update a todo"""
-    realtime_gateway = get_realtime_gateway()
     notification_service = NotificationService()
-    return TodoService.update(
-        db, id, UUID(current_user["sub"]), dto, realtime_gateway, notification_service
+    todo = await TodoService.update(
+        db, id, UUID(current_user["sub"]), dto, notification_service
     )
+    return ORJSONResponse(content=todo)
 
 
 @router.delete("/{id}")
 async def remove(
     id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete a todo"""
-    realtime_gateway = get_realtime_gateway()
     notification_service = NotificationService()
-    return TodoService.remove(
-        db, id, UUID(current_user["sub"]), realtime_gateway, notification_service
+    return await TodoService.remove(
+        db, id, UUID(current_user["sub"]), notification_service
     )
 
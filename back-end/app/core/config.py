@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -9,11 +9,66 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "team_tasks"
-    
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+
     # JWT
     JWT_SECRET: str = "super-secret"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_CONCURRENCY: int = 4
+
+    # Team membership/role cache
+    MEMBERSHIP_CACHE_SIZE: int = 10000
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 60
+
+    # Deleted todos leave a tombstone for delta sync this long; a sync cursor
+    # older than that is answered with a full snapshot instead of a delta
+    TODO_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Notifications: repeats for the same (user, todo, type) within the window
+    # merge into one unread row; 0 disables coalescing
+    NOTIFICATION_COALESCE_WINDOW_SECONDS: int = 60
+    # notification.updated rows wait in the outbox this long after the first of a burst
+    NOTIFICATION_EMIT_DEBOUNCE_MS: int = 500
+    # notifications is partitioned by month; whole months older than the
+    # retention period are dropped, and partitions are created ahead of time
+    NOTIFICATION_RETENTION_MONTHS: int = 6
+    NOTIFICATION_PARTITIONS_AHEAD: int = 3
+    # How often the API itself creates upcoming partitions, drops expired ones
+    # and prunes todo tombstones past their retention
+    NOTIFICATION_PARTITION_MAINTENANCE_HOURS: float = 6
+
+    # Realtime outbox dispatcher: rows per batch, and how long it idles
+    # between polls when no commit wakes it
+    OUTBOX_BATCH_SIZE: int = 200
+    OUTBOX_POLL_INTERVAL_MS: int = 1000
+
+    # Socket.IO client manager: "memory" only reaches clients of this process;
+    # "postgres" relays emits between workers through LISTEN/NOTIFY on the channel
+    REALTIME_MANAGER: Literal["memory", "postgres"] = "memory"
+    REALTIME_CHANNEL: str = "socketio"
+    # Buffer team room events for this long and send them as one todo.batch
+    # frame, collapsing superseded updates to the same todo; 0 emits immediately
+    REALTIME_BATCH_INTERVAL_MS: int = 0
+    # Send todo.delta (changed fields and the todo version) instead of the
+    # full todo in todo.updated
+    REALTIME_TODO_DELTAS: bool = False
+    # Recent events kept per team-/user- room (and how many rooms) so that a
+    # reconnecting client can resume from its last sequence number; 0 disables.
+    # Sequences are per process, so the postgres manager always disables it
+    REALTIME_REPLAY_BUFFER_SIZE: int = 200
+    REALTIME_REPLAY_ROOMS: int = 2000
+    # Let Socket.IO clients that connect with ?serializer=msgpack receive
+    # MessagePack frames; clients that do not ask keep getting JSON
+    REALTIME_MSGPACK: bool = False
+    # Packets a client may have waiting to be sent before its queue is replaced
+    # with resync.required; a client over it again is disconnected. 0 disables
+    REALTIME_CLIENT_QUEUE_HIGH_WATER: int = 1000
     
     # Google AI Studio (Gemini)
     GOOGLE_AI_API_KEY: Optional[str] = None
@@ -1,7 +1,12 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 # Monkey-patch passlib's bcrypt bug detection to handle the 72-byte limit
@@ -29,7 +34,25 @@ except (ImportError, AttributeError) as e:
     # If monkey-patching fails, continue anyway
     pass
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL while hashing, so a small thread pool keeps the event
+# loop free; its size caps how many hashes run at once, the rest wait in line
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_CONCURRENCY,
+    thread_name_prefix="password-hash",
+)
+
+# Verified token payloads keyed by the token's SHA-256 digest. Each entry lives
+# only until the token's own exp claim, so expired tokens are never served.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.JWT_EXPIRATION_HOURS * 3600,
+)
 
 
 def _truncate_password(password: str) -> str:
@@ -86,6 +109,20 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -104,7 +141,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode and verify a JWT token"""
+    """Decode and verify a JWT token, reusing earlier verifications of the same token"""
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = token_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
     try:
         payload = jwt.decode(
             token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
@@ -112,7 +154,14 @@ def decode_access_token(token: str) -> Optional[dict]:
         # Convert 'sub' to string if it's a UUID
         if 'sub' in payload:
             payload['sub'] = str(payload['sub'])
-        return payload
     except JWTError:
         return None
 
+    # Tokens without an exp claim are never cached
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(cache_key, dict(payload), ttl=remaining)
+    return payload
+
@@ -0,0 +1,132 @@
+from typing import Any, Iterable
+from uuid import UUID
+import orjson
+from pydantic import TypeAdapter
+from app.models.todo import Todo
+from app.schemas.team import TeamResponse
+from app.schemas.todo import TodoResponse
+from app.schemas.user import UserResponse
+
+# Adapters are built once at import time; building a validator/serializer per
+# call costs more than the serialization itself
+_todo_adapter = TypeAdapter(TodoResponse)
+
+# Field plans for the list path, read once from the response schemas so the
+# output matches TodoResponse exactly (covered by test_serialization)
+_TODO_FIELDS = tuple(name for name in TodoResponse.model_fields if name not in ("team", "assignee"))
+_TEAM_FIELDS = tuple(TeamResponse.model_fields)
+_USER_FIELDS = tuple(UserResponse.model_fields)
+
+
+def todo_to_dict(todo: Todo) -> dict:
+    """Serialize a todo (team and assignee loaded) into a JSON-ready dict"""
+    model = _todo_adapter.validate_python(todo, from_attributes=True)
+    return _todo_adapter.dump_python(model, mode="json")
+
+
+def todo_event_payload(todo: Todo, todo_dict: dict) -> dict:
+    """Extend an already serialized todo with the team owner for realtime clients"""
+    owner = todo.team.owner if todo.team else None
+    if owner is None or todo_dict.get("team") is None:
+        return todo_dict
+    return {
+        **todo_dict,
+        "team": {
+            **todo_dict["team"],
+            "owner": {"id": str(owner.id), "email": owner.email, "name": owner.name},
+        },
+    }
+
+
+# Keys of the serialized todo that change with each updatable column
+_DELTA_KEYS = {
+    "title": ("title",),
+    "description": ("description",),
+    "status": ("status",),
+    "due_date": ("due_date",),
+    "assignee_id": ("assignee_id", "assignee"),
+}
+
+
+def todo_delta_payload(todo_dict: dict, columns: Iterable[str], base_version: int) -> dict:
+    """Realtime delta for an update: the changed fields of an already serialized todo
+
+    Clients holding base_version apply the changes and move to version; any
+    other version means they missed a change and should refetch the todo.
+    """
+    changes = {key: todo_dict[key] for column in columns for key in _DELTA_KEYS[column]}
+    changes["updated_at"] = todo_dict["updated_at"]
+    return {
+        "id": todo_dict["id"],
+        "team_id": todo_dict["team_id"],
+        "base_version": base_version,
+        "version": todo_dict["version"],
+        "changes": changes,
+    }
+
+
+def todo_to_json(todo: Todo) -> bytes:
+    """Serialize a single todo straight to JSON bytes"""
+    model = _todo_adapter.validate_python(todo, from_attributes=True)
+    return _todo_adapter.dump_json(model)
+
+
+def todos_to_json(todos: Iterable[Todo]) -> bytes:
+    """Serialize a list of todos straight to JSON bytes
+
+    Skips per-row pydantic validation: columns are plucked by the field plans,
+    the team and assignee shared by many rows are built once, and orjson
+    encodes UUIDs, datetimes and enums natively.
+    """
+    return orjson.dumps(_todo_rows(todos), default=_json_default, option=orjson.OPT_UTC_Z)
+
+
+def todo_changes_to_json(todos: Iterable[Todo], deleted_ids: Iterable[UUID], cursor: str, snapshot: bool) -> bytes:
+    """Serialize a delta sync response: changed todos, deleted ids, the next cursor and the snapshot flag"""
+    return orjson.dumps(
+        {"todos": _todo_rows(todos), "deleted": list(deleted_ids), "cursor": cursor, "snapshot": snapshot},
+        default=_json_default,
+        option=orjson.OPT_UTC_Z,
+    )
+
+
+def _todo_rows(todos: Iterable[Todo]) -> list[dict]:
+    """Pluck todos into dicts following the TodoResponse field plans"""
+    nested: dict[int, dict] = {}
+    rows = []
+    for todo in todos:
+        row = {name: getattr(todo, name) for name in _TODO_FIELDS}
+        row["team"] = _pluck_shared(nested, todo.team, _TEAM_FIELDS)
+        row["assignee"] = _pluck_shared(nested, todo.assignee, _USER_FIELDS)
+        rows.append(row)
+    return rows
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode types orjson does not handle natively, such as asyncpg's UUID subclass"""
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _pluck_shared(nested: dict[int, dict], obj: Any, fields: tuple[str, ...]) -> dict | None:
+    """Build the dict for a related object once per serialization call"""
+    if obj is None:
+        return None
+    row = nested.get(id(obj))
+    if row is None:
+        row = nested[id(obj)] = {name: getattr(obj, name) for name in fields}
+    return row
+
+
+class OrjsonSocketIOJson:
+    """Stand-in for the json module so python-socketio encodes packets with orjson"""
+
+    @staticmethod
+    def dumps(obj: Any, *args, **kwargs) -> str:
+        # socketio passes json.dumps options such as separators; orjson output is already compact
+        return orjson.dumps(obj, default=_json_default).decode("utf-8")
+
+    @staticmethod
+    def loads(data: str | bytes, *args, **kwargs) -> Any:
+        return orjson.loads(data)
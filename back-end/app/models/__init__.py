@@ -1,7 +1,8 @@
 from app.models.user import User
 from app.models.team import Team, TeamMembership, TeamRole
-from app.models.todo import Todo, TodoStatus
+from app.models.todo import Todo, TodoStatus, TodoTombstone, TeamTodoCount, TeamTodoDueCount
 from app.models.notification import Notification, NotificationType
+from app.models.outbox import RealtimeOutbox
 
 __all__ = [
     "User",
@@ -10,7 +11,11 @@ __all__ = [
     "TeamRole",
     "Todo",
     "TodoStatus",
+    "TodoTombstone",
+    "TeamTodoCount",
+    "TeamTodoDueCount",
     "Notification",
     "NotificationType",
+    "RealtimeOutbox",
 ]
 
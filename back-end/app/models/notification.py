@@ -1,5 +1,5 @@
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, ForeignKey, Boolean, Enum as SQLEnum, text
+from sqlalchemy import Column, String, ForeignKey, Boolean, Integer, Enum as SQLEnum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -15,14 +15,31 @@ class NotificationType(PyEnum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_created", "user_id", text("created_at DESC"), text("id DESC")),
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("read = false"),
+        ),
+        # Monthly partitions are created and dropped by NotificationRetentionService
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), nullable=True)
+    # No foreign key: a notification about a deleted todo outlives it
+    todo_id = Column(UUID(as_uuid=True), nullable=True)
     type = Column(SQLEnum(NotificationType, name='notificationtype', native_enum=True), nullable=False)
     message = Column(String, nullable=False)
     read = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # How many repeats were coalesced into this row
+    count = Column(Integer, nullable=False, server_default=text("1"))
+    # Partition key, so it is part of the primary key
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
 
     # Relationships
     user = relationship("User")
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, CheckConstraint, Column, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+from sqlalchemy.types import DateTime
+from app.core.database import Base
+
+
+class RealtimeOutbox(Base):
+    """Realtime events written in the same transaction as the change they announce
+
+    Each row targets either a team room or a single user; OutboxDispatcher
+    emits and deletes them in id order.
+    """
+
+    __tablename__ = "realtime_outbox"
+    __table_args__ = (
+        CheckConstraint("(team_id IS NULL) <> (user_id IS NULL)", name="ck_realtime_outbox_one_target"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    team_id = Column(UUID(as_uuid=True), nullable=True)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    event = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,5 +1,5 @@
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, UniqueConstraint, text
+from sqlalchemy import BigInteger, Column, String, ForeignKey, Enum as SQLEnum, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -19,6 +19,9 @@ class Team(Base):
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # Bumped by every mutation of the team's todos / memberships; the list ETags derive from them
+    todos_version = Column(BigInteger, nullable=False, server_default=text("0"))
+    members_version = Column(BigInteger, nullable=False, server_default=text("0"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -30,7 +33,10 @@ class Team(Base):
 
 class TeamMembership(Base):
     __tablename__ = "team_memberships"
-    __table_args__ = (UniqueConstraint("team_id", "user_id", name="uq_team_member"),)
+    __table_args__ = (
+        UniqueConstraint("team_id", "user_id", name="uq_team_member"),
+        Index("ix_team_memberships_user_created", "user_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
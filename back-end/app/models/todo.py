@@ -1,5 +1,5 @@
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, DateTime as SQLDateTime, text
+from sqlalchemy import BigInteger, Column, Date, Integer, String, ForeignKey, Enum as SQLEnum, DateTime as SQLDateTime, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,6 +16,28 @@ class TodoStatus(PyEnum):
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        # List sorts of TodoService.find_all_for_team and their cursors: due date (default),
+        # undated last; the expression keeps a due date bound usable as an index condition
+        Index(
+            "ix_todos_team_due_key",
+            "team_id",
+            text("coalesce(due_date, 'infinity'::timestamp)"),
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        # Newest-first sorts; scanned backwards. updated_at also serves delta sync
+        Index("ix_todos_team_created_id", "team_id", "created_at", "id"),
+        Index("ix_todos_team_updated_id", "team_id", "updated_at", "id"),
+        # "Assigned to me" lists, optionally by status; also serves ON DELETE SET NULL from users
+        Index(
+            "ix_todos_assignee_team_status",
+            "assignee_id",
+            "team_id",
+            "status",
+            postgresql_where=text("assignee_id IS NOT NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     title = Column(String, nullable=False)
@@ -26,8 +48,53 @@ class Todo(Base):
     assignee_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Incremented by every update; realtime deltas carry it so clients can detect a missed change
+    version = Column(Integer, nullable=False, server_default=text("1"))
 
     # Relationships
     team = relationship("Team", back_populates="todos")
     assignee = relationship("User", back_populates="assigned_todos", foreign_keys=[assignee_id])
 
+
+
+class TodoTombstone(Base):
+    """Marker left behind by a deleted todo so delta sync can report the deletion"""
+
+    __tablename__ = "todo_tombstones"
+    __table_args__ = (
+        Index("ix_todo_tombstones_team_deleted", "team_id", "deleted_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TeamTodoCount(Base):
+    """Number of a team's todos per (status, assignee); kept current by statement-level triggers on todos"""
+
+    __tablename__ = "team_todo_counts"
+    __table_args__ = (
+        # assignee_id is NULL for unassigned todos, which still need a single row
+        UniqueConstraint(
+            "team_id", "status", "assignee_id",
+            name="uq_team_todo_counts_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    status = Column(SQLEnum(TodoStatus, name='todostatus', native_enum=True, create_type=False), nullable=False)
+    assignee_id = Column(UUID(as_uuid=True), nullable=True)
+    count = Column(Integer, nullable=False, server_default=text("0"))
+
+
+class TeamTodoDueCount(Base):
+    """Number of a team's open (not done) todos due on each day; kept current by statement-level triggers on todos"""
+
+    __tablename__ = "team_todo_due_counts"
+
+    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True)
+    due_day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, server_default=text("0"))
@@ -0,0 +1,147 @@
+from typing import Optional
+import socketio
+from engineio import packet as eio_packet
+from app.realtime.packets import NegotiatingAsyncServer
+
+RESYNC_EVENT = "resync.required"
+
+# Rooms whose clients can reload what they missed; a collapse sends each one resync.required
+RESYNC_ROOM_PREFIXES = ("team-", "user-")
+
+
+class ClientQueueGuard:
+    """Watches each client's outbound Engine.IO queue and sheds clients that fall behind
+
+    Packets wait in a per-connection queue until a websocket writer or the
+    next long-poll takes them, so a client on a stalled link holds everything
+    sent to it in server memory. Above the high-water mark its queued
+    events are dropped and replaced with one resync.required per room; if it
+    is over the mark again before draining to half of it, it is disconnected.
+    """
+
+    def __init__(self, sio_server: socketio.AsyncServer, high_water: int, namespace: str = "/"):
+        self.sio = sio_server
+        self.high_water = high_water
+        self.namespace = namespace
+        # Engine.IO sessions that were already collapsed once and have not caught up since
+        self._collapsed: set[str] = set()
+        # Sessions being collapsed; the resync.required sent to them skips the check
+        self._collapsing: set[str] = set()
+        self.resyncs = 0
+        self.disconnects = 0
+        self.dropped_events = 0
+
+    def queue_depth(self, eio_sid: str) -> int:
+        """Packets waiting to be sent to one Engine.IO connection"""
+        socket = self.sio.eio.sockets.get(eio_sid)
+        return socket.queue.qsize() if socket is not None else 0
+
+    async def check(self, eio_sid: str) -> bool:
+        """Collapse or disconnect a client over the high-water mark before a packet is queued for it
+
+        Returns False when the client was disconnected and the packet should
+        not be sent.
+        """
+        if eio_sid in self._collapsing:
+            return True
+        depth = self.queue_depth(eio_sid)
+        if depth <= self.high_water:
+            if depth <= self.high_water // 2:
+                self._collapsed.discard(eio_sid)
+            return True
+        if eio_sid in self._collapsed:
+            self._collapsed.discard(eio_sid)
+            self.disconnects += 1
+            await self._disconnect(eio_sid)
+            return False
+        self._collapsed.add(eio_sid)
+        self._collapsing.add(eio_sid)
+        try:
+            await self._collapse(eio_sid)
+        finally:
+            self._collapsing.discard(eio_sid)
+        return True
+
+    async def _collapse(self, eio_sid: str):
+        """Drop a client's queued messages and tell it which rooms to reload"""
+        queue = self.sio.eio.sockets[eio_sid].queue
+        kept = []
+        while not queue.empty():
+            pkt = queue.get_nowait()
+            queue.task_done()
+            # Pings, noops and the writer's stop marker keep the connection itself working
+            if pkt is not None and pkt.packet_type == eio_packet.MESSAGE:
+                self.dropped_events += 1
+            else:
+                kept.append(pkt)
+        for pkt in kept:
+            queue.put_nowait(pkt)
+        self.resyncs += 1
+        sid = self.sio.manager.sid_from_eio_sid(eio_sid, self.namespace)
+        if sid is None:
+            return
+        for room in self.sio.rooms(sid, namespace=self.namespace):
+            if room.startswith(RESYNC_ROOM_PREFIXES):
+                # The client is on this worker, so a pub/sub manager need not publish it
+                await self.sio.emit(RESYNC_EVENT, {"room": room}, to=sid, namespace=self.namespace, ignore_queue=True)
+
+    async def _disconnect(self, eio_sid: str):
+        """Close a client's Engine.IO session without waiting for it to read its queue
+
+        A graceful close queues a CLOSE packet and waits for the queue to
+        drain, which a stalled client never does.
+        """
+        socket = self.sio.eio.sockets.pop(eio_sid, None)
+        if socket is not None:
+            await socket.close(wait=False, abort=True)
+
+    def forget(self, eio_sid: str):
+        """Drop a disconnected client's state"""
+        self._collapsed.discard(eio_sid)
+
+    def metrics(self) -> dict:
+        """Queue depth gauges over this worker's connections and shedding counters"""
+        depths = [socket.queue.qsize() for socket in list(self.sio.eio.sockets.values())]
+        return {
+            "high_water": self.high_water,
+            "clients": len(depths),
+            "queued": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "over_high_water": sum(1 for depth in depths if depth > self.high_water),
+            "resyncs": self.resyncs,
+            "disconnects": self.disconnects,
+            "dropped_events": self.dropped_events,
+        }
+
+
+class QueueGuardMixin:
+    """Runs the server's queue_guard on every packet sent to a client
+
+    Checking in the per-client send path covers room emits that a pub/sub
+    manager delivers on every worker, not only the one that dispatched them.
+    """
+
+    queue_guard: Optional[ClientQueueGuard] = None
+
+    async def _send_packet(self, eio_sid, pkt):
+        if self.queue_guard is None or await self.queue_guard.check(eio_sid):
+            await super()._send_packet(eio_sid, pkt)
+
+    async def _send_eio_packet(self, eio_sid, eio_pkt):
+        if self.queue_guard is None or await self.queue_guard.check(eio_sid):
+            await super()._send_eio_packet(eio_sid, eio_pkt)
+
+    async def _handle_eio_disconnect(self, eio_sid):
+        try:
+            return await super()._handle_eio_disconnect(eio_sid)
+        finally:
+            if self.queue_guard is not None:
+                self.queue_guard.forget(eio_sid)
+
+
+class GuardedAsyncServer(QueueGuardMixin, socketio.AsyncServer):
+    pass
+
+
+class GuardedNegotiatingAsyncServer(QueueGuardMixin, NegotiatingAsyncServer):
+    pass
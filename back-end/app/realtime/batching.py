@@ -0,0 +1,125 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+BATCH_EVENT = "todo.batch"
+
+# Events about one todo, so a later one for the same id supersedes or extends an earlier one
+COLLAPSIBLE_EVENTS = frozenset({"todo.created", "todo.updated", "todo.delta", "todo.deleted"})
+
+
+def collapse_event(pending: dict, event: str, payload: dict):
+    """Add an event to a room's buffer, folding it into an earlier event for the same todo
+
+    The superseding event moves to the end of the buffer, so clients applying
+    the batch in order never overwrite a todo with an older aggregated event.
+    A todo created and deleted within one interval is dropped altogether.
+    Other events, such as todo.bulk, are barriers: events before one are never
+    folded into or moved past it, since it may carry newer state for them.
+    """
+    if event not in COLLAPSIBLE_EVENTS:
+        # Re-key what is buffered so far, keeping its order, so nothing later merges into it
+        sealed = list(pending.values())
+        pending.clear()
+        for entry in sealed:
+            pending[object()] = entry
+        pending[object()] = (event, payload)
+        return
+    key = payload["id"]
+    previous = pending.pop(key, None)
+    if previous is not None:
+        event, payload = _supersede(previous, event, payload)
+        if event is None:
+            return
+    pending[key] = (event, payload)
+
+
+def _supersede(previous: tuple[str, dict], event: str, payload: dict) -> tuple[Optional[str], Optional[dict]]:
+    """The single event equivalent to previous followed by event, or (None, None) for nothing"""
+    previous_event, previous_payload = previous
+    if event == "todo.delta":
+        if previous_event == "todo.delta":
+            # Chained deltas still apply from the first base version
+            return event, {
+                **payload,
+                "base_version": previous_payload["base_version"],
+                "changes": {**previous_payload["changes"], **payload["changes"]},
+            }
+        if previous_event in ("todo.created", "todo.updated"):
+            return previous_event, {**previous_payload, **payload["changes"], "version": payload["version"]}
+    if previous_event == "todo.created":
+        if event == "todo.deleted":
+            return None, None
+        # Clients have not seen the todo yet, so it still arrives as created
+        return previous_event, payload
+    return event, payload
+
+
+class RoomBatcher:
+    """Buffers events per room and sends each room's buffer as one todo.batch frame
+
+    The interval starts with the first buffered event, so no event waits longer
+    than one interval however busy the room is. With is_occupied given, a
+    room's counters are dropped once a flush finds it without clients.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[str, dict, str], Awaitable[None]],
+        interval_ms: int,
+        is_occupied: Optional[Callable[[str], bool]] = None,
+    ):
+        self.emit = emit
+        self.interval_ms = interval_ms
+        self.is_occupied = is_occupied
+        self._pending: dict[str, dict] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._stats: dict[str, dict] = {}
+
+    async def add(self, room: str, event: str, payload: dict):
+        """Buffer an event, scheduling the room's flush if none is pending"""
+        collapse_event(self._pending.setdefault(room, {}), event, payload)
+        self._room_stats(room)["received"] += 1
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(room)
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._tasks[room] = loop.create_task(self._flush_after(room, self.interval_ms / 1000))
+
+    async def flush(self, room: Optional[str] = None):
+        """Send one room's buffer now, or every room's when no room is given"""
+        for name in [room] if room is not None else list(self._pending):
+            await self._flush_room(name)
+
+    def forget(self, room: str):
+        """Drop the counters of a room that emptied; a pending buffer keeps them until its flush"""
+        if room not in self._pending:
+            self._stats.pop(room, None)
+
+    def metrics(self) -> dict:
+        """Per-room flush counters"""
+        return {room: dict(stats) for room, stats in self._stats.items()}
+
+    def _room_stats(self, room: str) -> dict:
+        return self._stats.setdefault(room, {"received": 0, "sent": 0, "flushes": 0, "max_batch_size": 0})
+
+    async def _flush_after(self, room: str, delay: float):
+        await asyncio.sleep(delay)
+        await self._flush_room(room)
+
+    async def _flush_room(self, room: str):
+        pending = self._pending.pop(room, None)
+        if not pending:
+            return
+        events = list(pending.values())
+        if len(events) == 1:
+            event, payload = events[0]
+            await self.emit(event, payload, room)
+        else:
+            await self.emit(
+                BATCH_EVENT, {"events": [{"event": event, "payload": payload} for event, payload in events]}, room
+            )
+        stats = self._room_stats(room)
+        stats["sent"] += len(events)
+        stats["flushes"] += 1
+        stats["max_batch_size"] = max(stats["max_batch_size"], len(events))
+        if self.is_occupied is not None and not self.is_occupied(room):
+            del self._stats[room]
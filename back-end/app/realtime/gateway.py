@@ -1,8 +1,16 @@
 from typing import Optional
 from uuid import UUID
 import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
 from app.core.config import settings
+from app.core.database import DATABASE_URL, AsyncSessionLocal
 from app.core.security import decode_access_token
+from app.core.serialization import OrjsonSocketIOJson
+from app.realtime.backpressure import RESYNC_EVENT, ClientQueueGuard, GuardedAsyncServer, GuardedNegotiatingAsyncServer
+from app.realtime.batching import RoomBatcher
+from app.realtime.postgres_manager import AsyncPostgresManager
+from app.realtime.replay import ReplayBuffer
+from app.services.team_service import TeamService
 
 # Build allowed origins list - include both localhost and 0.0.0.0 variants
 def get_allowed_origins():
@@ -27,8 +35,24 @@ def get_allowed_origins():
         origins = ["*"]
     return origins
 
+def get_client_manager() -> Optional[socketio.AsyncManager]:
+    """Client manager selected by REALTIME_MANAGER; None keeps Socket.IO's in-memory default"""
+    if settings.REALTIME_MANAGER == "postgres":
+        return AsyncPostgresManager(DATABASE_URL, channel=settings.REALTIME_CHANNEL)
+    return None
+
+def get_server_class() -> type[socketio.AsyncServer]:
+    """Server class selected by REALTIME_MSGPACK; the negotiating one still speaks JSON by default
+
+    Both run the gateway's client queue guard on every packet they send.
+    """
+    if settings.REALTIME_MSGPACK:
+        return GuardedNegotiatingAsyncServer
+    return GuardedAsyncServer
+
 # Create Socket.IO server
-sio = socketio.AsyncServer(
+sio = get_server_class()(
+    client_manager=get_client_manager(),
     cors_allowed_origins=get_allowed_origins(),
     async_mode="asgi",
     logger=True,
@@ -36,6 +60,7 @@ sio = socketio.AsyncServer(
     allow_upgrades=True,
     ping_timeout=60,
     ping_interval=25,
+    json=OrjsonSocketIOJson,
 )
 
 # Global instance
@@ -45,6 +70,23 @@ _realtime_gateway_instance: Optional["RealtimeGateway"] = None
 class RealtimeGateway:
     def __init__(self, sio_server: socketio.AsyncServer):
         self.sio = sio_server
+        # Team room events are buffered per room when a batch interval is set
+        self.batcher: Optional[RoomBatcher] = None
+        if settings.REALTIME_BATCH_INTERVAL_MS > 0:
+            self.batcher = RoomBatcher(
+                self._emit_to_room, settings.REALTIME_BATCH_INTERVAL_MS, is_occupied=self._has_local_clients
+            )
+        # Room sequence numbers and recent events, for clients resuming after a
+        # reconnect; they are per process, so a pub/sub manager turns them off
+        self.replay: Optional[ReplayBuffer] = None
+        if settings.REALTIME_REPLAY_BUFFER_SIZE > 0 and not isinstance(sio_server.manager, AsyncPubSubManager):
+            self.replay = ReplayBuffer(settings.REALTIME_REPLAY_BUFFER_SIZE, settings.REALTIME_REPLAY_ROOMS)
+        # Outbound queue accounting for slow clients
+        self.queue_guard: Optional[ClientQueueGuard] = None
+        if settings.REALTIME_CLIENT_QUEUE_HIGH_WATER > 0:
+            self.queue_guard = ClientQueueGuard(sio_server, settings.REALTIME_CLIENT_QUEUE_HIGH_WATER)
+        # Checked on every send, so emits delivered by any worker count
+        sio_server.queue_guard = self.queue_guard
         self._setup_handlers()
 
     def _setup_handlers(self):
@@ -64,6 +106,9 @@ class RealtimeGateway:
                     return False
                 await self.sio.save_session(sid, {"user": payload})
                 await self.sio.enter_room(sid, f"user-{payload['sub']}")
+                # Every team room up front, so no event is missed waiting for joinTeam
+                for team_id in await self._team_ids(UUID(payload["sub"])):
+                    await self.sio.enter_room(sid, f"team-{team_id}")
                 print(f"Client connected: {payload.get('email', 'unknown')} (sid: {sid})")
                 return True
             except ValueError as e:
@@ -78,6 +123,11 @@ class RealtimeGateway:
         @self.sio.event
         async def disconnect(sid):
             """Handle client disconnection"""
+            if self.batcher is not None:
+                # The client is still listed in its rooms here; the ones it leaves empty stop being counted
+                for room in self.sio.rooms(sid):
+                    if all(other == sid for other, _ in self.sio.manager.get_participants("/", room)):
+                        self.batcher.forget(room)
             session = await self.sio.get_session(sid)
             if session and "user" in session:
                 print(f"Client disconnected: {session['user']['email']}")
@@ -93,9 +143,16 @@ class RealtimeGateway:
                 # Normalize team_id to string to ensure consistent room names
                 team_id_str = str(team_id)
                 room_name = f"team-{team_id_str}"
+                # The room and its replay log carry the team's events, so only members get in
+                if not await self._is_member(UUID(session["user"]["sub"]), team_id_str):
+                    print(f"User {session['user'].get('email', 'unknown')} refused room: {room_name}")
+                    return
                 await self.sio.enter_room(sid, room_name)
                 print(f"User {session['user'].get('email', 'unknown')} joined room: {room_name}")
                 await self.sio.emit("team.joined", {"teamId": team_id_str}, room=sid)
+                # A rejoining client passes the last sequence it saw for the room
+                if data.get("seq") is not None:
+                    await self._replay(sid, room_name, data.get("epoch"), data["seq"])
 
         @self.sio.event
         async def join_team(sid, data):
@@ -107,6 +164,33 @@ class RealtimeGateway:
             """Handle join team event (camelCase) - alias for join_team"""
             await handle_join_team(sid, data)
 
+        @self.sio.event
+        async def resume(sid, data):
+            """Replay what the user's own room missed since the sequence the client last saw"""
+            session = await self.sio.get_session(sid)
+            if not session or "user" not in session:
+                await self.sio.disconnect(sid)
+                return
+            await self._replay(sid, f"user-{session['user']['sub']}", data.get("epoch"), data.get("seq", 0))
+
+    async def _team_ids(self, user_id: UUID) -> list[UUID]:
+        """The user's teams, in one membership query"""
+        async with AsyncSessionLocal() as db:
+            return await TeamService.get_team_ids_for_user(db, user_id)
+
+    def _has_local_clients(self, room: str) -> bool:
+        """Whether any client of this worker is in the room"""
+        return room in self.sio.manager.rooms.get("/", {})
+
+    async def _is_member(self, user_id: UUID, team_id: str) -> bool:
+        """Whether the user belongs to the team; a malformed team id never matches"""
+        try:
+            team_uuid = UUID(team_id)
+        except ValueError:
+            return False
+        async with AsyncSessionLocal() as db:
+            return await TeamService._get_role(db, team_uuid, user_id) is not None
+
     def _extract_token(self, auth: dict, environ: dict) -> str:
         """Extract JWT token from auth or headers"""
         if auth and isinstance(auth, dict) and "token" in auth:
@@ -126,42 +210,86 @@ class RealtimeGateway:
         return None
 
     async def broadcast_todo_change(self, team_id: UUID, event: str, payload: dict):
-        """Broadcast todo change to team room"""
+        """Broadcast todo change to team room, or buffer it for the room's next todo.batch"""
         # Normalize team_id to string to ensure consistent room names
         team_id_str = str(team_id)
         room_name = f"team-{team_id_str}"
+        if self.batcher is not None:
+            await self.batcher.add(room_name, event, payload)
+            return
         print(f"📢 Broadcasting {event} to room: {room_name}")
         print(f"   Payload keys: {list(payload.keys())}")
-        await self.sio.emit(event, payload, room=room_name)
+        await self._emit_to_room(event, payload, room_name)
         print(f"✅ Event {event} emitted to room {room_name}")
 
+    async def _emit_to_room(self, event: str, payload: dict, room: str, deliver: bool = True):
+        """Emit to a room; with replay on, the event is logged and sent with its sequence as a second argument
+
+        deliver=False only logs it, for rooms without a local client that may
+        still resume later.
+        """
+        if self.replay is None:
+            if deliver:
+                await self.sio.emit(event, payload, room=room)
+            return
+        seq = self.replay.record(room, event, payload)
+        if deliver:
+            await self.sio.emit(event, (payload, self._sequence_meta(room, seq)), room=room)
+
+    def _sequence_meta(self, room: str, seq: int) -> dict:
+        return {"room": room, "seq": seq, "epoch": self.replay.epoch_of(room)}
+
+    async def _replay(self, sid: str, room: str, epoch: Optional[str], seq):
+        """Send a resuming client the room's events after seq, or resync.required when they are gone
+
+        A seq that is not a non-negative integer cannot be resumed from either.
+        """
+        missed = None
+        if self.replay is not None and isinstance(seq, int) and not isinstance(seq, bool) and seq >= 0:
+            missed = self.replay.since(room, epoch, seq)
+        if missed is None:
+            await self.sio.emit(RESYNC_EVENT, {"room": room}, to=sid)
+            return
+        for entry_seq, event, payload in missed:
+            await self.sio.emit(event, (payload, self._sequence_meta(room, entry_seq)), to=sid)
+
+    async def flush_batches(self):
+        """Send every buffered room batch now"""
+        if self.batcher is not None:
+            await self.batcher.flush()
+
     async def notify_user(self, user_id: UUID, event: str, payload: dict):
         """Notify a specific user"""
-        await self.sio.emit(event, payload, room=f"user-{user_id}")
-    
-    def broadcast_todo_change_sync(self, team_id: UUID, event: str, payload: dict):
-        """Synchronous wrapper for broadcast_todo_change"""
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self.broadcast_todo_change(team_id, event, payload))
-            else:
-                loop.run_until_complete(self.broadcast_todo_change(team_id, event, payload))
-        except Exception:
-            pass
-    
-    def notify_user_sync(self, user_id: UUID, event: str, payload: dict):
-        """Synchronous wrapper for notify_user"""
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self.notify_user(user_id, event, payload))
-            else:
-                loop.run_until_complete(self.notify_user(user_id, event, payload))
-        except Exception:
-            pass
+        await self._emit_to_room(event, payload, f"user-{user_id}")
+
+    async def notify_users(self, event: str, payloads: list[tuple[UUID, dict]]):
+        """Send each user their own payload in one dispatch step
+
+        With the in-process manager, users without a connected socket are skipped
+        before their packet is encoded (their events are still logged for replay);
+        a pub/sub manager only knows its own clients, so it publishes to every room.
+        """
+        local_rooms = None
+        if not isinstance(self.sio.manager, AsyncPubSubManager):
+            local_rooms = self.sio.manager.rooms.get("/", {})
+        for user_id, payload in payloads:
+            room = f"user-{user_id}"
+            await self._emit_to_room(event, payload, room, deliver=local_rooms is None or room in local_rooms)
+
+    async def join_team_rooms(self, event: str, payloads: list[tuple[UUID, dict]]):
+        """Move each user's connected clients into the team room named by their payload, then notify them"""
+        for user_id, payload in payloads:
+            await self._enter_participants(f"user-{user_id}", f"team-{payload['teamId']}")
+        await self.notify_users(event, payloads)
+
+    async def _enter_participants(self, room: str, target: str):
+        """Add every client in room to target; the postgres manager does it on every worker"""
+        manager = self.sio.manager
+        if isinstance(manager, AsyncPostgresManager):
+            await manager.enter_room_participants("/", room, target)
+            return
+        for sid, eio_sid in list(manager.get_participants("/", room)):
+            await manager.enter_room(sid, "/", target, eio_sid=eio_sid)
 
 
 def get_realtime_gateway() -> RealtimeGateway:
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy import delete, event, exists, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.outbox import RealtimeOutbox
+from app.realtime.gateway import RealtimeGateway, get_realtime_gateway
+from app.services.outbox_service import OUTBOX_PENDING
+
+logger = logging.getLogger(__name__)
+
+# Events held in the outbox until NOTIFICATION_EMIT_DEBOUNCE_MS after the first row
+# for the same user and payload id, so a burst reaches clients as its latest state
+DEBOUNCED_EVENTS = frozenset({"notification.updated"})
+# Events whose recipients' clients enter the team room named by the payload's teamId first
+ROOM_JOIN_EVENTS = frozenset({"team.added"})
+
+# Global instance
+_outbox_dispatcher_instance: Optional["OutboxDispatcher"] = None
+
+
+class OutboxDispatcher:
+    """Drains realtime_outbox in batches and emits each row through the gateway
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, emitted, and only deleted
+    when the emitting transaction commits, so delivery is at least once: a
+    failed emit or a crash leaves the batch in place for the next attempt.
+    Debounced events wait in the table, not in memory, until their burst is
+    due, and are then claimed and sent as its latest row.
+    """
+
+    def __init__(self, gateway: RealtimeGateway, session_factory=AsyncSessionLocal):
+        self.gateway = gateway
+        self.session_factory = session_factory
+        self.delivered = 0
+        self.batches = 0
+        self.failures = 0
+        self.last_lag_seconds: Optional[float] = None
+        self.max_lag_seconds = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Run the dispatch loop on the current event loop"""
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the dispatch loop; undelivered rows stay queued for the next start"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self):
+        """Dispatch now instead of waiting for the next poll"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        """Drain the outbox whenever woken, at least once per poll interval and when a debounced burst is due"""
+        while True:
+            self._wakeup.clear()
+            timeout = settings.OUTBOX_POLL_INTERVAL_MS / 1000
+            try:
+                async with self.session_factory() as db:
+                    while await self.dispatch_batch(db) == settings.OUTBOX_BATCH_SIZE:
+                        pass
+                    due = await self._seconds_until_debounced_due(db)
+                if due is not None:
+                    # A burst already due but still queued is locked by another worker; check back shortly
+                    timeout = min(timeout, max(due, 0.05))
+            except Exception:
+                self.failures += 1
+                logger.exception("Realtime outbox dispatch failed; the batch stays queued for a retry")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispatch_batch(self, db: AsyncSession) -> int:
+        """Claim, emit and delete up to one batch of rows in id order; returns how many were claimed
+
+        Debounced rows are only claimed once their burst is due.
+        """
+        claimed = (
+            select(RealtimeOutbox.id)
+            .where(or_(RealtimeOutbox.event.not_in(DEBOUNCED_EVENTS), _burst_due()))
+            .order_by(RealtimeOutbox.id)
+            .limit(settings.OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        rows = (
+            await db.execute(
+                delete(RealtimeOutbox)
+                .where(RealtimeOutbox.id.in_(claimed.scalar_subquery()))
+                .returning(
+                    RealtimeOutbox.id,
+                    RealtimeOutbox.team_id,
+                    RealtimeOutbox.user_id,
+                    RealtimeOutbox.event,
+                    RealtimeOutbox.payload,
+                    func.extract("epoch", func.clock_timestamp() - RealtimeOutbox.created_at).label("lag"),
+                )
+            )
+        ).all()
+        if not rows:
+            # Nothing was claimed; end the transaction without expiring the session's objects
+            await db.commit()
+            return 0
+        rows.sort(key=lambda row: row.id)
+        try:
+            await self._emit(rows)
+        except Exception:
+            await db.rollback()
+            raise
+        await db.commit()
+
+        self.delivered += len(rows)
+        self.batches += 1
+        self.last_lag_seconds = float(max(row.lag for row in rows))
+        self.max_lag_seconds = max(self.max_lag_seconds, self.last_lag_seconds)
+        return len(rows)
+
+    async def _seconds_until_debounced_due(self, db: AsyncSession) -> Optional[float]:
+        """Time until the oldest held debounced row is due, or None when none is queued"""
+        due = (
+            await db.execute(
+                select(
+                    func.extract(
+                        "epoch",
+                        func.min(RealtimeOutbox.created_at) + _debounce_delay() - func.clock_timestamp(),
+                    )
+                ).where(RealtimeOutbox.event.in_(DEBOUNCED_EVENTS))
+            )
+        ).scalar_one()
+        await db.commit()
+        return float(due) if due is not None else None
+
+    async def _emit(self, rows):
+        """Send rows in order; consecutive user rows of one event go out as one dispatch step
+
+        Of a debounced burst claimed together, only the latest row is sent.
+        """
+        latest = {_burst_key(row): row.id for row in rows if row.event in DEBOUNCED_EVENTS}
+        pending_event, pending = None, []
+        for row in rows:
+            if row.event in DEBOUNCED_EVENTS and latest[_burst_key(row)] != row.id:
+                continue
+            if row.user_id is not None and row.event == pending_event:
+                pending.append((row.user_id, row.payload))
+                continue
+            await self._emit_users(pending_event, pending)
+            pending_event, pending = None, []
+            if row.user_id is not None:
+                pending_event, pending = row.event, [(row.user_id, row.payload)]
+            else:
+                await self.gateway.broadcast_todo_change(row.team_id, row.event, row.payload)
+        await self._emit_users(pending_event, pending)
+
+    async def _emit_users(self, event_name: Optional[str], payloads: list):
+        if not payloads:
+            return
+        if event_name in ROOM_JOIN_EVENTS:
+            await self.gateway.join_team_rooms(event_name, payloads)
+        else:
+            await self.gateway.notify_users(event_name, payloads)
+
+    async def metrics(self, db: AsyncSession) -> dict:
+        """Queue depth, age of the oldest undelivered row and delivery counters"""
+        pending, oldest = (
+            await db.execute(
+                select(
+                    func.count(),
+                    func.extract("epoch", func.clock_timestamp() - func.min(RealtimeOutbox.created_at)),
+                )
+            )
+        ).one()
+        return {
+            "pending": pending,
+            "oldest_pending_seconds": float(oldest) if oldest is not None else 0.0,
+            "delivered": self.delivered,
+            "batches": self.batches,
+            "failures": self.failures,
+            "last_lag_seconds": self.last_lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+
+def _debounce_delay() -> timedelta:
+    return timedelta(milliseconds=settings.NOTIFICATION_EMIT_DEBOUNCE_MS)
+
+
+def _burst_key(row) -> tuple:
+    """Rows of one debounced burst share their event, user and payload id"""
+    return row.event, row.user_id, row.payload["id"]
+
+
+def _burst_due():
+    """Whether the first queued row of a row's burst is older than the debounce delay"""
+    first = aliased(RealtimeOutbox)
+    return exists().where(
+        first.event == RealtimeOutbox.event,
+        first.user_id == RealtimeOutbox.user_id,
+        first.payload["id"] == RealtimeOutbox.payload["id"],
+        first.created_at <= func.clock_timestamp() - _debounce_delay(),
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session):
+    """Wake the dispatcher once a transaction that queued outbox rows commits"""
+    if session.info.pop(OUTBOX_PENDING, False):
+        get_outbox_dispatcher().wake()
+
+
+def get_outbox_dispatcher() -> OutboxDispatcher:
+    """Get or create the outbox dispatcher instance"""
+    global _outbox_dispatcher_instance
+    if _outbox_dispatcher_instance is None:
+        _outbox_dispatcher_instance = OutboxDispatcher(get_realtime_gateway())
+    return _outbox_dispatcher_instance
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import parse_qs
+from uuid import UUID
+import msgpack
+import socketio
+from engineio import packet as eio_packet
+from socketio import packet
+
+MSGPACK_SERIALIZER = "msgpack"
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Encode UUIDs as their 16 raw bytes and datetimes as the MessagePack timestamp extension"""
+    if isinstance(obj, UUID):
+        return obj.bytes
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return msgpack.Timestamp.from_datetime(obj)
+    raise TypeError(f"Type is not MessagePack serializable: {type(obj).__name__}")
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    return msgpack.packb(obj, default=_msgpack_default)
+
+
+class NegotiatedText(str):
+    """JSON text of an encoded packet that can also give its MessagePack encoding
+
+    The manager encodes a room emit once and sends the result to every
+    participant; the MessagePack form is built on first request and cached,
+    so a mixed room costs at most one encode per format.
+    """
+
+    def __new__(cls, text: str, pkt: "NegotiatedPacket"):
+        encoded = super().__new__(cls, text)
+        encoded.packet = pkt
+        encoded._msgpack_packet = None
+        return encoded
+
+    def msgpack_packet(self) -> eio_packet.Packet:
+        """The Engine.IO message carrying the MessagePack encoding"""
+        if self._msgpack_packet is None:
+            self._msgpack_packet = eio_packet.Packet(eio_packet.MESSAGE, self.packet.encode_msgpack())
+        return self._msgpack_packet
+
+
+class NegotiatedPacket(packet.Packet):
+    """Socket.IO packet that is JSON by default and MessagePack for clients that asked for it
+
+    Decoding follows the frame type: MessagePack clients send binary frames
+    and JSON clients text, so both can talk to the same server.
+    """
+
+    def encode(self):
+        encoded = super().encode()
+        if isinstance(encoded, str):
+            return NegotiatedText(encoded, self)
+        # Packets with binary attachments stay JSON plus attachments
+        return encoded
+
+    def encode_msgpack(self) -> bytes:
+        return msgpack_dumps(self._to_dict())
+
+    def decode(self, encoded_packet):
+        if isinstance(encoded_packet, bytes):
+            decoded = msgpack.unpackb(encoded_packet)
+            self.packet_type = decoded["type"]
+            self.data = decoded.get("data")
+            self.id = decoded.get("id")
+            self.namespace = decoded["nsp"]
+            return 0
+        return super().decode(encoded_packet)
+
+
+class NegotiatingAsyncServer(socketio.AsyncServer):
+    """AsyncServer speaking MessagePack to clients that connect with ?serializer=msgpack
+
+    Clients that do not ask, such as the stock socket.io-client parser, keep
+    getting JSON, so switching the flag on does not break them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, serializer=NegotiatedPacket, **kwargs)
+        # Engine.IO sessions that negotiated MessagePack
+        self.msgpack_clients: set[str] = set()
+
+    async def _handle_eio_connect(self, eio_sid, environ):
+        query = parse_qs(environ.get("QUERY_STRING", ""))
+        if MSGPACK_SERIALIZER in query.get("serializer", []):
+            self.msgpack_clients.add(eio_sid)
+        return await super()._handle_eio_connect(eio_sid, environ)
+
+    async def _handle_eio_disconnect(self, eio_sid):
+        try:
+            return await super()._handle_eio_disconnect(eio_sid)
+        finally:
+            self.msgpack_clients.discard(eio_sid)
+
+    async def _send_packet(self, eio_sid, pkt):
+        if eio_sid in self.msgpack_clients:
+            await self.eio.send(eio_sid, pkt.encode_msgpack())
+        else:
+            await super()._send_packet(eio_sid, pkt)
+
+    async def _send_eio_packet(self, eio_sid, eio_pkt):
+        if eio_sid in self.msgpack_clients and isinstance(eio_pkt.data, NegotiatedText):
+            eio_pkt = eio_pkt.data.msgpack_packet()
+        await super()._send_eio_packet(eio_sid, eio_pkt)
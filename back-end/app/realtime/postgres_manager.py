@@ -0,0 +1,150 @@
+import asyncio
+import uuid
+from typing import Optional
+import asyncpg
+import orjson
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more; longer messages
+# are split into chunks that leave room for the chunk header
+NOTIFY_PAYLOAD_LIMIT = 7900
+CHUNK_MARKER = "#"
+# Pub/sub method for adding a room's clients to another room; python-socketio's
+# listening loop does not know it, so _listen handles it before yielding
+ENTER_ROOM_PARTICIPANTS = "enter_room_participants"
+
+
+def split_payload(data: bytes, limit: int = NOTIFY_PAYLOAD_LIMIT) -> list[str]:
+    """Split UTF-8 data into strings of at most limit bytes, never inside a character"""
+    pieces = []
+    start = 0
+    while start < len(data):
+        end = min(len(data), start + limit)
+        # Continuation bytes look like 0b10xxxxxx; back off to a character boundary
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(data[start:end].decode())
+        start = end
+    return pieces
+
+
+class AsyncPostgresManager(AsyncPubSubManager):
+    """Socket.IO client manager that relays emits between workers via LISTEN/NOTIFY
+
+    Every worker publishes its emits with pg_notify on one channel and listens
+    on a dedicated connection, so a todo change handled by one worker reaches
+    the clients connected to all of them without a separate message broker.
+    Like the Redis manager, delivery is best effort: a worker whose listening
+    connection drops misses what is published until it reconnects.
+    """
+
+    name = "asyncpostgres"
+
+    def __init__(self, dsn: str, channel: str = "socketio", write_only: bool = False, logger=None,
+                 pool_size: int = 4):
+        self.dsn = dsn
+        self.pool_size = pool_size
+        self._pool: Optional[asyncio.Future] = None
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Create the publishing pool on first use, on the loop that publishes"""
+        if self._pool is None:
+            self._pool = asyncio.ensure_future(
+                asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_size)
+            )
+        try:
+            return await asyncio.shield(self._pool)
+        except (OSError, asyncpg.PostgresError):
+            self._pool = None
+            raise
+
+    async def close(self):
+        """Stop listening and close the publishing pool"""
+        listener = getattr(self, "thread", None)
+        if listener is not None:
+            listener.cancel()
+            try:
+                await listener
+            except asyncio.CancelledError:
+                pass
+        if self._pool is not None and self._pool.done() and not self._pool.exception():
+            await self._pool.result().close()
+        self._pool = None
+
+    async def enter_room_participants(self, namespace: str, room: str, target: str):
+        """Add every client in room, on every worker, to target"""
+        message = {
+            "method": ENTER_ROOM_PARTICIPANTS, "namespace": namespace, "room": room, "target": target,
+            "host_id": self.host_id,
+        }
+        await self._handle_enter_room_participants(message)
+        await self._publish(message)
+
+    async def _handle_enter_room_participants(self, message: dict):
+        namespace = message["namespace"]
+        for sid, eio_sid in list(self.get_participants(namespace, message["room"])):
+            await self.enter_room(sid, namespace, message["target"], eio_sid=eio_sid)
+
+    async def _publish(self, data):
+        message = orjson.dumps(data)
+        if len(message) <= NOTIFY_PAYLOAD_LIMIT:
+            payloads = [message.decode()]
+        else:
+            message_id = uuid.uuid4().hex
+            pieces = split_payload(message)
+            payloads = [
+                f"{CHUNK_MARKER}{message_id}:{index}:{len(pieces)}:{piece}"
+                for index, piece in enumerate(pieces)
+            ]
+        try:
+            pool = await self._get_pool()
+            # executemany is atomic, so the chunks of one message commit (and
+            # are delivered) together and in order
+            await pool.executemany("SELECT pg_notify($1, $2)", [(self.channel, payload) for payload in payloads])
+        except (OSError, asyncpg.PostgresError):
+            self._get_logger().exception("Cannot publish to postgres; the emit only reached this worker")
+
+    async def _listen(self):
+        retry_sleep = 1
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError):
+                self._get_logger().error(f"Cannot listen on postgres... retrying in {retry_sleep} secs")
+                await asyncio.sleep(retry_sleep)
+                retry_sleep = min(retry_sleep * 2, 60)
+                continue
+            retry_sleep = 1
+            received: asyncio.Queue = asyncio.Queue()
+            # None marks a lost connection
+            connection.add_termination_listener(lambda _: received.put_nowait(None))
+            await connection.add_listener(self.channel, lambda *args: received.put_nowait(args[3]))
+            partial: dict[str, list[Optional[str]]] = {}
+            try:
+                while (payload := await received.get()) is not None:
+                    message = self._decode(payload, partial)
+                    if message is None:
+                        continue
+                    if message.get("method") == ENTER_ROOM_PARTICIPANTS:
+                        if message.get("host_id") != self.host_id:
+                            await self._handle_enter_room_participants(message)
+                        continue
+                    yield message
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+            self._get_logger().error("Lost the postgres listening connection... reconnecting")
+
+    @staticmethod
+    def _decode(payload: str, partial: dict[str, list[Optional[str]]]) -> Optional[dict]:
+        """Parse a payload, or buffer a chunk and parse the message once all of it arrived"""
+        if not payload.startswith(CHUNK_MARKER):
+            return orjson.loads(payload)
+        message_id, index, total, piece = payload[len(CHUNK_MARKER):].split(":", 3)
+        pieces = partial.setdefault(message_id, [None] * int(total))
+        pieces[int(index)] = piece
+        if any(piece is None for piece in pieces):
+            return None
+        del partial[message_id]
+        return orjson.loads("".join(pieces))
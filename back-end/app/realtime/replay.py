@@ -0,0 +1,57 @@
+from collections import OrderedDict, deque
+from itertools import count
+from typing import Optional
+from uuid import uuid4
+
+
+class ReplayBuffer:
+    """Per-room sequence numbers and a bounded log of each room's recent events
+
+    Sequences start at 1 and grow by one per event sent to a room. A room's
+    epoch identifies its log: sequences from another process, from before a
+    restart, or from before the room was evicted are meaningless here. Rooms
+    beyond max_rooms are evicted least recently used first; when one comes
+    back its log starts over under a new epoch, so a client resuming the old
+    one is told to reload instead of getting part of the new log.
+    """
+
+    def __init__(self, size: int, max_rooms: int):
+        self.size = size
+        self.max_rooms = max_rooms
+        self.epoch = uuid4().hex
+        # Numbers each log a room starts, so no two share an epoch
+        self._generations = count(1)
+        # room -> (epoch, last sequence, recent (sequence, event, payload) entries)
+        self._rooms: OrderedDict[str, tuple[str, int, deque]] = OrderedDict()
+
+    def record(self, room: str, event: str, payload) -> int:
+        """Log an event sent to a room and return its sequence number"""
+        entry = self._rooms.pop(room, None)
+        if entry is None:
+            entry = (f"{self.epoch}.{next(self._generations)}", 0, deque(maxlen=self.size))
+        epoch, last, log = entry
+        seq = last + 1
+        log.append((seq, event, payload))
+        self._rooms[room] = (epoch, seq, log)
+        if len(self._rooms) > self.max_rooms:
+            self._rooms.popitem(last=False)
+        return seq
+
+    def epoch_of(self, room: str) -> Optional[str]:
+        """Epoch of the room's current log, None when it has none"""
+        entry = self._rooms.get(room)
+        return entry[0] if entry is not None else None
+
+    def since(self, room: str, epoch: Optional[str], seq: int) -> Optional[list[tuple[int, str, object]]]:
+        """Events a client that last saw seq missed, or None when the log cannot cover the gap"""
+        entry = self._rooms.get(room)
+        if entry is None or epoch != entry[0]:
+            return None
+        _, last, log = entry
+        if seq > last:
+            return None
+        if seq == last:
+            return []
+        if log[0][0] > seq + 1:
+            return None
+        return [entry for entry in log if entry[0] > seq]
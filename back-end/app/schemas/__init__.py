@@ -6,9 +6,30 @@ from app.schemas.team import (
     AddTeamMember,
     InviteTeamMember,
     TeamMembershipResponse,
+    TeamSummaryResponse,
+)
+from app.schemas.todo import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoSort,
+    TodoListFilters,
+    TodoBulkRequest,
+    TodoBulkResponse,
+    TodoChangesResponse,
+)
+from app.schemas.notification import (
+    NotificationResponse,
+    NotificationUnreadCount,
+    NotificationMarkRead,
+    NotificationMarkReadResponse,
+)
+from app.schemas.realtime import (
+    OutboxMetricsResponse,
+    RoomBatchMetrics,
+    RealtimeBatchMetricsResponse,
+    ClientQueueMetricsResponse,
 )
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse
-from app.schemas.notification import NotificationResponse
 from app.schemas.ai import AiSuggestionRequest, AiSuggestionResponse
 
 __all__ = [
@@ -23,10 +44,23 @@ __all__ = [
     "AddTeamMember",
     "InviteTeamMember",
     "TeamMembershipResponse",
+    "TeamSummaryResponse",
     "TodoCreate",
     "TodoUpdate",
     "TodoResponse",
+    "TodoSort",
+    "TodoListFilters",
+    "TodoBulkRequest",
+    "TodoBulkResponse",
+    "TodoChangesResponse",
     "NotificationResponse",
+    "NotificationUnreadCount",
+    "NotificationMarkRead",
+    "NotificationMarkReadResponse",
+    "OutboxMetricsResponse",
+    "RoomBatchMetrics",
+    "RealtimeBatchMetricsResponse",
+    "ClientQueueMetricsResponse",
     "AiSuggestionRequest",
     "AiSuggestionResponse",
 ]
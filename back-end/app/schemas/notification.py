@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
@@ -9,11 +9,27 @@ class NotificationResponse(BaseModel):
     id: UUID
     user_id: UUID
     team_id: Optional[UUID]
+    todo_id: Optional[UUID] = None
     type: NotificationType
     message: str
     read: bool
+    count: int = 1
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+
+class NotificationUnreadCount(BaseModel):
+    count: int
+
+
+class NotificationMarkRead(BaseModel):
+    """Mark notifications read by id, or everything up to and including a list cursor; empty marks all"""
+
+    ids: Optional[list[UUID]] = Field(None, min_length=1, max_length=500)
+    cursor: Optional[str] = None
+
+
+class NotificationMarkReadResponse(BaseModel):
+    updated: int
@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class OutboxMetricsResponse(BaseModel):
+    pending: int
+    oldest_pending_seconds: float
+    delivered: int
+    batches: int
+    failures: int
+    last_lag_seconds: Optional[float]
+    max_lag_seconds: float
+
+
+class RoomBatchMetrics(BaseModel):
+    received: int
+    sent: int
+    flushes: int
+    max_batch_size: int
+
+
+class RealtimeBatchMetricsResponse(BaseModel):
+    interval_ms: int
+    rooms: dict[str, RoomBatchMetrics]
+
+
+class ClientQueueMetricsResponse(BaseModel):
+    high_water: int
+    clients: int
+    queued: int
+    max_queue_depth: int
+    over_high_water: int
+    resyncs: int
+    disconnects: int
+    dropped_events: int
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 from app.models.team import TeamRole
+from app.models.todo import TodoStatus
 
 
 class TeamCreate(BaseModel):
@@ -45,3 +46,12 @@ class TeamMembershipResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class TeamSummaryResponse(BaseModel):
+    team_id: UUID
+    total: int
+    by_status: dict[TodoStatus, int]
+    by_assignee: dict[UUID, int]
+    unassigned: int
+    overdue: int
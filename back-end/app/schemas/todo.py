@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Annotated, Literal, Optional, Union
 from uuid import UUID
 from app.models.todo import TodoStatus
 from app.schemas.user import UserResponse
@@ -24,6 +25,22 @@ class TodoUpdate(BaseModel):
     assignee_id: Optional[UUID] = None
 
 
+class TodoSort(str, Enum):
+    DUE_DATE = "due_date"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+
+class TodoListFilters(BaseModel):
+    status: Optional[list[TodoStatus]] = None
+    assignee_id: Optional[UUID] = None
+    unassigned: bool = False
+    overdue: bool = False
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    sort: TodoSort = TodoSort.DUE_DATE
+
+
 class TodoResponse(BaseModel):
     id: UUID
     title: str
@@ -34,9 +51,54 @@ class TodoResponse(BaseModel):
     assignee_id: Optional[UUID]
     created_at: datetime
     updated_at: datetime
+    version: int
     team: Optional[TeamResponse] = None
     assignee: Optional[UserResponse] = None
 
     class Config:
         from_attributes = True
 
+
+
+class TodoBulkCreate(BaseModel):
+    op: Literal["create"]
+    title: str = Field(..., min_length=2)
+    description: Optional[str] = None
+    due_date: Optional[datetime] = None
+    status: Optional[TodoStatus] = TodoStatus.BACKLOG
+    assignee_id: Optional[UUID] = None
+
+
+class TodoBulkUpdate(TodoUpdate):
+    op: Literal["update"]
+    id: UUID
+
+
+class TodoBulkDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+TodoBulkOperation = Annotated[
+    Union[TodoBulkCreate, TodoBulkUpdate, TodoBulkDelete],
+    Field(discriminator="op"),
+]
+
+
+class TodoBulkRequest(BaseModel):
+    team_id: UUID
+    operations: list[TodoBulkOperation] = Field(..., min_length=1, max_length=500)
+
+
+class TodoBulkResponse(BaseModel):
+    created: list[TodoResponse]
+    updated: list[TodoResponse]
+    deleted: list[UUID]
+
+
+class TodoChangesResponse(BaseModel):
+    todos: list[TodoResponse]
+    deleted: list[UUID]
+    cursor: str
+    # True when todos is the team's full list, replacing whatever the client holds
+    snapshot: bool
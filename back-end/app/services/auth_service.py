@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from app.services.user_service import UserService
 from app.schemas.auth import Register, Login, AuthResponse, TokenPayload
@@ -9,15 +9,15 @@ from app.core.config import settings
 
 class AuthService:
     @staticmethod
-    def register(db: Session, dto: Register) -> AuthResponse:
+    async def register(db: AsyncSession, dto: Register) -> AuthResponse:
         """Register a new user"""
-        user = UserService.create_user(db, dto)
+        user = await UserService.create_user(db, dto)
         return AuthService._build_auth_response(user)
 
     @staticmethod
-    def login(db: Session, dto: Login) -> AuthResponse:
+    async def login(db: AsyncSession, dto: Login) -> AuthResponse:
         """Login user"""
-        user = UserService.validate_user(db, dto.email, dto.password)
+        user = await UserService.validate_user(db, dto.email, dto.password)
         if not user:
             from fastapi import HTTPException, status
             raise HTTPException(
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Optional
+from sqlalchemy import Connection, text
+from app.core.config import settings
+from app.core.database import async_engine
+from app.services.todo_service import TodoService
+
+logger = logging.getLogger(__name__)
+
+# Monthly partitions of notifications are named after the UTC month they hold
+PARTITION_NAME = re.compile(r"^notifications_(\d{4})_(\d{2})$")
+
+_LIST_PARTITIONS = text(
+    """
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = 'notifications'::regclass
+    """
+)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the given month"""
+    return f"notifications_{month.year:04d}_{month.month:02d}"
+
+
+def _add_months(month: date, months: int) -> date:
+    """First day of the month the given number of months away"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class NotificationRetentionService:
+    @staticmethod
+    def maintain_partitions(connection: Connection, today: date | None = None) -> tuple[list[str], list[str]]:
+        """Create upcoming monthly partitions and drop those past the retention period
+
+        Old notifications go away a whole partition at a time, so retention
+        costs no row-by-row DELETE, no dead tuples and no index bloat. Returns
+        the names of the created and dropped partitions.
+        """
+        current = (today or datetime.now(timezone.utc).date()).replace(day=1)
+        existing = {}
+        for name in connection.scalars(_LIST_PARTITIONS):
+            match = PARTITION_NAME.match(name)
+            if match:
+                existing[date(int(match[1]), int(match[2]), 1)] = name
+
+        upcoming = [_add_months(current, n) for n in range(settings.NOTIFICATION_PARTITIONS_AHEAD + 1)]
+        missing = [month for month in upcoming if month not in existing]
+        cutoff = _add_months(current, -settings.NOTIFICATION_RETENTION_MONTHS)
+        expired = [name for month, name in sorted(existing.items()) if month < cutoff]
+        if not missing and not expired:
+            return [], []
+
+        # Serialize concurrent runs, and give up rather than queue traffic
+        # behind the lock the DDL takes on notifications for long
+        connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('notification_partitions'))"))
+        connection.execute(text("SET LOCAL lock_timeout = '5s'"))
+        for month in missing:
+            connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF notifications "
+                    f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{_add_months(month, 1).isoformat()} 00:00+00')"
+                )
+            )
+        for name in expired:
+            connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        return [partition_name(month) for month in missing], expired
+
+
+class PartitionMaintainer:
+    """Runs maintain_partitions in the API process when it starts and every few hours after
+
+    Without a DEFAULT partition, an insert into a month that has no partition
+    fails, so partitions must keep being created ahead of time for as long as
+    the API runs; concurrent runs from several workers are serialized by the
+    advisory lock in maintain_partitions. The same loop prunes todo tombstones
+    past their retention.
+    """
+
+    def __init__(self, connect=async_engine.begin):
+        self.connect = connect
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Run the maintenance loop on the current event loop"""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self, today: date | None = None) -> tuple[list[str], list[str]]:
+        """Create upcoming partitions and drop expired ones in one transaction"""
+        async with self.connect() as connection:
+            return await connection.run_sync(NotificationRetentionService.maintain_partitions, today)
+
+    async def prune_tombstones(self) -> int:
+        """Delete todo tombstones past their retention in one transaction"""
+        async with self.connect() as connection:
+            return await TodoService.prune_tombstones(connection)
+
+    async def _run(self):
+        while True:
+            try:
+                created, dropped = await self.run_once()
+                if created or dropped:
+                    logger.info("Notification partitions created: %s; dropped: %s", created, dropped)
+            except Exception:
+                logger.exception("Notification partition maintenance failed; retrying at the next interval")
+            try:
+                pruned = await self.prune_tombstones()
+                if pruned:
+                    logger.info("Todo tombstones pruned: %d", pruned)
+            except Exception:
+                logger.exception("Todo tombstone pruning failed; retrying at the next interval")
+            await asyncio.sleep(settings.NOTIFICATION_PARTITION_MAINTENANCE_HOURS * 3600)
@@ -1,60 +1,258 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, Text, cast, exists, func, insert, literal, select, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from datetime import datetime, timedelta
 from uuid import UUID
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
 from app.models.notification import Notification, NotificationType
-from app.models.team import Team
-from app.realtime.gateway import RealtimeGateway
+from app.models.team import Team, TeamMembership
+from app.schemas.notification import NotificationMarkRead
+from app.services.outbox_service import OutboxService
 
 
 class NotificationService:
     @staticmethod
-    def list_for_user(db: Session, user_id: UUID) -> list[Notification]:
-        """List notifications for a user"""
-        return (
-            db.query(Notification)
-            .filter(Notification.user_id == user_id)
-            .order_by(Notification.created_at.desc())
-            .limit(50)
-            .all()
+    async def list_for_user(
+        db: AsyncSession,
+        user_id: UUID,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[Notification], str | None]:
+        """List a user's notifications newest first, one keyset page at a time"""
+        query = select(Notification).where(Notification.user_id == user_id)
+        if cursor:
+            created_at, last_id = NotificationService._decode_position(cursor)
+            query = query.where(tuple_(Notification.created_at, Notification.id) < tuple_(created_at, last_id))
+        # Fetch one extra row to know whether another page follows
+        notifications = (
+            await db.scalars(
+                query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1)
+            )
+        ).all()
+        if len(notifications) <= limit:
+            return notifications, None
+        notifications = notifications[:limit]
+        last = notifications[-1]
+        return notifications, encode_cursor([last.created_at.isoformat(), str(last.id)])
+
+    @staticmethod
+    async def unread_count(db: AsyncSession, user_id: UUID) -> int:
+        """Count a user's unread notifications from the partial unread index"""
+        return await db.scalar(
+            select(func.count())
+            .select_from(Notification)
+            .where(Notification.user_id == user_id, ~Notification.read)
         )
 
     @staticmethod
-    def create_for_users(
-        db: Session,
+    async def mark_read(db: AsyncSession, user_id: UUID, dto: NotificationMarkRead) -> int:
+        """Mark notifications read with a single UPDATE and return how many changed
+
+        Targets the listed ids, or everything at or older than a list cursor;
+        with neither, every unread notification of the user.
+        """
+        if dto.ids and dto.cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ids and cursor cannot be combined",
+            )
+        query = update(Notification).where(
+            Notification.user_id == user_id,
+            ~Notification.read,
+        )
+        if dto.ids:
+            query = query.where(Notification.id.in_(dto.ids))
+        elif dto.cursor:
+            created_at, last_id = NotificationService._decode_position(dto.cursor)
+            query = query.where(tuple_(Notification.created_at, Notification.id) <= tuple_(created_at, last_id))
+        result = await db.execute(query.values(read=True).execution_options(synchronize_session=False))
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _decode_position(cursor: str) -> tuple[datetime, UUID]:
+        """Read the (created_at, id) position out of a list cursor"""
+        created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            return datetime.fromisoformat(created_at), UUID(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    @staticmethod
+    async def create_for_users(
+        db: AsyncSession,
         user_ids: list[UUID],
         team: Team | None,
         notification_type: NotificationType,
         message: str,
-        realtime_gateway: RealtimeGateway,
+        todo_id: UUID | None = None,
+    ) -> list[Notification]:
+        """Create the same notification for many users with one INSERT ... RETURNING
+
+        With a todo_id, repeats within the coalescing window merge into the
+        user's unread notification instead of adding a row.
+        """
+        if not user_ids:
+            return []
+        # The ids travel as a single uuid[] parameter, so the statement size does not grow with the recipients
+        recipients = select(
+            func.unnest(literal(list(user_ids), ARRAY(PGUUID(as_uuid=True)))).label("user_id")
+        ).subquery()
+        entries = select(
+            recipients.c.user_id,
+            literal(todo_id, PGUUID(as_uuid=True)).label("todo_id"),
+            literal(notification_type, Notification.type.type).label("type"),
+            literal(message, Notification.message.type).label("message"),
+        )
+        return await NotificationService._fan_out(
+            db, entries, team.id if team else None, coalesce=todo_id is not None
+        )
+
+    @staticmethod
+    async def create_for_team(
+        db: AsyncSession,
+        team_id: UUID,
+        notification_type: NotificationType,
+        message: str,
+        exclude_user_ids: list[UUID] | None = None,
+    ) -> list[Notification]:
+        """Notify every member of a team; recipients are selected inside the INSERT"""
+        members = select(
+            TeamMembership.user_id,
+            literal(None, PGUUID(as_uuid=True)).label("todo_id"),
+            literal(notification_type, Notification.type.type).label("type"),
+            literal(message, Notification.message.type).label("message"),
+        ).where(TeamMembership.team_id == team_id)
+        if exclude_user_ids:
+            members = members.where(TeamMembership.user_id.not_in(exclude_user_ids))
+        return await NotificationService._fan_out(db, members, team_id, coalesce=False)
+
+    @staticmethod
+    async def create_batch(
+        db: AsyncSession,
+        team_id: UUID | None,
+        entries: list[tuple[UUID, UUID | None, NotificationType, str]],
     ) -> list[Notification]:
-        """Create notifications for multiple users"""
-        notifications = []
-        for user_id in user_ids:
-            notification = Notification(
-                user_id=user_id,
-                team_id=team.id if team else None,
-                type=notification_type,
-                message=message,
+        """Create notifications with individual messages in one INSERT ... RETURNING
+
+        Each entry is a (user_id, todo_id, type, message) tuple; entries with a
+        todo_id coalesce like create_for_users.
+        """
+        if not entries:
+            return []
+        user_ids, todo_ids, types, messages = zip(*entries)
+        # One array parameter per column, zipped back into rows by a multi-argument unnest
+        rows = func.unnest(
+            literal(list(user_ids), ARRAY(PGUUID(as_uuid=True))),
+            literal(list(todo_ids), ARRAY(PGUUID(as_uuid=True))),
+            literal([notification_type.name for notification_type in types], ARRAY(Text)),
+            literal(list(messages), ARRAY(Text)),
+        ).table_valued("user_id", "todo_id", "type", "message").render_derived()
+        return await NotificationService._fan_out(
+            db,
+            select(
+                rows.c.user_id,
+                rows.c.todo_id,
+                cast(rows.c.type, Notification.type.type).label("type"),
+                rows.c.message,
+            ),
+            team_id,
+            coalesce=any(todo_ids),
+        )
+
+    @staticmethod
+    async def _fan_out(
+        db: AsyncSession,
+        entries: Select,
+        team_id: UUID | None,
+        coalesce: bool,
+    ) -> list[Notification]:
+        """Store one notification per (user_id, todo_id, type, message) entry in a single statement
+
+        Within the coalescing window, an entry matching an unread notification
+        for the same user, todo and type bumps its count and message instead of
+        inserting. Realtime events are queued in the outbox: new notifications
+        as notification.created, merged ones as notification.updated, which the
+        dispatcher debounces so a burst of edits reaches the client as one event.
+        """
+        entries = entries.add_columns(literal(team_id, PGUUID(as_uuid=True)).label("team_id")).cte("entries")
+        columns = ["user_id", "todo_id", "type", "message", "team_id"]
+        window = settings.NOTIFICATION_COALESCE_WINDOW_SECONDS
+        if coalesce and window > 0:
+            merged = (
+                update(Notification)
+                .where(
+                    Notification.user_id == entries.c.user_id,
+                    Notification.todo_id == entries.c.todo_id,
+                    Notification.type == entries.c.type,
+                    ~Notification.read,
+                    Notification.created_at >= func.now() - timedelta(seconds=window),
+                )
+                .values(count=Notification.count + 1, message=entries.c.message)
+                .returning(*Notification.__table__.c)
+                .cte("merged")
             )
-            notifications.append(notification)
-
-        db.add_all(notifications)
-        db.commit()
-
-        # Emit websocket events (fire and forget)
-        for notification in notifications:
-            db.refresh(notification)
-            payload = {
-                "id": str(notification.id),
-                "user_id": str(notification.user_id),
-                "team_id": str(notification.team_id) if notification.team_id else None,
-                "type": notification.type.value,
-                "message": notification.message,
-                "read": notification.read,
-                "created_at": notification.created_at.isoformat(),
-            }
-            realtime_gateway.notify_user_sync(
-                notification.user_id, "notification.created", payload
+            fresh = select(*(entries.c[name] for name in columns)).where(
+                ~exists().where(
+                    merged.c.user_id == entries.c.user_id,
+                    merged.c.todo_id == entries.c.todo_id,
+                    merged.c.type == entries.c.type,
+                )
             )
-
+            inserted = (
+                insert(Notification)
+                .from_select(columns, fresh)
+                .returning(*Notification.__table__.c)
+                .cte("inserted")
+            )
+            statement = (
+                select(Notification)
+                .from_statement(union_all(select(merged), select(inserted)))
+                .execution_options(populate_existing=True)
+            )
+        else:
+            statement = insert(Notification).from_select(
+                columns, select(*(entries.c[name] for name in columns))
+            ).returning(Notification)
+        notifications = (await db.scalars(statement)).all()
+        # Queued in the same transaction, so an emitted notification always exists and a stored one is always emitted
+        await OutboxService.add_user_events(
+            db,
+            "notification.created",
+            [
+                (notification.user_id, NotificationService._event_payload(notification))
+                for notification in notifications
+                if notification.count == 1
+            ],
+        )
+        await OutboxService.add_user_events(
+            db,
+            "notification.updated",
+            [
+                (notification.user_id, NotificationService._event_payload(notification))
+                for notification in notifications
+                if notification.count > 1
+            ],
+        )
+        await db.commit()
         return notifications
 
+    @staticmethod
+    def _event_payload(notification: Notification) -> dict:
+        """Realtime payload for a stored notification"""
+        return {
+            "id": str(notification.id),
+            "user_id": str(notification.user_id),
+            "team_id": str(notification.team_id) if notification.team_id else None,
+            "todo_id": str(notification.todo_id) if notification.todo_id else None,
+            "type": notification.type.value,
+            "message": notification.message,
+            "read": notification.read,
+            "count": notification.count,
+            "created_at": notification.created_at.isoformat(),
+        }
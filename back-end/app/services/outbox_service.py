@@ -0,0 +1,29 @@
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from app.models.outbox import RealtimeOutbox
+
+# Session.info flag telling the after-commit hook to wake the dispatcher
+OUTBOX_PENDING = "realtime_outbox_pending"
+
+
+class OutboxService:
+    @staticmethod
+    async def add_team_event(db: AsyncSession, team_id: UUID, event: str, payload: dict) -> None:
+        """Queue an event for a team room in the caller's transaction"""
+        await OutboxService._add(db, [{"team_id": team_id, "event": event, "payload": payload}])
+
+    @staticmethod
+    async def add_user_events(db: AsyncSession, event: str, payloads: list[tuple[UUID, dict]]) -> None:
+        """Queue one event per user, each with its own payload, in the caller's transaction"""
+        await OutboxService._add(
+            db, [{"user_id": user_id, "event": event, "payload": payload} for user_id, payload in payloads]
+        )
+
+    @staticmethod
+    async def _add(db: AsyncSession, rows: list[dict]) -> None:
+        """Insert outbox rows; nothing is emitted until the transaction commits"""
+        if not rows:
+            return
+        await db.execute(insert(RealtimeOutbox.__table__), rows)
+        db.info[OUTBOX_PENDING] = True
@@ -1,25 +1,37 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from fastapi import HTTPException, status
 from uuid import UUID
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.team import Team, TeamMembership, TeamRole
+from app.models.todo import Todo, TodoStatus, TeamTodoCount, TeamTodoDueCount
 from app.models.user import User
 from app.schemas.team import TeamCreate, AddTeamMember, InviteTeamMember
+from app.services.outbox_service import OutboxService
 from app.services.user_service import UserService
 
+# (team_id, user_id) -> TeamRole for confirmed members; non-members are never cached
+membership_cache = TTLCache(
+    maxsize=settings.MEMBERSHIP_CACHE_SIZE,
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+
 
 class TeamService:
     @staticmethod
-    def create_team(db: Session, owner_id: UUID, dto: TeamCreate) -> Team:
+    async def create_team(db: AsyncSession, owner_id: UUID, dto: TeamCreate) -> Team:
         """Create a new team"""
-        owner = UserService.find_by_id(db, owner_id)
+        owner = await UserService.find_by_id(db, owner_id)
         team = Team(
             name=dto.name,
             description=dto.description,
             owner_id=owner.id,
         )
         db.add(team)
-        db.commit()
-        db.refresh(team)
+        await db.commit()
+        await db.refresh(team)
 
         # Create owner membership
         membership = TeamMembership(
@@ -28,15 +40,16 @@ class TeamService:
             role=TeamRole.OWNER,
         )
         db.add(membership)
-        db.commit()
-        db.refresh(team)
+        await TeamService._queue_team_added(db, team.id, owner.id)
+        await db.commit()
+        await db.refresh(team)
         return team
 
     @staticmethod
-    def find_team_by_id(db: Session, team_id: UUID, user_id: UUID) -> Team:
+    async def find_team_by_id(db: AsyncSession, team_id: UUID, user_id: UUID) -> Team:
         """Find team by ID with access check"""
-        TeamService._ensure_membership(db, team_id, user_id)
-        team = db.query(Team).filter(Team.id == team_id).first()
+        await TeamService._ensure_membership(db, team_id, user_id)
+        team = await db.get(Team, team_id)
         if not team:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -45,16 +58,16 @@ class TeamService:
         return team
 
     @staticmethod
-    def get_teams_for_user(db: Session, user_id: UUID) -> list[dict]:
+    async def get_teams_for_user(db: AsyncSession, user_id: UUID) -> list[dict]:
         """Get all teams for a user"""
-        from sqlalchemy.orm import joinedload
         memberships = (
-            db.query(TeamMembership)
-            .options(joinedload(TeamMembership.team).joinedload(Team.owner))
-            .filter(TeamMembership.user_id == user_id)
-            .order_by(TeamMembership.created_at)
-            .all()
-        )
+            await db.scalars(
+                select(TeamMembership)
+                .options(joinedload(TeamMembership.team).joinedload(Team.owner))
+                .where(TeamMembership.user_id == user_id)
+                .order_by(TeamMembership.created_at)
+            )
+        ).all()
         result = []
         for membership in memberships:
             team_dict = {
@@ -70,36 +83,41 @@ class TeamService:
         return result
 
     @staticmethod
-    def add_member(
-        db: Session, team_id: UUID, actor_id: UUID, dto: AddTeamMember
+    async def get_team_ids_for_user(db: AsyncSession, user_id: UUID) -> list[UUID]:
+        """Ids of every team the user belongs to, in one query; also warms the membership cache"""
+        rows = (
+            await db.execute(
+                select(TeamMembership.team_id, TeamMembership.role).where(TeamMembership.user_id == user_id)
+            )
+        ).all()
+        for team_id, role in rows:
+            membership_cache.set((team_id, user_id), role)
+        return [team_id for team_id, _ in rows]
+
+    @staticmethod
+    async def add_member(
+        db: AsyncSession, team_id: UUID, actor_id: UUID, dto: AddTeamMember
     ) -> dict:
         """Add a member to a team"""
-        team = db.query(Team).filter(Team.id == team_id).first()
+        team = await db.get(Team, team_id)
         if not team:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Team not found",
             )
 
-        actor = (
-            db.query(TeamMembership)
-            .filter(
-                TeamMembership.team_id == team_id,
-                TeamMembership.user_id == actor_id,
-            )
-            .first()
-        )
-        if not actor or actor.role != TeamRole.OWNER:
+        actor_role = await TeamService._get_role(db, team_id, actor_id)
+        if actor_role != TeamRole.OWNER:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only team owners can add members",
             )
 
-        user = UserService.find_by_email(db, dto.email)
+        user = await UserService.find_by_email(db, dto.email)
         if not user:
             # Auto-create user with default password
             from app.schemas.user import UserCreate
-            user = UserService.create_user(
+            user = await UserService.create_user(
                 db,
                 UserCreate(
                     name=dto.name or dto.email,
@@ -108,15 +126,13 @@ class TeamService:
                 ),
             )
 
-        from sqlalchemy.orm import joinedload
-        existing = (
-            db.query(TeamMembership)
+        existing = await db.scalar(
+            select(TeamMembership)
             .options(joinedload(TeamMembership.user))
-            .filter(
+            .where(
                 TeamMembership.team_id == team_id,
                 TeamMembership.user_id == user.id,
             )
-            .first()
         )
         if existing:
             return {
@@ -134,55 +150,44 @@ class TeamService:
             role=dto.role or TeamRole.MEMBER,
         )
         db.add(membership)
-        db.commit()
-        db.refresh(membership)
-        # Reload with user relationship
-        membership = (
-            db.query(TeamMembership)
-            .options(joinedload(TeamMembership.user))
-            .filter(TeamMembership.id == membership.id)
-            .first()
-        )
+        await TeamService.bump_version(db, team_id, Team.members_version)
+        await TeamService._queue_team_added(db, team_id, user.id)
+        await db.commit()
+        await db.refresh(membership)
+        membership_cache.invalidate((team_id, user.id))
         return {
             "id": membership.id,
             "team_id": membership.team_id,
             "user_id": membership.user_id,
-            "user_name": membership.user.name,
+            "user_name": user.name,
             "role": membership.role,
             "created_at": membership.created_at,
         }
 
     @staticmethod
-    def invite_member(
-        db: Session, team_id: UUID, actor_id: UUID, dto: InviteTeamMember
+    async def invite_member(
+        db: AsyncSession, team_id: UUID, actor_id: UUID, dto: InviteTeamMember
     ) -> dict:
         """Invite a member to a team"""
-        team = db.query(Team).filter(Team.id == team_id).first()
+        team = await db.get(Team, team_id)
         if not team:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Team not found",
             )
 
-        actor = (
-            db.query(TeamMembership)
-            .filter(
-                TeamMembership.team_id == team_id,
-                TeamMembership.user_id == actor_id,
-            )
-            .first()
-        )
-        if not actor or actor.role != TeamRole.OWNER:
+        actor_role = await TeamService._get_role(db, team_id, actor_id)
+        if actor_role != TeamRole.OWNER:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only team owners can invite members",
             )
 
-        user = UserService.find_by_email(db, dto.email)
+        user = await UserService.find_by_email(db, dto.email)
         if not user:
             # Create user with default password
             from app.schemas.user import UserCreate
-            user = UserService.create_user(
+            user = await UserService.create_user(
                 db,
                 UserCreate(
                     name=dto.name,
@@ -191,15 +196,13 @@ class TeamService:
                 ),
             )
 
-        from sqlalchemy.orm import joinedload
-        existing = (
-            db.query(TeamMembership)
+        existing = await db.scalar(
+            select(TeamMembership)
             .options(joinedload(TeamMembership.user))
-            .filter(
+            .where(
                 TeamMembership.team_id == team_id,
                 TeamMembership.user_id == user.id,
             )
-            .first()
         )
         if existing:
             return {
@@ -217,36 +220,32 @@ class TeamService:
             role=dto.role or TeamRole.MEMBER,
         )
         db.add(membership)
-        db.commit()
-        db.refresh(membership)
-        # Reload with user relationship
-        membership = (
-            db.query(TeamMembership)
-            .options(joinedload(TeamMembership.user))
-            .filter(TeamMembership.id == membership.id)
-            .first()
-        )
+        await TeamService.bump_version(db, team_id, Team.members_version)
+        await TeamService._queue_team_added(db, team_id, user.id)
+        await db.commit()
+        await db.refresh(membership)
+        membership_cache.invalidate((team_id, user.id))
         return {
             "id": membership.id,
             "team_id": membership.team_id,
             "user_id": membership.user_id,
-            "user_name": membership.user.name,
+            "user_name": user.name,
             "role": membership.role,
             "created_at": membership.created_at,
         }
 
     @staticmethod
-    def get_members(db: Session, team_id: UUID, user_id: UUID) -> list[dict]:
+    async def get_members(db: AsyncSession, team_id: UUID, user_id: UUID) -> list[dict]:
         """Get all members of a team"""
-        TeamService._ensure_membership(db, team_id, user_id)
-        from sqlalchemy.orm import joinedload
+        await TeamService._ensure_membership(db, team_id, user_id)
         memberships = (
-            db.query(TeamMembership)
-            .options(joinedload(TeamMembership.user))
-            .filter(TeamMembership.team_id == team_id)
-            .order_by(TeamMembership.created_at)
-            .all()
-        )
+            await db.scalars(
+                select(TeamMembership)
+                .options(joinedload(TeamMembership.user))
+                .where(TeamMembership.team_id == team_id)
+                .order_by(TeamMembership.created_at)
+            )
+        ).all()
         result = []
         for membership in memberships:
             result.append({
@@ -260,20 +259,124 @@ class TeamService:
         return result
 
     @staticmethod
-    def _ensure_membership(db: Session, team_id: UUID, user_id: UUID) -> TeamMembership:
-        """Ensure user is a member of the team"""
-        membership = (
-            db.query(TeamMembership)
-            .filter(
+    async def get_summary(db: AsyncSession, team_id: UUID, user_id: UUID) -> dict:
+        """Get the team's todo counts by status and assignee, plus the overdue count
+
+        Reads the trigger-maintained counter tables instead of the todos, so the
+        cost follows the number of statuses, assignees and past due days rather
+        than the size of the board. Only todos due earlier today are read directly.
+        """
+        await TeamService._ensure_membership(db, team_id, user_id)
+        rows = await db.execute(
+            select(TeamTodoCount.status, TeamTodoCount.assignee_id, TeamTodoCount.count).where(
+                TeamTodoCount.team_id == team_id
+            )
+        )
+        by_status = {todo_status: 0 for todo_status in TodoStatus}
+        by_assignee: dict[UUID, int] = {}
+        unassigned = 0
+        for todo_status, assignee_id, count in rows:
+            by_status[todo_status] += count
+            if assignee_id is None:
+                unassigned += count
+            else:
+                by_assignee[assignee_id] = by_assignee.get(assignee_id, 0) + count
+
+        # Same definition as the overdue list filter; due dates are naive UTC
+        now_utc = func.timezone("UTC", func.now())
+        start_of_today = func.date_trunc("day", now_utc)
+        due_before_today = (
+            select(func.coalesce(func.sum(TeamTodoDueCount.count), 0))
+            .where(TeamTodoDueCount.team_id == team_id, TeamTodoDueCount.due_day < func.date(now_utc))
+            .scalar_subquery()
+        )
+        due_earlier_today = (
+            select(func.count())
+            .select_from(Todo)
+            .where(
+                Todo.team_id == team_id,
+                Todo.status != TodoStatus.DONE,
+                Todo.due_date >= start_of_today,
+                Todo.due_date < now_utc,
+            )
+            .scalar_subquery()
+        )
+        overdue = await db.scalar(select(due_before_today + due_earlier_today))
+
+        return {
+            "team_id": team_id,
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "by_assignee": by_assignee,
+            "unassigned": unassigned,
+            "overdue": overdue,
+        }
+
+    @staticmethod
+    async def get_version(db: AsyncSession, team_id: UUID, user_id: UUID, column) -> int:
+        """Read one of the team's list versions (Team.todos_version / Team.members_version)"""
+        await TeamService._ensure_membership(db, team_id, user_id)
+        return await db.scalar(select(column).where(Team.id == team_id))
+
+    @staticmethod
+    async def bump_version(db: AsyncSession, team_id: UUID, column) -> None:
+        """Advance one of the team's list versions within the caller's transaction"""
+        await db.execute(
+            update(Team)
+            .where(Team.id == team_id)
+            .values({column: column + 1})
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def _queue_team_added(db: AsyncSession, team_id: UUID, user_id: UUID) -> None:
+        """Queue moving the user's connected clients into the team room once the membership commits"""
+        await OutboxService.add_user_events(db, "team.added", [(user_id, {"teamId": str(team_id)})])
+
+    @staticmethod
+    async def _get_role(db: AsyncSession, team_id: UUID, user_id: UUID) -> TeamRole | None:
+        """Get the user's role in the team, or None if they are not a member"""
+        key = (team_id, user_id)
+        role = membership_cache.get(key)
+        if role is not None:
+            return role
+        role = await db.scalar(
+            select(TeamMembership.role).where(
                 TeamMembership.team_id == team_id,
                 TeamMembership.user_id == user_id,
             )
-            .first()
         )
-        if not membership:
+        if role is not None:
+            membership_cache.set(key, role)
+        return role
+
+    @staticmethod
+    async def _ensure_membership(db: AsyncSession, team_id: UUID, user_id: UUID) -> TeamRole:
+        """Ensure user is a member of the team and return their role"""
+        role = await TeamService._get_role(db, team_id, user_id)
+        if role is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You are not a member of this team",
             )
-        return membership
+        return role
 
+    @staticmethod
+    async def _ensure_members(db: AsyncSession, team_id: UUID, user_ids: set[UUID]) -> None:
+        """Ensure every user is a member of the team, looking up cache misses in one query"""
+        missing = {user_id for user_id in user_ids if membership_cache.get((team_id, user_id)) is None}
+        if missing:
+            rows = await db.execute(
+                select(TeamMembership.user_id, TeamMembership.role).where(
+                    TeamMembership.team_id == team_id,
+                    TeamMembership.user_id.in_(missing),
+                )
+            )
+            for user_id, role in rows:
+                membership_cache.set((team_id, user_id), role)
+                missing.discard(user_id)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not a member of this team",
+            )
@@ -1,301 +1,606 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, cast, column, delete, func, insert, literal_column, or_, select, text, tuple_, update, values
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import joinedload
 from fastapi import HTTPException, status
-from uuid import UUID
-from app.models.todo import Todo, TodoStatus
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.serialization import todo_delta_payload, todo_event_payload, todo_to_dict
+from app.models.todo import Todo, TodoStatus, TodoTombstone
 from app.models.team import Team, TeamMembership
-from app.models.user import User
 from app.models.notification import Notification, NotificationType
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse
+from app.schemas.todo import TodoCreate, TodoUpdate, TodoBulkRequest, TodoListFilters, TodoSort
 from app.services.team_service import TeamService
 from app.services.notification_service import NotificationService
-from app.realtime.gateway import RealtimeGateway
-import asyncio
+from app.services.outbox_service import OutboxService
+
+# Start of the oldest transaction still open in the API's own sessions. Rows
+# written by transactions in flight are stamped with their own start time, never
+# earlier. Only the API's role writes todos, so sessions of other roles and
+# background workers (autovacuum, replication) cannot hold the horizon back.
+# Also returns how far back tombstones are still kept.
+_SYNC_HORIZON = text(
+    "SELECT coalesce(min(xact_start), now()) AS horizon,"
+    " now() - make_interval(days => :retention_days) AS tombstones_since"
+    " FROM pg_stat_activity"
+    " WHERE datname = current_database() AND usename = current_user AND backend_type = 'client backend'"
+)
+
+# Due date as sorted and indexed: undated todos count as due at infinity, so they
+# sort last and every due date bound stays an index condition. The literal must
+# match the ix_todos_team_due_key expression, a bound parameter would not
+_NO_DUE_DATE = literal_column("'infinity'::timestamp")
+_DUE_KEY = func.coalesce(Todo.due_date, _NO_DUE_DATE)
+
+# ORDER BY for each list sort; every one is served by an index on todos (see app.models.todo)
+_SORT_ORDER = {
+    TodoSort.DUE_DATE: (_DUE_KEY.asc(), Todo.created_at.desc(), Todo.id.desc()),
+    TodoSort.CREATED_AT: (Todo.created_at.desc(), Todo.id.desc()),
+    TodoSort.UPDATED_AT: (Todo.updated_at.desc(), Todo.id.desc()),
+}
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to the naive UTC form due dates are stored in"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 class TodoService:
     @staticmethod
-    def create(
-        db: Session,
+    async def create(
+        db: AsyncSession,
         user_id: UUID,
         dto: TodoCreate,
-        realtime_gateway: RealtimeGateway,
         notification_service: NotificationService,
-    ) -> Todo:
-        """Create a new todo"""
-        membership = TeamService._ensure_membership(db, dto.team_id, user_id)
-        team = membership.team
+    ) -> dict:
+        """Create a new todo and return it serialized"""
+        await TeamService._ensure_membership(db, dto.team_id, user_id)
 
-        assignee = None
+        # A team member is always an existing user, so no separate user lookup
         if dto.assignee_id:
-            TeamService._ensure_membership(db, dto.team_id, dto.assignee_id)
-            assignee = db.query(User).filter(User.id == dto.assignee_id).first()
-
-        todo = Todo(
-            title=dto.title,
-            description=dto.description,
-            status=dto.status or TodoStatus.BACKLOG,
-            due_date=dto.due_date,
-            team_id=team.id,
-            assignee_id=assignee.id if assignee else None,
-        )
-        db.add(todo)
-        db.commit()
-        db.refresh(todo)
-
-        # Load relationships including team owner
-        db.refresh(todo, ["team", "assignee"])
-        if todo.team and todo.team.owner_id:
-            # Load team owner if not already loaded
-            from sqlalchemy.orm import joinedload
-            team_with_owner = (
-                db.query(Team)
-                .options(joinedload(Team.owner))
-                .filter(Team.id == todo.team.id)
-                .first()
+            await TeamService._ensure_membership(db, dto.team_id, dto.assignee_id)
+
+        todo_id = await db.scalar(
+            insert(Todo)
+            .values(
+                title=dto.title,
+                description=dto.description,
+                status=dto.status or TodoStatus.BACKLOG,
+                due_date=_naive_utc(dto.due_date) if dto.due_date is not None else None,
+                team_id=dto.team_id,
+                assignee_id=dto.assignee_id,
             )
-            if team_with_owner:
-                todo.team = team_with_owner
-
-        # Convert to response schema for websocket payload
-        todo_response = TodoResponse.model_validate(todo)
-        todo_dict = todo_response.model_dump(mode="json")
-        
-        # Convert UUIDs and dates to strings for JSON serialization
-        todo_dict["id"] = str(todo_dict["id"])
-        todo_dict["team_id"] = str(todo_dict["team_id"])
-        if todo_dict.get("assignee_id"):
-            todo_dict["assignee_id"] = str(todo_dict["assignee_id"])
-        if todo_dict.get("assignee"):
-            todo_dict["assignee"]["id"] = str(todo_dict["assignee"]["id"])
-        if todo_dict.get("team"):
-            todo_dict["team"]["id"] = str(todo_dict["team"]["id"])
-            if todo_dict["team"].get("owner_id"):
-                todo_dict["team"]["owner_id"] = str(todo_dict["team"]["owner_id"])
-            # Add owner object if available
-            if todo.team and todo.team.owner:
-                todo_dict["team"]["owner"] = {
-                    "id": str(todo.team.owner.id),
-                    "email": todo.team.owner.email,
-                    "name": todo.team.owner.name,
-                }
-
-        # Broadcast realtime event (fire and forget)
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                task = asyncio.create_task(
-                    realtime_gateway.broadcast_todo_change(team.id, "todo.created", todo_dict)
-                )
-                print(f"Created async task to broadcast todo.created for team {team.id}")
-            else:
-                asyncio.run(
-                    realtime_gateway.broadcast_todo_change(team.id, "todo.created", todo_dict)
-                )
-        except Exception as e:
-            print(f"Error creating broadcast task for todo.created: {e}")
-            import traceback
-            traceback.print_exc()
+            .returning(Todo.id)
+        )
+        await TeamService.bump_version(db, dto.team_id, Team.todos_version)
+        todo = await TodoService._fetch(db, todo_id)
+        team = todo.team
+
+        # Serialize once: the dict is both the REST body and the realtime payload
+        todo_dict = todo_to_dict(todo)
+
+        # Queue the realtime event in the same transaction as the change
+        await OutboxService.add_team_event(
+            db, team.id, "todo.created", todo_event_payload(todo, todo_dict)
+        )
 
-        # Notify assignee if different from creator
+        # Notify assignee if different from creator, in the same transaction
         if todo.assignee_id and todo.assignee_id != user_id:
-            notification_service.create_for_users(
+            await notification_service.create_for_users(
                 db,
                 user_ids=[todo.assignee_id],
                 team=team,
                 notification_type=NotificationType.TODO_CREATED,
                 message=f'You were assigned task "{todo.title}"',
-                realtime_gateway=realtime_gateway,
+                todo_id=todo.id,
+            )
+        await db.commit()
+
+        return todo_dict
+
+    @staticmethod
+    async def bulk(
+        db: AsyncSession,
+        user_id: UUID,
+        dto: TodoBulkRequest,
+        notification_service: NotificationService,
+    ) -> dict:
+        """Apply create/update/delete operations for one team in a single transaction
+
+        Each kind of operation runs as one set-based statement, notifications are
+        written in one batch and the team room receives a single todo.bulk event.
+        """
+        team_id = dto.team_id
+        await TeamService._ensure_membership(db, team_id, user_id)
+
+        creates = [op for op in dto.operations if op.op == "create"]
+        updates = [op for op in dto.operations if op.op == "update"]
+        deletes = [op for op in dto.operations if op.op == "delete"]
+
+        target_ids = [op.id for op in updates + deletes]
+        if len(set(target_ids)) != len(target_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A todo can only appear in one operation",
+            )
+        assignee_ids = {op.assignee_id for op in creates + updates if op.assignee_id}
+        if assignee_ids:
+            await TeamService._ensure_members(db, team_id, assignee_ids)
+
+        # Current assignees and titles drive the notifications; todos of other teams count as missing
+        previous = {}
+        if target_ids:
+            rows = await db.execute(
+                select(Todo.id, Todo.assignee_id, Todo.title).where(
+                    Todo.id.in_(target_ids), Todo.team_id == team_id
+                )
             )
+            previous = {row.id: row for row in rows}
+            if len(previous) != len(target_ids):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Todo not found",
+                )
+
+        # Ids are assigned here so the created todos come back in request order
+        created_ids = [uuid4() for _ in creates]
+        if creates:
+            await db.execute(
+                insert(Todo).values([
+                    {
+                        "id": todo_id,
+                        "title": op.title,
+                        "description": op.description,
+                        "status": op.status or TodoStatus.BACKLOG,
+                        "due_date": _naive_utc(op.due_date) if op.due_date is not None else None,
+                        "team_id": team_id,
+                        "assignee_id": op.assignee_id,
+                    }
+                    for todo_id, op in zip(created_ids, creates)
+                ])
+            )
+
+        if updates:
+            fields = ("title", "description", "status", "due_date", "assignee_id")
+            columns = Todo.__table__.c
+            changes = values(
+                column("id", columns.id.type),
+                *(column(name, columns[name].type) for name in fields),
+                name="changes",
+            ).data([
+                (op.id, *(_naive_utc(value) if isinstance(value, datetime) else value
+                          for value in (getattr(op, name) for name in fields)))
+                for op in updates
+            ])
+            # Omitted fields arrive as NULL and keep their current value, as with PATCH;
+            # the casts type columns Postgres would read as text when every row is NULL
+            updated_ids = (
+                await db.scalars(
+                    update(Todo)
+                    .where(Todo.id == changes.c.id, Todo.team_id == team_id)
+                    .values({
+                        **{
+                            name: func.coalesce(cast(changes.c[name], columns[name].type), columns[name])
+                            for name in fields
+                        },
+                        "version": columns.version + 1,
+                    })
+                    .returning(Todo.id)
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+            if len(updated_ids) != len(updates):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Todo not found",
+                )
+
+        deleted_ids = []
+        if deletes:
+            deleted_ids = (
+                await db.scalars(
+                    delete(Todo)
+                    .where(Todo.id.in_([op.id for op in deletes]), Todo.team_id == team_id)
+                    .returning(Todo.id)
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+            if len(deleted_ids) != len(deletes):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Todo not found",
+                )
+            await db.execute(
+                insert(TodoTombstone).values([
+                    {"id": todo_id, "team_id": team_id} for todo_id in deleted_ids
+                ])
+            )
+
+        await TeamService.bump_version(db, team_id, Team.todos_version)
+
+        todos = {}
+        fetch_ids = [*created_ids, *(op.id for op in updates)]
+        if fetch_ids:
+            todos = {
+                todo.id: todo
+                for todo in await db.scalars(
+                    select(Todo)
+                    .options(
+                        joinedload(Todo.assignee),
+                        joinedload(Todo.team).joinedload(Team.owner),
+                    )
+                    .where(Todo.id.in_(fetch_ids))
+                    .execution_options(populate_existing=True)
+                )
+            }
+
+        created = [todos[todo_id] for todo_id in created_ids]
+        updated = [todos[op.id] for op in updates]
+        result = {
+            "created": [todo_to_dict(todo) for todo in created],
+            "updated": [todo_to_dict(todo) for todo in updated],
+            "deleted": [str(todo_id) for todo_id in deleted_ids],
+        }
 
-        return TodoService.find_one(db, todo.id, user_id)
+        # One aggregated event instead of one per todo, queued with the changes
+        await OutboxService.add_team_event(
+            db,
+            team_id,
+            "todo.bulk",
+            {
+                "team_id": str(team_id),
+                "created": [todo_event_payload(todo, data) for todo, data in zip(created, result["created"])],
+                "updated": [todo_event_payload(todo, data) for todo, data in zip(updated, result["updated"])],
+                "deleted": result["deleted"],
+            },
+        )
+
+        # Same rules as the single-todo endpoints, written in one batch
+        entries = []
+        for todo in created:
+            if todo.assignee_id and todo.assignee_id != user_id:
+                entries.append((todo.assignee_id, todo.id, NotificationType.TODO_CREATED, f'You were assigned task "{todo.title}"'))
+        for todo in updated:
+            if todo.assignee_id and todo.assignee_id != user_id:
+                if previous[todo.id].assignee_id != todo.assignee_id:
+                    message = f'You were assigned task "{todo.title}"'
+                else:
+                    message = f'Task "{todo.title}" was updated'
+                entries.append((todo.assignee_id, todo.id, NotificationType.TODO_UPDATED, message))
+        for todo_id in deleted_ids:
+            row = previous[todo_id]
+            if row.assignee_id and row.assignee_id != user_id:
+                entries.append((row.assignee_id, todo_id, NotificationType.TODO_DELETED, f'Task "{row.title}" was deleted'))
+        await notification_service.create_batch(db, team_id, entries)
+        await db.commit()
+
+        return result
 
     @staticmethod
-    def find_all_for_team(db: Session, team_id: UUID, user_id: UUID) -> list[Todo]:
-        """Get all todos for a team"""
-        TeamService._ensure_membership(db, team_id, user_id)
-        return (
-            db.query(Todo)
+    async def find_all_for_team(
+        db: AsyncSession,
+        team_id: UUID,
+        user_id: UUID,
+        limit: int | None = None,
+        cursor: str | None = None,
+        filters: TodoListFilters | None = None,
+    ) -> tuple[list[Todo], str | None]:
+        """Get filtered, sorted todos for a team, one keyset page at a time when a limit is given"""
+        await TeamService._ensure_membership(db, team_id, user_id)
+        filters = filters or TodoListFilters()
+        query = (
+            select(Todo)
             .options(joinedload(Todo.assignee), joinedload(Todo.team))
-            .filter(Todo.team_id == team_id)
-            .order_by(Todo.due_date.asc().nullslast(), Todo.created_at.desc())
-            .all()
+            .where(Todo.team_id == team_id, *TodoService._filter_clauses(filters))
         )
+        if cursor:
+            query = query.where(TodoService._after_cursor(cursor, filters.sort))
+        query = query.order_by(*_SORT_ORDER[filters.sort])
+        if limit is None:
+            return (await db.scalars(query)).all(), None
+
+        # Fetch one extra row to know whether another page follows
+        todos = (await db.scalars(query.limit(limit + 1))).all()
+        if len(todos) <= limit:
+            return todos, None
+        todos = todos[:limit]
+        return todos, encode_cursor(TodoService._cursor_values(todos[-1], filters.sort))
 
     @staticmethod
-    def find_one(db: Session, todo_id: UUID, user_id: UUID) -> Todo:
-        """Get a single todo"""
-        todo = (
-            db.query(Todo)
+    def _filter_clauses(filters: TodoListFilters) -> list:
+        """Translate list filters into WHERE clauses"""
+        if filters.assignee_id and filters.unassigned:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="assigneeId and unassigned cannot be combined",
+            )
+        clauses = []
+        if filters.status:
+            clauses.append(Todo.status.in_(filters.status))
+        if filters.assignee_id:
+            clauses.append(Todo.assignee_id == filters.assignee_id)
+        if filters.unassigned:
+            clauses.append(Todo.assignee_id.is_(None))
+        # Due date bounds go through _DUE_KEY so the sort index serves them
+        if filters.overdue:
+            # due_date is stored as naive UTC
+            clauses.append(_DUE_KEY < func.timezone("UTC", func.now()))
+            clauses.append(Todo.status != TodoStatus.DONE)
+        if filters.due_after:
+            clauses.append(_DUE_KEY >= _naive_utc(filters.due_after))
+            clauses.append(Todo.due_date.is_not(None))
+        if filters.due_before:
+            clauses.append(_DUE_KEY < _naive_utc(filters.due_before))
+        return clauses
+
+    @staticmethod
+    async def changes_since(
+        db: AsyncSession,
+        team_id: UUID,
+        user_id: UUID,
+        since: str | None = None,
+    ) -> tuple[list[Todo], list[UUID], str, bool]:
+        """Get todos changed and ids deleted since a sync cursor, the next cursor and whether it is a snapshot
+
+        Without a cursor, or with one older than the tombstone retention, every
+        todo is returned as a snapshot the client replaces its copy with. The
+        next cursor is the sync horizon taken before reading, so writes still in
+        flight are picked up by the following sync; rows on the boundary may be
+        sent twice, which clients absorb as upserts.
+        """
+        await TeamService._ensure_membership(db, team_id, user_id)
+        horizon, tombstones_since = (
+            await db.execute(_SYNC_HORIZON, {"retention_days": settings.TODO_TOMBSTONE_RETENTION_DAYS})
+        ).one()
+        next_cursor = encode_cursor([horizon.isoformat()])
+
+        query = (
+            select(Todo)
             .options(joinedload(Todo.assignee), joinedload(Todo.team))
-            .filter(Todo.id == todo_id)
-            .first()
+            .where(Todo.team_id == team_id)
+            .order_by(Todo.updated_at, Todo.id)
+        )
+        changed_after = TodoService._decode_since(since) if since is not None else None
+        if changed_after is None or changed_after < tombstones_since:
+            # Deletions this old may have been pruned, so a delta could miss them
+            return (await db.scalars(query)).all(), [], next_cursor, True
+
+        todos = (await db.scalars(query.where(Todo.updated_at >= changed_after))).all()
+        deleted_ids = (
+            await db.scalars(
+                select(TodoTombstone.id).where(
+                    TodoTombstone.team_id == team_id,
+                    TodoTombstone.deleted_at >= changed_after,
+                )
+            )
+        ).all()
+        return todos, deleted_ids, next_cursor, False
+
+    @staticmethod
+    async def prune_tombstones(connection: AsyncConnection) -> int:
+        """Delete tombstones older than TODO_TOMBSTONE_RETENTION_DAYS; returns how many were removed"""
+        result = await connection.execute(
+            delete(TodoTombstone).where(
+                TodoTombstone.deleted_at < func.now() - timedelta(days=settings.TODO_TOMBSTONE_RETENTION_DAYS)
+            )
         )
+        return result.rowcount
+
+    @staticmethod
+    def _decode_since(cursor: str) -> datetime:
+        """Read the timestamp out of a sync cursor"""
+        (value,) = decode_cursor(cursor, 1)
+        try:
+            since = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        # Cursors are written with their UTC offset; one without is read as UTC
+        return since if since.tzinfo is not None else since.replace(tzinfo=timezone.utc)
+
+    @staticmethod
+    async def _fetch(db: AsyncSession, todo_id: UUID) -> Todo | None:
+        """Load a todo with its assignee and team (including the owner) in one query"""
+        return await db.scalar(
+            select(Todo)
+            .options(
+                joinedload(Todo.assignee),
+                joinedload(Todo.team).joinedload(Team.owner),
+            )
+            .where(Todo.id == todo_id)
+            .execution_options(populate_existing=True)
+        )
+
+    @staticmethod
+    def _cursor_values(todo: Todo, sort: TodoSort) -> list:
+        """Keyset values of the last row on a page, tagged with the sort they belong to"""
+        if sort is TodoSort.DUE_DATE:
+            return [
+                sort.value,
+                todo.due_date.isoformat() if todo.due_date else None,
+                todo.created_at.isoformat(),
+                str(todo.id),
+            ]
+        return [sort.value, getattr(todo, sort.value).isoformat(), str(todo.id)]
+
+    @staticmethod
+    def _after_cursor(cursor: str, sort: TodoSort):
+        """Build the keyset predicate for rows sorted after the cursor position"""
+        parts = decode_cursor(cursor, 4 if sort is TodoSort.DUE_DATE else 3)
+        if parts[0] != sort.value:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        try:
+            if sort is TodoSort.DUE_DATE:
+                due_date = datetime.fromisoformat(parts[1]) if parts[1] else None
+            timestamp = datetime.fromisoformat(parts[-2])
+            last_id = UUID(parts[-1])
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+        if sort is not TodoSort.DUE_DATE:
+            # Newest first, ties broken by id descending
+            return tuple_(getattr(Todo, sort.value), Todo.id) < tuple_(timestamp, last_id)
+
+        # Within the same due date, rows continue newest first, ties broken by id descending
+        later_in_group = tuple_(Todo.created_at, Todo.id) < tuple_(timestamp, last_id)
+        if due_date is None:
+            # Undated todos sort last, so only the remaining undated rows follow
+            return and_(_DUE_KEY == _NO_DUE_DATE, later_in_group)
+        # The leading bound lets the index seek to the cursor's due date; only
+        # rows sharing that due date are left to the row comparison
+        return and_(_DUE_KEY >= due_date, or_(_DUE_KEY > due_date, later_in_group))
+
+    @staticmethod
+    async def find_one(db: AsyncSession, todo_id: UUID, user_id: UUID) -> Todo:
+        """Get a single todo"""
+        todo = await TodoService._fetch(db, todo_id)
         if not todo:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Todo not found",
             )
-        TeamService._ensure_membership(db, todo.team_id, user_id)
+        await TeamService._ensure_membership(db, todo.team_id, user_id)
         return todo
 
     @staticmethod
-    def update(
-        db: Session,
+    async def update(
+        db: AsyncSession,
         todo_id: UUID,
         user_id: UUID,
         dto: TodoUpdate,
-        realtime_gateway: RealtimeGateway,
         notification_service: NotificationService,
-    ) -> Todo:
-        """Update a todo"""
-        todo = TodoService.find_one(db, todo_id, user_id)
-        previous_assignee_id = todo.assignee_id
+    ) -> dict:
+        """Update a todo and return it serialized"""
+        current = (
+            await db.execute(
+                select(
+                    Todo.team_id,
+                    Todo.version,
+                    Todo.title,
+                    Todo.description,
+                    Todo.status,
+                    Todo.due_date,
+                    Todo.assignee_id,
+                ).where(Todo.id == todo_id)
+            )
+        ).first()
+        if not current:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Todo not found",
+            )
+        await TeamService._ensure_membership(db, current.team_id, user_id)
+        previous_assignee_id = current.assignee_id
 
+        requested = {}
         if dto.assignee_id is not None:
-            TeamService._ensure_membership(db, todo.team_id, dto.assignee_id)
-            todo.assignee_id = dto.assignee_id
-
+            await TeamService._ensure_membership(db, current.team_id, dto.assignee_id)
+            requested["assignee_id"] = dto.assignee_id
         if dto.title is not None:
-            todo.title = dto.title
+            requested["title"] = dto.title
         if dto.description is not None:
-            todo.description = dto.description
+            requested["description"] = dto.description
         if dto.status is not None:
-            todo.status = dto.status
+            requested["status"] = dto.status
         if dto.due_date is not None:
-            todo.due_date = dto.due_date
-
-        db.commit()
-        db.refresh(todo, ["team", "assignee"])
-        
-        # Load team owner if not already loaded
-        if todo.team and todo.team.owner_id:
-            from sqlalchemy.orm import joinedload
-            team_with_owner = (
-                db.query(Team)
-                .options(joinedload(Team.owner))
-                .filter(Team.id == todo.team.id)
-                .first()
+            requested["due_date"] = _naive_utc(dto.due_date)
+        # Only columns whose value differs are written, so a no-op PATCH leaves the version alone
+        changed = {name: value for name, value in requested.items() if getattr(current, name) != value}
+
+        if changed:
+            updated_id = await db.scalar(
+                update(Todo)
+                .where(Todo.id == todo_id)
+                .values(**changed, version=Todo.version + 1)
+                .returning(Todo.id)
+                .execution_options(synchronize_session=False)
             )
-            if team_with_owner:
-                todo.team = team_with_owner
-
-        # Convert to response schema for websocket payload
-        todo_response = TodoResponse.model_validate(todo)
-        todo_dict = todo_response.model_dump(mode="json")
-        
-        # Convert UUIDs and dates to strings for JSON serialization
-        todo_dict["id"] = str(todo_dict["id"])
-        todo_dict["team_id"] = str(todo_dict["team_id"])
-        if todo_dict.get("assignee_id"):
-            todo_dict["assignee_id"] = str(todo_dict["assignee_id"])
-        if todo_dict.get("assignee"):
-            todo_dict["assignee"]["id"] = str(todo_dict["assignee"]["id"])
-        if todo_dict.get("team"):
-            todo_dict["team"]["id"] = str(todo_dict["team"]["id"])
-            if todo_dict["team"].get("owner_id"):
-                todo_dict["team"]["owner_id"] = str(todo_dict["team"]["owner_id"])
-            # Add owner object if available
-            if todo.team and todo.team.owner:
-                todo_dict["team"]["owner"] = {
-                    "id": str(todo.team.owner.id),
-                    "email": todo.team.owner.email,
-                    "name": todo.team.owner.name,
-                }
-
-        # Broadcast realtime event (fire and forget)
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                task = asyncio.create_task(
-                    realtime_gateway.broadcast_todo_change(todo.team_id, "todo.updated", todo_dict)
+            if updated_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Todo not found",
                 )
-                print(f"Created async task to broadcast todo.updated for team {todo.team_id}")
-            else:
-                asyncio.run(
-                    realtime_gateway.broadcast_todo_change(todo.team_id, "todo.updated", todo_dict)
-                )
-        except Exception as e:
-            print(f"Error creating broadcast task for todo.updated: {e}")
-            import traceback
-            traceback.print_exc()
+            await TeamService.bump_version(db, current.team_id, Team.todos_version)
+        todo = await TodoService._fetch(db, todo_id)
 
-        current_assignee_id = todo.assignee_id
+        # Serialize once: the dict is both the REST body and the realtime payload
+        todo_dict = todo_to_dict(todo)
 
-        # Notify current assignee if different from actor
-        if current_assignee_id and current_assignee_id != user_id:
-            notification_service.create_for_users(
-                db,
-                user_ids=[current_assignee_id],
-                team=todo.team,
-                notification_type=NotificationType.TODO_UPDATED,
-                message=f'Task "{todo.title}" was updated',
-                realtime_gateway=realtime_gateway,
+        # Queue the realtime event in the same transaction as the change; in
+        # delta mode only the changed fields are sent, and nothing when none changed
+        if not settings.REALTIME_TODO_DELTAS:
+            await OutboxService.add_team_event(
+                db, todo.team_id, "todo.updated", todo_event_payload(todo, todo_dict)
             )
+        elif changed:
+            await OutboxService.add_team_event(
+                db, todo.team_id, "todo.delta", todo_delta_payload(todo_dict, changed, current.version)
+            )
+
+        current_assignee_id = todo.assignee_id
 
-        # Notify new assignee if changed
-        if (
-            current_assignee_id
-            and previous_assignee_id != current_assignee_id
-            and current_assignee_id != user_id
-        ):
-            notification_service.create_for_users(
+        # Notify current assignee if different from actor; a new assignee gets
+        # the assignment message instead of a second notification. Written in
+        # the same transaction as the change, as bulk does
+        if current_assignee_id and current_assignee_id != user_id:
+            if previous_assignee_id != current_assignee_id:
+                message = f'You were assigned task "{todo.title}"'
+            else:
+                message = f'Task "{todo.title}" was updated'
+            await notification_service.create_for_users(
                 db,
                 user_ids=[current_assignee_id],
                 team=todo.team,
                 notification_type=NotificationType.TODO_UPDATED,
-                message=f'You were assigned task "{todo.title}"',
-                realtime_gateway=realtime_gateway,
+                message=message,
+                todo_id=todo.id,
             )
+        await db.commit()
 
-        return todo
+        return todo_dict
 
     @staticmethod
-    def remove(
-        db: Session,
+    async def remove(
+        db: AsyncSession,
         todo_id: UUID,
         user_id: UUID,
-        realtime_gateway: RealtimeGateway,
         notification_service: NotificationService,
     ) -> dict:
         """Delete a todo"""
-        todo = TodoService.find_one(db, todo_id, user_id)
+        todo = await TodoService.find_one(db, todo_id, user_id)
         assignee_id = todo.assignee_id
         team_id = todo.team_id
 
-        db.delete(todo)
-        db.commit()
-
-        # Broadcast realtime event (fire and forget)
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                task = asyncio.create_task(
-                    realtime_gateway.broadcast_todo_change(
-                        team_id, "todo.deleted", {"id": str(todo_id), "team_id": str(team_id)}
-                    )
-                )
-                print(f"Created async task to broadcast todo.deleted for team {team_id}")
-            else:
-                asyncio.run(
-                    realtime_gateway.broadcast_todo_change(
-                        team_id, "todo.deleted", {"id": str(todo_id), "team_id": str(team_id)}
-                    )
-                )
-        except Exception as e:
-            print(f"Error creating broadcast task for todo.deleted: {e}")
-            import traceback
-            traceback.print_exc()
+        await db.delete(todo)
+        db.add(TodoTombstone(id=todo_id, team_id=team_id))
+        await TeamService.bump_version(db, team_id, Team.todos_version)
+        # Queue the realtime event in the same transaction as the change
+        await OutboxService.add_team_event(
+            db, team_id, "todo.deleted", {"id": str(todo_id), "team_id": str(team_id)}
+        )
 
-        # Notify assignee if different from actor
+        # Notify assignee if different from actor, in the same transaction
         if assignee_id and assignee_id != user_id:
-            notification_service.create_for_users(
+            await notification_service.create_for_users(
                 db,
                 user_ids=[assignee_id],
                 team=todo.team,
                 notification_type=NotificationType.TODO_DELETED,
                 message=f'Task "{todo.title}" was deleted',
-                realtime_gateway=realtime_gateway,
+                todo_id=todo_id,
             )
+        await db.commit()
 
         return {"deleted": True}
 
@@ -1,24 +1,25 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from uuid import UUID
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 
 
 class UserService:
     @staticmethod
-    def create_user(db: Session, dto: UserCreate) -> User:
+    async def create_user(db: AsyncSession, dto: UserCreate) -> User:
         """Create a new user"""
-        existing = db.query(User).filter(User.email == dto.email.lower()).first()
+        existing = await db.scalar(select(User).where(User.email == dto.email.lower()))
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already in use",
             )
-        
-        password_hash = get_password_hash(dto.password)
+
+        password_hash = await get_password_hash_async(dto.password)
         user = User(
             email=dto.email.lower(),
             name=dto.name,
@@ -26,39 +27,38 @@ class UserService:
         )
         db.add(user)
         try:
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             return user
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already in use",
             )
 
     @staticmethod
-    def validate_user(db: Session, email: str, password: str) -> User | None:
+    async def validate_user(db: AsyncSession, email: str, password: str) -> User | None:
         """Validate user credentials"""
-        user = db.query(User).filter(User.email == email.lower()).first()
+        user = await db.scalar(select(User).where(User.email == email.lower()))
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
         return user
 
     @staticmethod
-    def find_by_email(db: Session, email: str) -> User | None:
+    async def find_by_email(db: AsyncSession, email: str) -> User | None:
         """Find user by email"""
-        return db.query(User).filter(User.email == email.lower()).first()
+        return await db.scalar(select(User).where(User.email == email.lower()))
 
     @staticmethod
-    def find_by_id(db: Session, user_id: UUID) -> User:
+    async def find_by_id(db: AsyncSession, user_id: UUID) -> User:
         """Find user by ID"""
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found",
             )
         return user
-
@@ -1,9 +1,31 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from socketio import ASGIApp
 from app.core.config import settings
+from app.core.database import async_engine
 from app.api.v1.api import api_router
-from app.realtime.gateway import sio
+from app.realtime.gateway import get_realtime_gateway, sio
+from app.realtime.postgres_manager import AsyncPostgresManager
+from app.realtime.outbox import get_outbox_dispatcher
+from app.services.notification_retention import PartitionMaintainer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the realtime outbox dispatcher, notification partition maintenance and tombstone pruning alongside the API"""
+    dispatcher = get_outbox_dispatcher()
+    dispatcher.start()
+    partitions = PartitionMaintainer()
+    partitions.start()
+    yield
+    await partitions.stop()
+    await dispatcher.stop()
+    await get_realtime_gateway().flush_batches()
+    if isinstance(sio.manager, AsyncPostgresManager):
+        await sio.manager.close()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="Team Tasks API",
@@ -12,6 +34,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 def get_cors_origins():
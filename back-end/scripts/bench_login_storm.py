@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Login-storm benchmark: measures latency of an unrelated endpoint (GET /api/auth/me)
+while a burst of concurrent logins runs bcrypt verification.
+
+Runs the app in-process against the configured database, so PostgreSQL must be
+reachable and migrated. A throwaway user is created and removed again.
+
+Usage:
+    python scripts/bench_login_storm.py
+    LOGINS=200 PROBES=400 python scripts/bench_login_storm.py
+"""
+import sys
+import os
+import asyncio
+import time
+from uuid import uuid4
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+# Keep SQL echo out of the measurements
+os.environ.setdefault("DEBUG", "false")
+
+import httpx
+from main import app
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+
+PASSWORD = "Passw0rd!"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of the samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, count: int) -> list[float]:
+    """Call the unrelated endpoint sequentially and record each latency in ms"""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/api/auth/me", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return latencies
+
+
+async def login(client: httpx.AsyncClient, email: str) -> None:
+    """Perform one login"""
+    response = await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+
+
+def report(label: str, latencies: list[float]) -> None:
+    """Print latency percentiles"""
+    print(
+        f"{label:<14} p50 {percentile(latencies, 50):7.2f} ms  "
+        f"p99 {percentile(latencies, 99):7.2f} ms  max {max(latencies):7.2f} ms"
+    )
+
+
+async def run(logins: int, probes: int) -> None:
+    """Measure the probe endpoint idle and during a login storm"""
+    email = f"bench-login+{uuid4().hex}@example.com"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/auth/register",
+            json={"name": "Bench User", "email": email, "password": PASSWORD},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        report("idle", await probe(client, headers, probes))
+
+        start = time.perf_counter()
+        storm = asyncio.gather(*(login(client, email) for _ in range(logins)))
+        latencies = await probe(client, headers, probes)
+        await storm
+        elapsed = time.perf_counter() - start
+        report("during storm", latencies)
+        print(f"{logins} logins finished in {elapsed:.2f} s")
+
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.email == email).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    """Run the login-storm benchmark"""
+    logins = int(os.getenv("LOGINS", "50"))
+    probes = int(os.getenv("PROBES", "200"))
+    print(
+        f"bcrypt rounds={settings.BCRYPT_ROUNDS} "
+        f"hash concurrency={settings.PASSWORD_HASH_CONCURRENCY} "
+        f"logins={logins} probes={probes}"
+    )
+    asyncio.run(run(logins, probes))
+
+
+if __name__ == "__main__":
+    main()
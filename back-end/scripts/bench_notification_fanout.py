@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark for notification fan-out: the previous per-row path (add_all, commit,
+then one refresh and one emit per recipient) versus
+NotificationService.create_for_users and the team-wide create_for_team.
+
+Runs against the configured database, so PostgreSQL must be reachable and
+migrated. Everything happens inside one transaction that is rolled back at the
+end, including the generated users and team. Socket emission is replaced by a
+no-op gateway, so the numbers cover the database and payload work only; the
+new paths queue their events in the realtime outbox, and draining it through
+the dispatcher is timed separately.
+
+Usage:
+    python scripts/bench_notification_fanout.py
+    RECIPIENTS=10,1000,10000,50000 python scripts/bench_notification_fanout.py
+"""
+import sys
+import os
+import asyncio
+import time
+from uuid import UUID, uuid4
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+# Keep SQL echo out of the measurements
+os.environ.setdefault("DEBUG", "false")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import async_engine
+from app.models.notification import Notification, NotificationType
+from app.models.team import Team
+from app.realtime.outbox import OutboxDispatcher
+from app.services.notification_service import NotificationService
+
+
+class NullGateway:
+    """Realtime gateway that drops every event"""
+
+    async def notify_user(self, user_id, event, payload):
+        pass
+
+    async def notify_users(self, event, payloads):
+        pass
+
+
+async def create_team(db: AsyncSession, members: int) -> tuple[Team, list[UUID]]:
+    """Create a team with the given number of freshly generated members"""
+    prefix = uuid4().hex
+    user_ids = (
+        await db.scalars(
+            text(
+                "INSERT INTO users (email, name, password_hash)"
+                " SELECT :prefix || '-' || n || '@bench.example.com', 'Bench ' || n, 'x'"
+                " FROM generate_series(1, :members) AS n RETURNING id"
+            ),
+            {"prefix": prefix, "members": members},
+        )
+    ).all()
+    team = Team(name=f"Bench {prefix}", owner_id=user_ids[0])
+    db.add(team)
+    await db.flush()
+    await db.execute(
+        text(
+            "INSERT INTO team_memberships (team_id, user_id, role)"
+            " SELECT :team_id, id, 'MEMBER' FROM unnest(CAST(:user_ids AS uuid[])) AS id"
+        ),
+        {"team_id": team.id, "user_ids": user_ids},
+    )
+    await db.commit()
+    return team, list(user_ids)
+
+
+async def previous_path(db: AsyncSession, user_ids: list[UUID], team: Team, gateway) -> None:
+    """The per-row implementation create_for_users replaced"""
+    notifications = [
+        Notification(
+            user_id=user_id,
+            team_id=team.id,
+            type=NotificationType.TODO_UPDATED,
+            message="Benchmark notification",
+        )
+        for user_id in user_ids
+    ]
+    db.add_all(notifications)
+    await db.commit()
+    for notification in notifications:
+        await db.refresh(notification)
+        await gateway.notify_user(
+            notification.user_id, "notification.created", NotificationService._event_payload(notification)
+        )
+
+
+async def drain(dispatcher: OutboxDispatcher, db: AsyncSession) -> None:
+    """Emit everything the fan-out queued in the outbox"""
+    while await dispatcher.dispatch_batch(db):
+        pass
+
+
+async def timed(label: str, coro) -> float:
+    """Await the coroutine and print its wall time"""
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<18} {elapsed * 1000:10.1f} ms")
+    return elapsed
+
+
+async def run(sizes: list[int]) -> None:
+    """Benchmark every fan-out path for each recipient count"""
+    gateway = NullGateway()
+    dispatcher = OutboxDispatcher(gateway)
+    async with async_engine.connect() as connection:
+        transaction = await connection.begin()
+        db = AsyncSession(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            for size in sizes:
+                team, user_ids = await create_team(db, size)
+                print(f"recipients={size}")
+                after = await timed(
+                    "create_for_users",
+                    NotificationService.create_for_users(
+                        db, user_ids, team, NotificationType.TODO_UPDATED, "Benchmark notification"
+                    ),
+                )
+                after += await timed("dispatch outbox", drain(dispatcher, db))
+                db.expunge_all()
+                await timed(
+                    "create_for_team",
+                    NotificationService.create_for_team(
+                        db, team.id, NotificationType.TODO_UPDATED, "Benchmark notification"
+                    ),
+                )
+                await timed("dispatch outbox", drain(dispatcher, db))
+                db.expunge_all()
+                before = await timed("previous", previous_path(db, user_ids, team, gateway))
+                db.expunge_all()
+                print(f"  speedup {before / after:.1f}x")
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await async_engine.dispose()
+
+
+def main():
+    """Run the fan-out benchmark"""
+    sizes = [int(size) for size in os.getenv("RECIPIENTS", "10,1000,10000").split(",")]
+    asyncio.run(run(sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Socket.IO packet encoding: JSON text (the default serializer)
+versus MessagePack for a typical todo.updated event and a todo.batch frame.
+
+MessagePack is measured twice: with the payloads as the outbox delivers them
+(ids and timestamps already strings) and with UUIDs and datetimes passed as
+native values, which the MessagePack encoder packs as 16 raw bytes and the
+timestamp extension.
+
+Works on in-memory payloads, so no database is needed.
+
+Usage:
+    python scripts/bench_realtime_serialization.py
+    ITERATIONS=50000 BATCH=100 python scripts/bench_realtime_serialization.py
+"""
+import sys
+import os
+import time
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+from socketio import packet
+from app.core.serialization import OrjsonSocketIOJson
+from app.realtime.batching import BATCH_EVENT
+from app.realtime.packets import NegotiatedPacket
+
+NegotiatedPacket.json = OrjsonSocketIOJson
+
+NATIVE_KEYS = {"id", "team_id", "assignee_id", "owner_id"}
+TIMESTAMP_KEYS = {"created_at", "updated_at", "due_date"}
+
+
+def build_todo(index: int, team_id: str, owner: dict) -> dict:
+    """A todo.updated payload shaped like todo_event_payload output"""
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid4()), "title": f"Todo {index}", "description": "Benchmark todo description",
+        "due_date": now, "status": "in_progress", "team_id": team_id, "assignee_id": owner["id"],
+        "version": 3, "created_at": now, "updated_at": now,
+        "team": {
+            "id": team_id, "name": "Bench Team", "description": "Benchmark", "owner_id": owner["id"],
+            "created_at": now, "updated_at": now, "owner": owner,
+        },
+        "assignee": {**owner, "created_at": now, "updated_at": now},
+    }
+
+
+def to_native(value):
+    """Turn id and timestamp strings back into UUID and datetime values"""
+    if isinstance(value, dict):
+        converted = {}
+        for key, item in value.items():
+            if key in NATIVE_KEYS and isinstance(item, str):
+                item = UUID(item)
+            elif key in TIMESTAMP_KEYS and isinstance(item, str):
+                item = datetime.fromisoformat(item)
+            else:
+                item = to_native(item)
+            converted[key] = item
+        return converted
+    if isinstance(value, list):
+        return [to_native(item) for item in value]
+    return value
+
+
+def bench(label: str, fn, iterations: int, rounds: int = 3) -> float:
+    """Best-of-N microseconds per encode, printed with the frame size"""
+    best = float("inf")
+    size = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            size = len(fn())
+        best = min(best, time.perf_counter() - start)
+    per_encode = best / iterations * 1e6
+    print(f"  {label:<18} {per_encode:8.2f} us  {size:7d} B")
+    return per_encode
+
+
+def compare(name: str, event: str, payload: dict, iterations: int):
+    """Encode one event packet with each serializer"""
+    data = [event, payload, {"room": "team-bench", "seq": 42, "epoch": uuid4().hex}]
+    native = [event, to_native(payload), data[2]]
+    print(name)
+    bench("json", lambda: NegotiatedPacket(packet.EVENT, data=data, namespace="/collab").encode(), iterations)
+    bench("msgpack", lambda: NegotiatedPacket(packet.EVENT, data=data, namespace="/collab").encode_msgpack(), iterations)
+    bench("msgpack (native)", lambda: NegotiatedPacket(packet.EVENT, data=native, namespace="/collab").encode_msgpack(), iterations)
+
+
+def main():
+    """Compare encode cost and frame size for a single update and a batch"""
+    iterations = int(os.getenv("ITERATIONS", "20000"))
+    batch = int(os.getenv("BATCH", "20"))
+    team_id = str(uuid4())
+    owner = {"id": str(uuid4()), "email": "owner@example.com", "name": "Owner"}
+    print(f"iterations={iterations} batch={batch}")
+    compare("todo.updated", "todo.updated", build_todo(0, team_id, owner), iterations)
+    events = [{"event": "todo.updated", "payload": build_todo(index, team_id, owner)} for index in range(batch)]
+    compare(BATCH_EVENT, BATCH_EVENT, {"events": events}, max(1, iterations // batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark for serializing a large todo list: the previous path (model_validate +
+model_dump per todo, then stdlib json) versus the cached TypeAdapter path used
+by the API (app.core.serialization).
+
+Works on in-memory model instances, so no database is needed.
+
+Usage:
+    python scripts/bench_todo_serialization.py
+    TODOS=50000 python scripts/bench_todo_serialization.py
+"""
+import sys
+import os
+import json
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+from app.core.serialization import todos_to_json
+from app.models.team import Team
+from app.models.todo import Todo, TodoStatus
+from app.models.user import User
+from app.schemas.todo import TodoResponse
+
+
+def build_todos(count: int) -> list[Todo]:
+    """Build transient todos with team and assignee attached"""
+    now = datetime.now(timezone.utc)
+    owner = User(id=uuid4(), email="owner@example.com", name="Owner", created_at=now, updated_at=now)
+    team = Team(
+        id=uuid4(), name="Bench Team", description="Benchmark", owner_id=owner.id,
+        created_at=now, updated_at=now,
+    )
+    team.owner = owner
+    todos = []
+    for index in range(count):
+        todo = Todo(
+            id=uuid4(), title=f"Todo {index}", description="Benchmark todo description",
+            due_date=None, status=TodoStatus.IN_PROGRESS, team_id=team.id,
+            assignee_id=owner.id, created_at=now, updated_at=now,
+        )
+        todo.team = team
+        todo.assignee = owner
+        todos.append(todo)
+    return todos
+
+
+def previous_path(todos: list[Todo]) -> bytes:
+    """Per-object model_validate/model_dump followed by stdlib json"""
+    data = [TodoResponse.model_validate(todo).model_dump(mode="json") for todo in todos]
+    return json.dumps(data).encode("utf-8")
+
+
+def bench(label: str, fn, todos: list[Todo], rounds: int = 3) -> float:
+    """Best-of-N wall time in ms"""
+    best = float("inf")
+    size = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        size = len(fn(todos))
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<10} {best * 1000:9.2f} ms  {size / 1024:9.1f} KiB")
+    return best
+
+
+def main():
+    """Compare both serialization paths"""
+    count = int(os.getenv("TODOS", "10000"))
+    todos = build_todos(count)
+    print(f"todos={count}")
+    before = bench("previous", previous_path, todos)
+    after = bench("current", todos_to_json, todos)
+    print(f"speedup {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
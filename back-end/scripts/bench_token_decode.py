@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for decode_access_token: cold (full JWT verification) versus
+warm (served from the verified-token cache).
+
+Usage:
+    python scripts/bench_token_decode.py
+    ITERATIONS=50000 python scripts/bench_token_decode.py
+"""
+import sys
+import os
+import time
+from uuid import uuid4
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+from app.core.security import create_access_token, decode_access_token, token_cache
+
+
+def bench(label: str, iterations: int, fn) -> float:
+    """Run fn iterations times and print the mean cost per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / iterations * 1_000_000
+    print(f"{label:<6} {iterations:>8} calls  {per_call_us:8.2f} µs/call")
+    return per_call_us
+
+
+def main():
+    """Compare cold and warm token decoding"""
+    iterations = int(os.getenv("ITERATIONS", "20000"))
+    token = create_access_token(
+        {"sub": str(uuid4()), "email": "bench@example.com", "name": "Bench User"}
+    )
+
+    def cold():
+        token_cache.clear()
+        decode_access_token(token)
+
+    def warm():
+        decode_access_token(token)
+
+    cold_us = bench("cold", iterations, cold)
+    token_cache.clear()
+    decode_access_token(token)
+    warm_us = bench("warm", iterations, warm)
+    print(f"speedup {cold_us / warm_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
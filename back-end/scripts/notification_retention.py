@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Maintain the monthly partitions of the notifications table: create the
+upcoming months and drop the months past NOTIFICATION_RETENTION_MONTHS.
+
+Runs on every back-end container start after migrations. The API also runs the
+same maintenance every NOTIFICATION_PARTITION_MAINTENANCE_HOURS, so a long-running
+deployment keeps getting partitions ahead of time without a scheduler.
+
+Usage:
+    # In Docker:
+    docker-compose --profile tools run --rm notification-retention
+
+    # Locally (after setting up environment):
+    python scripts/notification_retention.py
+    NOTIFICATION_RETENTION_MONTHS=3 python scripts/notification_retention.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+sys.path.insert(0, parent_dir)
+
+from app.core.database import engine
+from app.services.notification_retention import NotificationRetentionService
+
+
+def main():
+    """Create upcoming notification partitions and drop expired ones"""
+    with engine.begin() as connection:
+        created, dropped = NotificationRetentionService.maintain_partitions(connection)
+    print(f"✓ Created partitions: {', '.join(created) or 'none'}")
+    print(f"✓ Dropped partitions: {', '.join(dropped) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
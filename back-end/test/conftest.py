@@ -1,9 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.pool import NullPool
-from app.core.database import Base, get_db
+from app.core.database import get_db
 from app.core.config import settings
 from main import app
 import alembic.config
@@ -11,17 +11,29 @@ import alembic.command
 
 # Create test database connection using PostgreSQL
 TEST_DATABASE_URL = (
-    f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+    f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
     f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
 )
 
-engine = create_engine(
+engine = create_async_engine(
     TEST_DATABASE_URL,
     poolclass=NullPool,
     echo=False,
 )
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async def _begin_transaction():
+    """Open a connection with an outer transaction that each test rolls back"""
+    connection = await engine.connect()
+    transaction = await connection.begin()
+    return connection, transaction
+
+
+async def _rollback_transaction(session, connection, transaction):
+    """Discard everything a test wrote"""
+    await session.close()
+    await transaction.rollback()
+    await connection.close()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -35,35 +47,78 @@ def setup_database():
 
 
 @pytest.fixture(scope="function")
-def db_session():
-    """Create a database session with transaction rollback for test isolation"""
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
-    
+def app_client():
+    """Start the app; its portal runs the event loop shared by the app and db_session"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="function")
+def db_session(app_client):
+    """Create an async database session with transaction rollback for test isolation"""
+    connection, transaction = app_client.portal.call(_begin_transaction)
+    session = AsyncSession(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
     try:
         yield session
     finally:
-        session.close()
-        transaction.rollback()
-        connection.close()
+        app_client.portal.call(_rollback_transaction, session, connection, transaction)
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(app_client, db_session):
     """Create a test client with database override"""
-    def override_get_db():
+    async def override_get_db():
+        # Like closing a request session in production, a failed request discards its writes
         try:
             yield db_session
-        finally:
-            pass
+        except Exception:
+            await db_session.rollback()
+            raise
 
     app.dependency_overrides[get_db] = override_get_db
-    
-    with TestClient(app) as test_client:
-        yield test_client
-    
-    app.dependency_overrides.clear()
+
+    try:
+        yield app_client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def drain_outbox(app_client, db_session):
+    """Dispatch the realtime events queued in the test transaction, which the app's dispatcher cannot see"""
+    from app.realtime.gateway import get_realtime_gateway
+    from app.realtime.outbox import OutboxDispatcher
+
+    async def drain(dispatcher):
+        while await dispatcher.dispatch_batch(db_session):
+            pass
+
+    def run(gateway=None):
+        app_client.portal.call(drain, OutboxDispatcher(gateway or get_realtime_gateway()))
+
+    return run
+
+
+@pytest.fixture(scope="function")
+def query_counter():
+    """Record the SQL statements the app sends, ignoring test savepoint bookkeeping"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
 
 
 @pytest.fixture
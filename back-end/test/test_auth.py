@@ -61,3 +61,48 @@ def test_me_should_return_current_user_with_valid_jwt(client: TestClient, auth_h
     assert "user" in data
     assert "sub" in data["user"]
 
+
+
+def test_me_should_reuse_verified_token(client: TestClient, auth_headers):
+    """Test repeated requests with the same JWT should be served from the token cache"""
+    from app.core.security import token_cache
+
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+    hits_before = token_cache.stats()["hits"]
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+
+    assert token_cache.stats()["hits"] == hits_before + 1
+
+
+def test_me_should_reject_tampered_token(client: TestClient, auth_headers):
+    """Test GET /api/auth/me should reject a token whose signature does not match"""
+    token = auth_headers["Authorization"].split(" ", 1)[1]
+    tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {tampered}"})
+
+    assert response.status_code == 401
+
+
+def test_login_should_reject_wrong_password(client: TestClient):
+    """Test POST /api/auth/login should return 401 for a wrong password"""
+    email = f"auth-wrong+{pytest.current_time}@example.com"
+    register_response = client.post(
+        "/api/auth/register",
+        json={
+            "name": "Auth Wrong Password User",
+            "email": email,
+            "password": "Passw0rd!",
+        },
+    )
+    assert register_response.status_code == 201
+
+    response = client.post(
+        "/api/auth/login",
+        json={
+            "email": email,
+            "password": "WrongPassw0rd!",
+        },
+    )
+
+    assert response.status_code == 401
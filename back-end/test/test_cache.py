@@ -0,0 +1,28 @@
+import time
+from app.core.cache import TTLCache
+
+
+def test_ttl_cache_should_evict_least_recently_used_entry():
+    """Test TTLCache should keep at most maxsize entries, dropping the LRU one"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1}
+
+
+def test_ttl_cache_should_expire_entries():
+    """Test TTLCache entries should expire after their TTL"""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("short", "value", ttl=0.01)
+    cache.set("long", "value")
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == "value"
+    assert cache.stats()["size"] == 1
@@ -10,3 +10,385 @@ def test_get_notifications_should_list_notifications_for_user(client: TestClient
     data = response.json()
     assert isinstance(data, list)
 
+
+
+class RecordingGateway:
+    """Stands in for the realtime gateway and records each dispatch step"""
+
+    def __init__(self):
+        self.dispatches = []
+
+    async def notify_users(self, event, payloads):
+        self.dispatches.append((event, payloads))
+
+
+@pytest.fixture
+def team_with_members(client: TestClient, auth_headers, drain_outbox):
+    """Create a team with the current user as owner and three more members"""
+    team = client.post("/api/teams", headers=auth_headers, json={"name": "Fan-out Team"})
+    assert team.status_code == 201
+    team_id = team.json()["id"]
+    member_ids = []
+    for i in range(3):
+        member = client.post(
+            f"/api/teams/{team_id}/members",
+            headers=auth_headers,
+            json={"email": f"fanout-{i}+{pytest.current_time}@example.com", "name": f"Fan-out {i}"},
+        )
+        assert member.status_code == 200
+        member_ids.append(member.json()["user_id"])
+    owner_id = client.get("/api/auth/me", headers=auth_headers).json()["user"]["sub"]
+    # Send the team.added events now, so tests only see the events they cause
+    drain_outbox()
+    return team_id, owner_id, member_ids
+
+
+def test_create_for_users_should_insert_all_rows_in_one_statement(
+    app_client, db_session, team_with_members, query_counter, drain_outbox
+):
+    """Test create_for_users should cost one INSERT ... RETURNING, one outbox INSERT and one dispatch step"""
+    from uuid import UUID
+    from app.models.notification import NotificationType
+    from app.models.team import Team
+    from app.services.notification_service import NotificationService
+
+    team_id, _, member_ids = team_with_members
+    gateway = RecordingGateway()
+
+    async def fan_out():
+        team = await db_session.get(Team, UUID(team_id))
+        query_counter.clear()
+        return await NotificationService.create_for_users(
+            db_session, [UUID(member_id) for member_id in member_ids], team,
+            NotificationType.TODO_UPDATED, "Board was reorganised",
+        )
+
+    notifications = app_client.portal.call(fan_out)
+
+    assert len(query_counter) == 2, query_counter
+    assert gateway.dispatches == []
+    drain_outbox(gateway)
+    assert sorted(str(notification.user_id) for notification in notifications) == sorted(member_ids)
+    assert all(notification.id and notification.created_at for notification in notifications)
+    assert len(gateway.dispatches) == 1
+    event, payloads = gateway.dispatches[0]
+    assert event == "notification.created"
+    assert sorted(str(user_id) for user_id, _ in payloads) == sorted(member_ids)
+    assert {payload["message"] for _, payload in payloads} == {"Board was reorganised"}
+
+
+def test_create_for_team_should_notify_every_member_but_the_excluded(
+    app_client, db_session, team_with_members, query_counter, drain_outbox
+):
+    """Test create_for_team should select the recipients inside the INSERT"""
+    from uuid import UUID
+    from app.models.notification import NotificationType
+    from app.services.notification_service import NotificationService
+
+    team_id, owner_id, member_ids = team_with_members
+    gateway = RecordingGateway()
+
+    async def fan_out():
+        query_counter.clear()
+        return await NotificationService.create_for_team(
+            db_session, UUID(team_id), NotificationType.TODO_CREATED, "Sprint started",
+            exclude_user_ids=[UUID(owner_id)],
+        )
+
+    notifications = app_client.portal.call(fan_out)
+
+    assert len(query_counter) == 2, query_counter
+    assert gateway.dispatches == []
+    drain_outbox(gateway)
+    assert sorted(str(notification.user_id) for notification in notifications) == sorted(member_ids)
+    assert all(str(notification.team_id) == team_id for notification in notifications)
+    assert len(gateway.dispatches) == 1
+
+
+@pytest.fixture
+def unread_notifications(client: TestClient, auth_headers, app_client, db_session):
+    """Create five unread notifications for the current user"""
+    from uuid import UUID
+    from app.models.notification import NotificationType
+    from app.services.notification_service import NotificationService
+
+    user_id = UUID(client.get("/api/auth/me", headers=auth_headers).json()["user"]["sub"])
+    notifications = app_client.portal.call(
+        NotificationService.create_for_users,
+        db_session, [user_id] * 5, None, NotificationType.TODO_UPDATED, "Unread",
+    )
+    return [str(notification.id) for notification in notifications]
+
+
+def test_get_notifications_should_page_with_a_cursor(client: TestClient, auth_headers, unread_notifications):
+    """Test GET /api/notifications should walk every notification once, newest first"""
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/notifications", headers=auth_headers, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert sorted(notification["id"] for notification in seen) == sorted(unread_notifications)
+    keys = [(notification["created_at"], notification["id"]) for notification in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_mark_read_should_clear_unread_up_to_cursor_then_by_id(client: TestClient, auth_headers, unread_notifications):
+    """Test POST /api/notifications/read should update by cursor or ids and keep the unread count in step"""
+    assert client.get("/api/notifications/unread-count", headers=auth_headers).json() == {"count": 5}
+
+    first_page = client.get("/api/notifications", headers=auth_headers, params={"limit": 2})
+    newest_id = first_page.json()[0]["id"]
+    response = client.post(
+        "/api/notifications/read", headers=auth_headers, json={"cursor": first_page.headers["X-Next-Cursor"]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 4}
+    assert client.get("/api/notifications/unread-count", headers=auth_headers).json() == {"count": 1}
+
+    response = client.post("/api/notifications/read", headers=auth_headers, json={"ids": [newest_id]})
+    assert response.json() == {"updated": 1}
+    assert client.get("/api/notifications/unread-count", headers=auth_headers).json() == {"count": 0}
+    listed = client.get("/api/notifications", headers=auth_headers).json()
+    assert all(notification["read"] for notification in listed)
+
+
+def test_mark_read_should_reject_ids_with_cursor_and_bad_cursors(client: TestClient, auth_headers, unread_notifications):
+    """Test POST /api/notifications/read should answer 400 to ambiguous or invalid input"""
+    cursor = client.get("/api/notifications", headers=auth_headers, params={"limit": 1}).headers["X-Next-Cursor"]
+    both = client.post(
+        "/api/notifications/read", headers=auth_headers, json={"ids": unread_notifications[:1], "cursor": cursor}
+    )
+    assert both.status_code == 400
+    invalid = client.post("/api/notifications/read", headers=auth_headers, json={"cursor": "not-a-cursor"})
+    assert invalid.status_code == 400
+    assert client.get("/api/notifications/unread-count", headers=auth_headers).json() == {"count": 5}
+
+
+@pytest.fixture
+def assigned_todo(client: TestClient, auth_headers, team_with_members):
+    """Create a todo assigned to another team member"""
+    team_id, _, member_ids = team_with_members
+    todo = client.post(
+        "/api/todos",
+        headers=auth_headers,
+        json={"title": "Busy todo", "team_id": team_id, "assignee_id": member_ids[0]},
+    )
+    assert todo.status_code == 201
+    return todo.json()["id"], member_ids[0]
+
+
+def _notifications_for(app_client, db_session, user_id: str, todo_id: str):
+    """Load the stored notifications of a user about one todo, oldest first"""
+    from uuid import UUID
+    from sqlalchemy import select
+    from app.models.notification import Notification
+
+    async def load():
+        return (
+            await db_session.scalars(
+                select(Notification)
+                .where(Notification.user_id == UUID(user_id), Notification.todo_id == UUID(todo_id))
+                .order_by(Notification.created_at, Notification.id)
+                .execution_options(populate_existing=True)
+            )
+        ).all()
+
+    return app_client.portal.call(load)
+
+
+def _queued_events(app_client, db_session) -> list[str]:
+    """The events still waiting in the outbox, in id order"""
+    from sqlalchemy import select
+    from app.models.outbox import RealtimeOutbox
+
+    async def load():
+        return (await db_session.scalars(select(RealtimeOutbox.event).order_by(RealtimeOutbox.id))).all()
+
+    return app_client.portal.call(load)
+
+
+def test_repeated_updates_should_coalesce_into_one_notification(
+    client: TestClient, auth_headers, app_client, db_session, assigned_todo, drain_outbox, monkeypatch
+):
+    """Test five edits within the window should leave one TODO_UPDATED row with count 5 and one debounced emit"""
+    from app.core.config import settings
+    from app.models.notification import NotificationType
+    from app.realtime.gateway import get_realtime_gateway
+
+    todo_id, assignee_id = assigned_todo
+    gateway = get_realtime_gateway()
+    sent = []
+
+    async def capture_users(event, payloads):
+        sent.extend((event, payload) for _, payload in payloads)
+
+    drain_outbox()
+    monkeypatch.setattr(gateway, "notify_users", capture_users)
+    monkeypatch.setattr(settings, "NOTIFICATION_EMIT_DEBOUNCE_MS", 60000)
+    for i in range(5):
+        response = client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"description": f"Edit {i}"})
+        assert response.status_code == 200
+    drain_outbox()
+    # The merged updates wait in the outbox until the burst is due, so a crash meanwhile loses nothing
+    assert [event for event, _ in sent] == ["notification.created"]
+    assert _queued_events(app_client, db_session) == ["notification.updated"] * 4
+
+    monkeypatch.setattr(settings, "NOTIFICATION_EMIT_DEBOUNCE_MS", 0)
+    drain_outbox()
+
+    updates = [
+        notification
+        for notification in _notifications_for(app_client, db_session, assignee_id, todo_id)
+        if notification.type is NotificationType.TODO_UPDATED
+    ]
+    assert [notification.count for notification in updates] == [5]
+    assert [event for event, _ in sent] == ["notification.created", "notification.updated"]
+    assert sent[1][1]["id"] == str(updates[0].id)
+    assert sent[1][1]["count"] == 5
+    assert _queued_events(app_client, db_session) == []
+
+
+def test_coalescing_should_start_a_new_row_once_read_or_outside_the_window(
+    client: TestClient, auth_headers, app_client, db_session, assigned_todo
+):
+    """Test a read notification or one older than the window should not absorb new repeats"""
+    from sqlalchemy import text
+
+    todo_id, assignee_id = assigned_todo
+
+    def edit():
+        response = client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"status": "in_progress"})
+        assert response.status_code == 200
+
+    def age_and_mark(statement: str):
+        async def run():
+            await db_session.execute(text(statement), {"todo_id": todo_id})
+            await db_session.commit()
+
+        app_client.portal.call(run)
+
+    edit()
+    age_and_mark("UPDATE notifications SET read = true WHERE todo_id = CAST(:todo_id AS UUID)")
+    edit()
+    age_and_mark(
+        "UPDATE notifications SET created_at = created_at - INTERVAL '1 day' WHERE todo_id = CAST(:todo_id AS UUID)"
+    )
+    edit()
+    edit()
+
+    counts = [notification.count for notification in _notifications_for(app_client, db_session, assignee_id, todo_id)]
+    # The TODO_CREATED row from the assignment, then one row per coalescing run
+    assert sorted(counts) == [1, 1, 1, 2]
+
+
+def test_debounced_bursts_should_send_only_their_latest_row(app_client, db_session, monkeypatch):
+    """Test a due burst should be claimed whole and sent as its latest payload per notification id"""
+    from uuid import uuid4
+    from app.core.config import settings
+    from app.realtime.outbox import OutboxDispatcher
+    from app.services.outbox_service import OutboxService
+
+    gateway = RecordingGateway()
+    user_id = uuid4()
+
+    async def burst():
+        await OutboxService.add_user_events(
+            db_session,
+            "notification.updated",
+            [(user_id, {"id": "n1", "count": count}) for count in (2, 3, 4)] + [(user_id, {"id": "n2", "count": 2})],
+        )
+        return await OutboxDispatcher(gateway).dispatch_batch(db_session)
+
+    monkeypatch.setattr(settings, "NOTIFICATION_EMIT_DEBOUNCE_MS", 0)
+
+    assert app_client.portal.call(burst) == 4
+    assert gateway.dispatches == [
+        ("notification.updated", [(user_id, {"id": "n1", "count": 4}), (user_id, {"id": "n2", "count": 2})])
+    ]
+
+
+def test_retention_should_drop_expired_months_and_create_upcoming_ones(
+    client: TestClient, auth_headers, app_client, db_session, monkeypatch
+):
+    """Test maintain_partitions should drop whole months past retention and keep the next months ready"""
+    from datetime import date
+    from sqlalchemy import text
+    from app.core.config import settings
+    from app.services.notification_retention import NotificationRetentionService
+
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MONTHS", 6)
+    monkeypatch.setattr(settings, "NOTIFICATION_PARTITIONS_AHEAD", 3)
+    user_id = client.get("/api/auth/me", headers=auth_headers).json()["user"]["sub"]
+
+    async def run():
+        connection = await db_session.connection()
+        for name, start, end in (
+            ("notifications_2001_01", "2001-01-01", "2001-02-01"),
+            ("notifications_2039_12", "2039-12-01", "2040-01-01"),
+        ):
+            await connection.execute(
+                text(f"CREATE TABLE {name} PARTITION OF notifications FOR VALUES FROM ('{start} 00:00+00') TO ('{end} 00:00+00')")
+            )
+        await connection.execute(
+            text(
+                "INSERT INTO notifications (user_id, type, message, read, created_at)"
+                " VALUES (CAST(:user_id AS UUID), 'TODO_UPDATED', 'Ancient', false, '2001-01-15 12:00+00'),"
+                " (CAST(:user_id AS UUID), 'TODO_UPDATED', 'Recent', false, '2039-12-15 12:00+00')"
+            ),
+            {"user_id": user_id},
+        )
+        first = await connection.run_sync(NotificationRetentionService.maintain_partitions, date(2040, 5, 17))
+        second = await connection.run_sync(NotificationRetentionService.maintain_partitions, date(2040, 5, 17))
+        messages = (
+            await connection.scalars(
+                text("SELECT message FROM notifications WHERE user_id = CAST(:user_id AS UUID)"), {"user_id": user_id}
+            )
+        ).all()
+        return first, second, messages
+
+    (created, dropped), second, messages = app_client.portal.call(run)
+
+    assert created == ["notifications_2040_05", "notifications_2040_06", "notifications_2040_07", "notifications_2040_08"]
+    assert "notifications_2001_01" in dropped
+    assert "notifications_2039_12" not in dropped
+    assert second == ([], [])
+    assert messages == ["Recent"]
+
+
+def test_partition_maintainer_should_create_the_months_ahead(client: TestClient, auth_headers, app_client, db_session):
+    """Test the API's periodic maintenance should create upcoming partitions before their first insert"""
+    from contextlib import asynccontextmanager
+    from datetime import date
+    from sqlalchemy import text
+    from app.services.notification_retention import PartitionMaintainer
+
+    @asynccontextmanager
+    async def connect():
+        yield await db_session.connection()
+
+    user_id = client.get("/api/auth/me", headers=auth_headers).json()["user"]["sub"]
+
+    async def run():
+        created, _ = await PartitionMaintainer(connect).run_once(date(2050, 1, 10))
+        connection = await db_session.connection()
+        # Lands in a partition created by the run above
+        await connection.execute(
+            text(
+                "INSERT INTO notifications (user_id, type, message, read, created_at)"
+                " VALUES (CAST(:user_id AS UUID), 'TODO_UPDATED', 'Future', false, '2050-02-01 00:00+00')"
+            ),
+            {"user_id": user_id},
+        )
+        return created
+
+    created = app_client.portal.call(run)
+
+    assert created[:2] == ["notifications_2050_01", "notifications_2050_02"]
@@ -0,0 +1,193 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from test.conftest import engine
+
+
+async def _seed(db, team_id: str, user_id: str):
+    """Fill the team with enough todos and notifications for realistic plans"""
+    params = {"team_id": team_id, "user_id": user_id}
+    await db.execute(
+        text(
+            """
+            INSERT INTO todos (title, status, team_id, assignee_id, due_date)
+            SELECT 'Seeded todo ' || n, 'BACKLOG', CAST(:team_id AS UUID),
+                   CASE WHEN n % 2 = 0 THEN CAST(:user_id AS UUID) END,
+                   CASE WHEN n % 3 = 0 THEN NULL ELSE TIMESTAMP '2030-01-01' + n * INTERVAL '1 hour' END
+            FROM generate_series(1, 2000) AS n
+            """
+        ),
+        params,
+    )
+    await db.execute(
+        text(
+            """
+            INSERT INTO notifications (user_id, team_id, type, message, read)
+            SELECT CAST(:user_id AS UUID), CAST(:team_id AS UUID), 'TODO_UPDATED', 'Seeded ' || n, false
+            FROM generate_series(1, 2000) AS n
+            """
+        ),
+        params,
+    )
+    for table in ("todos", "notifications", "team_memberships", "teams", "users"):
+        await db.execute(text(f"ANALYZE {table}"))
+    await db.commit()
+
+
+async def _explain(db, statements: list[tuple[str, tuple]], analyze: bool = False) -> list[tuple[str, dict]]:
+    """EXPLAIN each captured statement with its original parameters, running it too when analyze is set"""
+    # With sequential scans priced out, a Seq Scan in the plan means no usable index
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    connection = await db.connection()
+    options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+    plans = []
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters)
+        plans.append((statement, result.scalar()[0]["Plan"]))
+    return plans
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    """Relations read by a sequential scan anywhere in the plan tree"""
+    found = [plan["Relation Name"]] if plan["Node Type"] == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def _rows_removed_by_filter(plan: dict) -> int:
+    """Rows read and then discarded by a filter anywhere in an analyzed plan tree"""
+    return plan.get("Rows Removed by Filter", 0) + sum(_rows_removed_by_filter(child) for child in plan.get("Plans", []))
+
+
+def _node_types(plan: dict) -> set[str]:
+    """Every node type in the plan tree"""
+    found = {plan["Node Type"]}
+    for child in plan.get("Plans", []):
+        found |= _node_types(child)
+    return found
+
+
+@pytest.fixture
+def captured_queries():
+    """Record the statements and parameters the app sends"""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def seeded_team(client: TestClient, auth_headers, app_client, db_session):
+    """Create a team and seed it with todos and notifications"""
+    response = client.post("/api/teams", headers=auth_headers, json={"name": "Plans Team"})
+    assert response.status_code == 201
+    team_id = response.json()["id"]
+    user_id = client.get("/api/auth/me", headers=auth_headers).json()["user"]["sub"]
+    app_client.portal.call(_seed, db_session, team_id, user_id)
+    return team_id, user_id
+
+
+def test_service_queries_should_not_fall_back_to_sequential_scans(
+    client: TestClient, auth_headers, app_client, db_session, seeded_team, captured_queries
+):
+    """Test every query behind the hot endpoints should be served by an index"""
+    from app.services.team_service import membership_cache
+
+    seeded_team, user_id = seeded_team
+
+    membership_cache.clear()
+    first_page = client.get("/api/todos", headers=auth_headers, params={"teamId": seeded_team, "limit": 50})
+    assert first_page.status_code == 200
+    todo_id = first_page.json()[0]["id"]
+    notifications_cursor = client.get(
+        "/api/notifications", headers=auth_headers, params={"limit": 20}
+    ).headers["X-Next-Cursor"]
+    sync_cursor = client.get(
+        "/api/todos/changes", headers=auth_headers, params={"teamId": seeded_team}
+    ).json()["cursor"]
+    requests = [
+        ("get", "/api/todos", {"teamId": seeded_team}),
+        ("get", "/api/todos", {"teamId": seeded_team, "limit": 50, "cursor": first_page.headers["X-Next-Cursor"]}),
+        ("get", "/api/todos", {"teamId": seeded_team, "status": "backlog", "assigneeId": user_id}),
+        ("get", "/api/todos", {"teamId": seeded_team, "unassigned": "true", "limit": 50}),
+        ("get", "/api/todos", {"teamId": seeded_team, "overdue": "true"}),
+        ("get", "/api/todos", {"teamId": seeded_team, "dueAfter": "2030-01-02T00:00:00", "dueBefore": "2030-01-03T00:00:00"}),
+        ("get", "/api/todos/changes", {"teamId": seeded_team, "since": sync_cursor}),
+        ("get", f"/api/todos/{todo_id}", None),
+        ("get", "/api/notifications", None),
+        ("get", "/api/notifications", {"limit": 20, "cursor": notifications_cursor}),
+        ("get", "/api/notifications/unread-count", None),
+        ("get", "/api/teams", None),
+        ("get", f"/api/teams/{seeded_team}/members", None),
+        ("get", f"/api/teams/{seeded_team}/summary", None),
+    ]
+    for method, url, params in requests:
+        response = client.request(method, url, headers=auth_headers, params=params)
+        assert response.status_code == 200, url
+    assert client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"status": "done"}).status_code == 200
+    assert client.post(
+        "/api/notifications/read", headers=auth_headers, json={"cursor": notifications_cursor}
+    ).status_code == 200
+
+    statements = list(captured_queries)
+    plans = app_client.portal.call(_explain, db_session, statements)
+
+    offenders = {statement: _seq_scans(plan) for statement, plan in plans if _seq_scans(plan)}
+    assert not offenders, offenders
+
+
+@pytest.mark.parametrize("sort", ["due_date", "created_at", "updated_at"])
+def test_todo_list_sorts_should_be_read_in_index_order(
+    client: TestClient, auth_headers, app_client, db_session, seeded_team, captured_queries, sort
+):
+    """Test each list sort should come straight off a matching index, with no Sort step"""
+    team_id, _ = seeded_team
+    first = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id, "limit": 50, "sort": sort})
+    assert first.status_code == 200
+    captured_queries.clear()
+    response = client.get(
+        "/api/todos",
+        headers=auth_headers,
+        params={"teamId": team_id, "limit": 50, "sort": sort, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert response.status_code == 200
+
+    statements = [(statement, parameters) for statement, parameters in captured_queries if "FROM todos" in statement]
+    plans = app_client.portal.call(_explain, db_session, statements)
+
+    for statement, plan in plans:
+        assert not _node_types(plan) & {"Sort", "Incremental Sort"}, statement
+
+
+@pytest.mark.parametrize("depth", [1000, 1500])
+def test_due_date_pages_should_seek_to_deep_cursors(
+    client: TestClient, auth_headers, app_client, db_session, seeded_team, captured_queries, depth
+):
+    """Test a deep due date page, among dated or undated todos, should not read the rows before its cursor"""
+    team_id, _ = seeded_team
+    params = {"teamId": team_id, "sort": "due_date", "limit": 500}
+    cursor = None
+    for _ in range(depth // 500):
+        page = client.get("/api/todos", headers=auth_headers, params={**params, "cursor": cursor} if cursor else params)
+        assert page.status_code == 200
+        cursor = page.headers["X-Next-Cursor"]
+    captured_queries.clear()
+    response = client.get("/api/todos", headers=auth_headers, params={**params, "limit": 50, "cursor": cursor})
+    assert response.status_code == 200
+    assert len(response.json()) == 50
+
+    statements = [(statement, parameters) for statement, parameters in captured_queries if "FROM todos" in statement]
+    plans = app_client.portal.call(_explain, db_session, statements, True)
+
+    for statement, plan in plans:
+        # Only rows sharing the cursor's due date may be skipped, never the pages before it
+        assert _rows_removed_by_filter(plan) <= 1, statement
+        assert not _node_types(plan) & {"Sort", "Incremental Sort"}, statement
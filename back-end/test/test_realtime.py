@@ -0,0 +1,648 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def team_id(client: TestClient, auth_headers, drain_outbox):
+    """Create a team whose todo events go through the outbox"""
+    response = client.post("/api/teams", headers=auth_headers, json={"name": "Outbox Team"})
+    assert response.status_code == 201
+    # Send the owner's team.added now, so tests only see the events they cause
+    drain_outbox()
+    return response.json()["id"]
+
+
+class FlakyGateway:
+    """Fails the first broadcast, then records every broadcast it is given"""
+
+    def __init__(self):
+        self.failed = False
+        self.broadcasts = []
+
+    async def broadcast_todo_change(self, team_id, event, payload):
+        if not self.failed:
+            self.failed = True
+            raise ConnectionError("socket server unavailable")
+        self.broadcasts.append((event, payload["id"]))
+
+
+def _pending(app_client, db_session) -> int:
+    from sqlalchemy import func, select
+    from app.models.outbox import RealtimeOutbox
+
+    async def count():
+        return await db_session.scalar(select(func.count()).select_from(RealtimeOutbox))
+
+    return app_client.portal.call(count)
+
+
+def test_outbox_should_keep_events_queued_until_they_are_emitted(
+    client: TestClient, auth_headers, team_id, app_client, db_session
+):
+    """Test a failed emit should leave the batch queued so the next dispatch delivers it in order"""
+    from app.realtime.outbox import OutboxDispatcher
+
+    first = client.post("/api/todos", headers=auth_headers, json={"title": "Outbox one", "team_id": team_id})
+    second = client.post("/api/todos", headers=auth_headers, json={"title": "Outbox two", "team_id": team_id})
+    queued = _pending(app_client, db_session)
+    assert queued >= 2
+
+    gateway = FlakyGateway()
+    dispatcher = OutboxDispatcher(gateway)
+    with pytest.raises(ConnectionError):
+        app_client.portal.call(dispatcher.dispatch_batch, db_session)
+    assert _pending(app_client, db_session) == queued
+
+    assert app_client.portal.call(dispatcher.dispatch_batch, db_session) == queued
+    assert _pending(app_client, db_session) == 0
+    assert gateway.broadcasts[-2:] == [
+        ("todo.created", first.json()["id"]),
+        ("todo.created", second.json()["id"]),
+    ]
+    assert dispatcher.delivered == queued
+    assert dispatcher.last_lag_seconds >= 0
+
+
+def test_outbox_metrics_should_report_queue_depth(client: TestClient, auth_headers, team_id):
+    """Test GET /api/realtime/outbox should report pending rows and delivery counters"""
+    client.post("/api/todos", headers=auth_headers, json={"title": "Queued todo", "team_id": team_id})
+
+    response = client.get("/api/realtime/outbox", headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["pending"] >= 1
+    assert body["oldest_pending_seconds"] >= 0
+    assert {"delivered", "batches", "failures", "last_lag_seconds", "max_lag_seconds"} <= body.keys()
+
+
+def test_outbox_metrics_should_require_auth(client: TestClient):
+    """Test GET /api/realtime/outbox without a token should be rejected"""
+    response = client.get("/api/realtime/outbox")
+
+    assert response.status_code == 401
+
+
+def test_postgres_manager_should_reassemble_payloads_over_the_notify_limit():
+    """Test a message split into NOTIFY-sized chunks should decode to the original, multi-byte text included"""
+    import orjson
+    from app.realtime.postgres_manager import NOTIFY_PAYLOAD_LIMIT, AsyncPostgresManager, split_payload
+
+    message = {"method": "emit", "event": "todo.bulk", "data": {"title": "Über-große Karte ✓ " * 2000}}
+    encoded = orjson.dumps(message)
+    pieces = split_payload(encoded)
+
+    assert len(pieces) > 1
+    assert all(len(piece.encode()) <= NOTIFY_PAYLOAD_LIMIT for piece in pieces)
+    partial = {}
+    decoded = [
+        AsyncPostgresManager._decode(f"#m:{index}:{len(pieces)}:{piece}", partial)
+        for index, piece in reversed(list(enumerate(pieces)))
+    ]
+    assert decoded[:-1] == [None] * (len(pieces) - 1)
+    assert decoded[-1] == message
+    assert partial == {}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def _run_workers(count: int, **settings):
+    """Run API processes with the given settings; yields their base URLs once they answer"""
+    env = {**os.environ, "DEBUG": "false", **settings}
+    ports = [_free_port() for _ in range(count)]
+    processes = [
+        subprocess.Popen(
+            # Long-polling requests would otherwise hold up shutdown until they time out
+            [sys.executable, "-m", "uvicorn", "main:socket_app", "--port", str(port), "--timeout-graceful-shutdown", "2"],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for port in ports
+    ]
+    urls = [f"http://127.0.0.1:{port}" for port in ports]
+    try:
+        deadline = time.monotonic() + 30
+        for url in urls:
+            while True:
+                try:
+                    httpx.get(url).raise_for_status()
+                    break
+                except httpx.HTTPError:
+                    assert time.monotonic() < deadline, f"{url} did not start"
+                    time.sleep(0.2)
+        yield urls
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def _wait_for(condition, message: str, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, message
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def live_user():
+    """Register a user through a live worker; the workers commit for real, so it is deleted afterwards"""
+    from sqlalchemy import text
+    from app.core.database import engine as sync_engine
+
+    email = f"live+{pytest.current_time}@example.com"
+    created_teams = []
+
+    def register(url: str) -> dict:
+        response = httpx.post(
+            f"{url}/api/auth/register", json={"name": "Live User", "email": email, "password": "Passw0rd!"}
+        )
+        assert response.status_code == 201
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def create_team(url: str, headers: dict) -> str:
+        response = httpx.post(f"{url}/api/teams", headers=headers, json={"name": "Live Team"})
+        assert response.status_code == 201
+        created_teams.append(response.json()["id"])
+        # Let the owner's team.added go out first, so it never lands among the events a test counts
+        _wait_for(
+            lambda: httpx.get(f"{url}/api/realtime/outbox", headers=headers).json()["pending"] == 0,
+            "team.added was not dispatched",
+        )
+        return created_teams[-1]
+
+    yield register, create_team
+    with sync_engine.begin() as connection:
+        for team_id in created_teams:
+            connection.execute(text("DELETE FROM teams WHERE id = CAST(:id AS UUID)"), {"id": team_id})
+        connection.execute(text("DELETE FROM users WHERE email = :email"), {"email": email})
+
+
+def test_postgres_manager_should_deliver_events_across_workers(live_user):
+    """Test todos created through one worker should reach a client connected to the other"""
+    import socketio
+
+    register, create_team = live_user
+    received = []
+    joined = []
+    sio = socketio.Client()
+    sio.on("todo.created", lambda payload: received.append(payload["title"]))
+    sio.on("team.joined", lambda payload: joined.append(payload["teamId"]))
+    with _run_workers(2, REALTIME_MANAGER="postgres") as (listening, writing):
+        headers = register(writing)
+        try:
+            sio.connect(listening, transports=["polling"], auth={"token": headers["Authorization"][7:]})
+            team_id = create_team(writing, headers)
+            sio.emit("joinTeam", {"teamId": team_id})
+            _wait_for(lambda: joined, "team.joined was not received")
+
+            titles = [f"Relayed {i}" for i in range(5)]
+            for title in titles:
+                created = httpx.post(f"{writing}/api/todos", headers=headers, json={"title": title, "team_id": team_id})
+                assert created.status_code == 201
+
+            _wait_for(lambda: len(received) >= len(titles), "relayed events were not received")
+            assert received == titles
+        finally:
+            sio.disconnect()
+
+
+def test_sockets_should_join_team_rooms_on_connect_and_when_added_to_a_team(live_user):
+    """Test a client that never sends joinTeam should get events for its teams, including one created on another worker"""
+    import socketio
+
+    register, create_team = live_user
+    received = []
+    joined = []
+    sio = socketio.Client()
+    sio.on("todo.created", lambda payload: received.append(payload["title"]))
+    sio.on("team.added", lambda payload: joined.append(payload["teamId"]))
+    # A long poll interval leaves dispatching to the worker whose commit wakes it
+    with _run_workers(2, REALTIME_MANAGER="postgres", OUTBOX_POLL_INTERVAL_MS="60000") as (listening, writing):
+        headers = register(writing)
+        existing = create_team(writing, headers)
+        try:
+            sio.connect(listening, transports=["polling"], auth={"token": headers["Authorization"][7:]})
+
+            def create(title: str, team_id: str):
+                response = httpx.post(f"{writing}/api/todos", headers=headers, json={"title": title, "team_id": team_id})
+                assert response.status_code == 201
+
+            create("Existing team", existing)
+            _wait_for(lambda: received, "the team room was not joined on connect")
+            added = create_team(writing, headers)
+            _wait_for(lambda: added in joined, "team.added was not pushed for the new team")
+            create("New team", added)
+            _wait_for(lambda: len(received) == 2, "the new team room was not joined across workers")
+            assert received == ["Existing team", "New team"]
+        finally:
+            sio.disconnect()
+
+
+def test_replay_buffer_should_cover_gaps_only_within_its_window():
+    """Test since() should return missed events in order, and None once they left the buffer or the epoch differs"""
+    from app.realtime.replay import ReplayBuffer
+
+    replay = ReplayBuffer(size=3, max_rooms=2)
+    for i in range(1, 6):
+        assert replay.record("team-a", "todo.updated", {"n": i}) == i
+    epoch = replay.epoch_of("team-a")
+
+    assert [seq for seq, _, _ in replay.since("team-a", epoch, 2)] == [3, 4, 5]
+    assert replay.since("team-a", epoch, 5) == []
+    assert replay.since("team-a", epoch, 1) is None
+    assert replay.since("team-a", "another-process", 4) is None
+    assert replay.since("team-a", epoch, 9) is None
+
+    replay.record("user-b", "notification.created", {})
+    replay.record("user-c", "notification.created", {})
+    assert replay.since("team-a", epoch, 5) is None
+    assert replay.since("user-c", replay.epoch_of("user-c"), 0) == [(1, "notification.created", {})]
+
+    # An evicted room starts a new log: a client of the old one must reload, not get part of the new one
+    replay.record("team-a", "todo.updated", {"n": 6})
+    replay.record("team-a", "todo.updated", {"n": 7})
+    assert replay.epoch_of("team-a") != epoch
+    assert replay.since("team-a", epoch, 1) is None
+
+
+def test_rejoining_client_should_get_missed_events_replayed(live_user):
+    """Test a client rejoining with its last sequence should receive only what it missed, or resync.required"""
+    from uuid import uuid4
+    import socketio
+
+    register, create_team = live_user
+
+    def connect(url: str, token: str):
+        client = socketio.Client()
+        client.events = []
+        client.on("todo.created", lambda payload, meta: client.events.append((payload["title"], meta)))
+        client.on("team.joined", lambda payload: client.events.append(("joined", None)))
+        client.on("resync.required", lambda payload: client.events.append(("resync", payload)))
+        client.connect(url, transports=["polling"], auth={"token": token})
+        return client
+
+    with _run_workers(1, REALTIME_REPLAY_BUFFER_SIZE="3") as (url,):
+        headers = register(url)
+        token = headers["Authorization"][7:]
+        team_id = create_team(url, headers)
+
+        def create(*titles):
+            for title in titles:
+                response = httpx.post(f"{url}/api/todos", headers=headers, json={"title": title, "team_id": team_id})
+                assert response.status_code == 201
+            # Sent before the next client connects, so it can only get them by replay
+            _wait_for(
+                lambda: httpx.get(f"{url}/api/realtime/outbox", headers=headers).json()["pending"] == 0,
+                "the todos were not dispatched",
+            )
+
+        first = connect(url, token)
+        first.emit("joinTeam", {"teamId": team_id})
+        _wait_for(lambda: first.events, "team.joined was not received")
+        create("One")
+        _wait_for(lambda: len(first.events) == 2, "todo.created was not received")
+        first.disconnect()
+        _, meta = first.events[1]
+        assert (meta["room"], meta["seq"]) == (f"team-{team_id}", 1)
+
+        create("Two", "Three")
+        second = connect(url, token)
+        second.emit("joinTeam", {"teamId": team_id, "epoch": meta["epoch"], "seq": meta["seq"]})
+        _wait_for(lambda: len(second.events) == 3, "missed events were not replayed")
+        second.disconnect()
+        assert [(title, replayed and replayed["seq"]) for title, replayed in second.events] == [
+            ("joined", None), ("Two", 2), ("Three", 3),
+        ]
+
+        create("Four", "Five", "Six", "Seven")
+        third = connect(url, token)
+        third.emit("joinTeam", {"teamId": team_id, "epoch": meta["epoch"], "seq": 3})
+        _wait_for(lambda: len(third.events) == 2, "resync.required was not received")
+        third.disconnect()
+        assert third.events[1] == ("resync", {"room": f"team-{team_id}"})
+
+        # Another team's room is refused, and a malformed seq is answered with resync.required
+        fourth = connect(url, token)
+        fourth.emit("joinTeam", {"teamId": str(uuid4()), "epoch": meta["epoch"], "seq": 0})
+        fourth.emit("joinTeam", {"teamId": team_id, "epoch": meta["epoch"], "seq": "three"})
+        _wait_for(lambda: len(fourth.events) == 2, "resync.required was not received")
+        time.sleep(0.5)
+        fourth.disconnect()
+        assert fourth.events == [("joined", None), ("resync", {"room": f"team-{team_id}"})]
+
+
+def test_room_batcher_should_collapse_superseded_events_into_one_frame():
+    """Test one interval's events for a room should go out as a single todo.batch with the latest state per todo"""
+    import asyncio
+    from app.realtime.batching import RoomBatcher
+
+    frames = []
+
+    async def emit(event, payload, room):
+        frames.append((room, event, payload))
+
+    async def run():
+        batcher = RoomBatcher(emit, interval_ms=20)
+        await batcher.add("team-a", "todo.created", {"id": "1", "title": "New"})
+        await batcher.add("team-a", "todo.updated", {"id": "2", "title": "Old"})
+        await batcher.add("team-a", "todo.updated", {"id": "1", "title": "Renamed"})
+        await batcher.add("team-a", "todo.created", {"id": "3", "title": "Gone"})
+        await batcher.add("team-a", "todo.deleted", {"id": "3"})
+        await batcher.add("team-a", "todo.bulk", {"created": [], "updated": [], "deleted": []})
+        await batcher.add("team-a", "todo.updated", {"id": "2", "title": "Latest"})
+        await batcher.add("team-b", "todo.deleted", {"id": "4"})
+        await asyncio.sleep(0.1)
+        return batcher.metrics()
+
+    metrics = asyncio.run(run())
+
+    assert sorted(room for room, _, _ in frames) == ["team-a", "team-b"]
+    batch = next(payload for room, event, payload in frames if room == "team-a" and event == "todo.batch")
+    # The bulk event is a barrier, so todo 2's later update is not folded into its earlier one
+    assert [(item["event"], item["payload"].get("title")) for item in batch["events"]] == [
+        ("todo.updated", "Old"),
+        ("todo.created", "Renamed"),
+        ("todo.bulk", None),
+        ("todo.updated", "Latest"),
+    ]
+    assert ("team-b", "todo.deleted", {"id": "4"}) in frames
+    assert metrics["team-a"] == {"received": 7, "sent": 4, "flushes": 1, "max_batch_size": 4}
+    assert metrics["team-b"] == {"received": 1, "sent": 1, "flushes": 1, "max_batch_size": 1}
+
+
+def test_collapse_event_should_chain_deltas_from_the_first_base_version():
+    """Test deltas for one todo should merge, and a delta after a full event should fold into it"""
+    from app.realtime.batching import collapse_event
+
+    pending = {}
+    collapse_event(pending, "todo.delta", {"id": "1", "base_version": 3, "version": 4, "changes": {"status": "done", "updated_at": "a"}})
+    collapse_event(pending, "todo.delta", {"id": "1", "base_version": 4, "version": 5, "changes": {"title": "New", "updated_at": "b"}})
+    collapse_event(pending, "todo.created", {"id": "2", "title": "Fresh", "status": "backlog", "version": 1})
+    collapse_event(pending, "todo.delta", {"id": "2", "base_version": 1, "version": 2, "changes": {"status": "done", "updated_at": "c"}})
+
+    assert list(pending.values()) == [
+        ("todo.delta", {"id": "1", "base_version": 3, "version": 5, "changes": {"status": "done", "title": "New", "updated_at": "b"}}),
+        ("todo.created", {"id": "2", "title": "Fresh", "status": "done", "version": 2, "updated_at": "c"}),
+    ]
+
+
+def test_collapse_event_should_not_merge_across_a_bulk_event():
+    """Test a todo.bulk should be a barrier: later events for its todos are not folded into earlier ones"""
+    from app.realtime.batching import collapse_event
+
+    pending = {}
+    collapse_event(pending, "todo.updated", {"id": "1", "title": "Old", "status": "backlog", "version": 2})
+    collapse_event(pending, "todo.bulk", {"updated": [{"id": "1", "title": "Bulk", "status": "done", "version": 3}]})
+    collapse_event(pending, "todo.delta", {"id": "1", "base_version": 3, "version": 4, "changes": {"status": "blocked"}})
+    collapse_event(pending, "todo.delta", {"id": "1", "base_version": 4, "version": 5, "changes": {"title": "New"}})
+
+    assert [(event, payload.get("version")) for event, payload in pending.values()] == [
+        ("todo.updated", 2), ("todo.bulk", None), ("todo.delta", 5),
+    ]
+    assert list(pending.values())[2][1]["changes"] == {"status": "blocked", "title": "New"}
+
+
+def test_room_batcher_should_drop_counters_of_rooms_without_clients():
+    """Test a room's batching counters should go once a flush finds it empty, or when its last client leaves"""
+    import asyncio
+    from app.realtime.batching import RoomBatcher
+
+    occupied = {"team-busy"}
+
+    async def emit(event, payload, room):
+        pass
+
+    async def run():
+        batcher = RoomBatcher(emit, interval_ms=10000, is_occupied=occupied.__contains__)
+        for room in ("team-busy", "team-idle"):
+            await batcher.add(room, "todo.updated", {"id": "1"})
+        await batcher.flush()
+        flushed = list(batcher.metrics())
+        await batcher.add("team-busy", "todo.updated", {"id": "1"})
+        # A pending buffer keeps its counters until it is sent
+        batcher.forget("team-busy")
+        pending = list(batcher.metrics())
+        occupied.clear()
+        await batcher.flush()
+        return flushed, pending, batcher.metrics()
+
+    assert asyncio.run(run()) == (["team-busy"], ["team-busy"], {})
+
+
+def test_batching_should_route_team_broadcasts_through_the_room_batcher(
+    client: TestClient, auth_headers, team_id, app_client, drain_outbox, monkeypatch
+):
+    """Test with batching on, a burst of todo events should reach the team room as one todo.batch frame"""
+    from app.realtime.batching import RoomBatcher
+    from app.realtime.gateway import get_realtime_gateway
+
+    gateway = get_realtime_gateway()
+    frames = []
+
+    async def emit(event, payload, room):
+        frames.append((room, event, payload))
+
+    monkeypatch.setattr(gateway, "batcher", RoomBatcher(emit, interval_ms=10000))
+    created = client.post("/api/todos", headers=auth_headers, json={"title": "Batched", "team_id": team_id})
+    for status in ("in_progress", "done"):
+        client.patch(f"/api/todos/{created.json()['id']}", headers=auth_headers, json={"status": status})
+    drain_outbox()
+    assert frames == []
+    metrics = client.get("/api/realtime/batches", headers=auth_headers).json()
+    assert metrics["interval_ms"] == 10000
+    assert metrics["rooms"][f"team-{team_id}"]["received"] == 3
+    app_client.portal.call(gateway.flush_batches)
+
+    assert [(room, event) for room, event, _ in frames] == [(f"team-{team_id}", "todo.created")]
+    assert frames[0][2]["status"] == "done"
+
+
+def test_batch_metrics_should_only_list_rooms_of_the_callers_teams(
+    client: TestClient, auth_headers, team_id, app_client, monkeypatch
+):
+    """Test /api/realtime/batches should leave out the rooms of teams the caller is not in"""
+    from uuid import uuid4
+    from app.realtime.batching import RoomBatcher
+    from app.realtime.gateway import get_realtime_gateway
+
+    async def emit(event, payload, room):
+        pass
+
+    batcher = RoomBatcher(emit, interval_ms=10000)
+    monkeypatch.setattr(get_realtime_gateway(), "batcher", batcher)
+    other_room = f"team-{uuid4()}"
+    for room in (f"team-{team_id}", other_room, "user-someone"):
+        app_client.portal.call(batcher.add, room, "todo.updated", {"id": "1"})
+
+    metrics = client.get("/api/realtime/batches", headers=auth_headers).json()
+
+    assert list(metrics["rooms"]) == [f"team-{team_id}"]
+    app_client.portal.call(batcher.flush)
+
+
+def test_negotiated_packet_should_encode_json_text_and_msgpack_with_native_types():
+    """Test a packet should encode once as JSON text, give a MessagePack form on demand and decode either"""
+    from datetime import datetime, timezone
+    from uuid import uuid4
+    import msgpack
+    from socketio import packet
+    from app.realtime.packets import NegotiatedPacket
+
+    todo_id = uuid4()
+    due = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    pkt = NegotiatedPacket(packet.EVENT, data=["todo.updated", {"id": todo_id, "due_date": due}], namespace="/collab")
+
+    text = pkt.encode()
+    assert text.startswith('2/collab,["todo.updated"')
+    binary = text.msgpack_packet().data
+    assert text.msgpack_packet() is text.msgpack_packet()
+    decoded = msgpack.unpackb(binary, timestamp=3)
+    assert decoded["data"][1] == {"id": todo_id.bytes, "due_date": due}
+
+    from_client = NegotiatedPacket(encoded_packet=msgpack.packb({"type": packet.EVENT, "data": ["joinTeam", {"teamId": "t"}], "nsp": "/collab"}))
+    assert (from_client.namespace, from_client.data) == ("/collab", ["joinTeam", {"teamId": "t"}])
+    assert NegotiatedPacket(encoded_packet=text).data == ["todo.updated", {"id": str(todo_id), "due_date": due.isoformat()}]
+
+
+def test_msgpack_clients_and_json_clients_should_share_a_team_room(live_user):
+    """Test with REALTIME_MSGPACK on, a client asking for MessagePack and a default JSON client should both get events"""
+    import socketio
+
+    register, create_team = live_user
+
+    def listen(**options):
+        client = socketio.Client(**options)
+        client.events = []
+        client.on("todo.created", lambda payload, meta: client.events.append(payload["title"]))
+        client.on("team.joined", lambda payload: client.events.append("joined"))
+        return client
+
+    with _run_workers(1, REALTIME_MSGPACK="true") as (url,):
+        headers = register(url)
+        token = headers["Authorization"][7:]
+        team_id = create_team(url, headers)
+        # The msgpack client cannot parse JSON frames, so any event it gets was negotiated
+        binary = listen(serializer="msgpack")
+        binary.connect(f"{url}?serializer=msgpack", transports=["polling"], auth={"token": token})
+        text = listen()
+        text.connect(url, transports=["polling"], auth={"token": token})
+        for client in (binary, text):
+            client.emit("joinTeam", {"teamId": team_id})
+        _wait_for(lambda: binary.events and text.events, "team.joined was not received")
+
+        response = httpx.post(f"{url}/api/todos", headers=headers, json={"title": "Packed", "team_id": team_id})
+        assert response.status_code == 201
+        _wait_for(lambda: len(binary.events) == 2 and len(text.events) == 2, "todo.created was not received")
+        binary.disconnect()
+        text.disconnect()
+        assert binary.events == text.events == ["joined", "Packed"]
+
+
+def test_client_that_stops_polling_should_be_collapsed_to_resync_then_disconnected(live_user):
+    """Test a client over the queue high-water mark should get resync.required in place of its backlog, then be dropped"""
+    import json
+
+    register, create_team = live_user
+
+    with _run_workers(1, REALTIME_CLIENT_QUEUE_HIGH_WATER="3") as (url,):
+        headers = register(url)
+        team_id = create_team(url, headers)
+        user_id = httpx.get(f"{url}/api/auth/me", headers=headers).json()["user"]["sub"]
+        # A raw long-polling client, so the test decides when it reads
+        endpoint = f"{url}/socket.io/?EIO=4&transport=polling"
+        handshake = httpx.get(endpoint).text
+        endpoint += f"&sid={json.loads(handshake[1:])['sid']}"
+
+        def send(packet: str):
+            assert httpx.post(endpoint, content=packet).text == "OK"
+
+        def poll() -> list[str]:
+            response = httpx.get(endpoint, timeout=5)
+            return response.text.split("\x1e") if response.status_code == 200 else []
+
+        def create(*titles):
+            for title in titles:
+                response = httpx.post(f"{url}/api/todos", headers=headers, json={"title": title, "team_id": team_id})
+                assert response.status_code == 201
+
+        send("40" + json.dumps({"token": headers["Authorization"][7:]}))
+        assert poll()[0].startswith("40")
+        send("42" + json.dumps(["joinTeam", {"teamId": team_id}]))
+        assert json.loads(poll()[0][2:])[0] == "team.joined"
+
+        # The fifth event finds four queued: they are replaced by one resync.required per room
+        create("One", "Two", "Three", "Four", "Five")
+        _wait_for(
+            lambda: httpx.get(f"{url}/api/realtime/queues", headers=headers).json()["resyncs"] == 1,
+            "the client was not collapsed",
+        )
+        events = [json.loads(packet[2:]) for packet in poll()]
+        assert sorted(event[1]["room"] for event in events if event[0] == "resync.required") == [
+            f"team-{team_id}", f"user-{user_id}",
+        ]
+        assert [event[1]["title"] for event in events if event[0] == "todo.created"] == ["Five"]
+
+        # Having caught up, the client is only collapsed again; over the mark again before that, it is dropped
+        create("Six", "Seven", "Eight", "Nine", "Ten")
+        _wait_for(
+            lambda: httpx.get(f"{url}/api/realtime/queues", headers=headers).json()["resyncs"] == 2,
+            "the client was not collapsed again",
+        )
+        create("Eleven", "Twelve")
+        _wait_for(
+            lambda: httpx.get(f"{url}/api/realtime/queues", headers=headers).json()["disconnects"] == 1,
+            "the client was not disconnected",
+        )
+        metrics = httpx.get(f"{url}/api/realtime/queues", headers=headers).json()
+        assert (metrics["high_water"], metrics["dropped_events"], metrics["clients"]) == (3, 8, 0)
+
+
+def test_slow_client_should_be_collapsed_on_its_own_worker_when_another_dispatches(live_user):
+    """Test with the postgres manager, a slow client should be shed for events another worker dispatched"""
+    import json
+
+    register, create_team = live_user
+
+    # A long poll interval leaves dispatching to the worker whose commit wakes it
+    with _run_workers(
+        2, REALTIME_MANAGER="postgres", OUTBOX_POLL_INTERVAL_MS="60000", REALTIME_CLIENT_QUEUE_HIGH_WATER="3"
+    ) as (listening, writing):
+        headers = register(writing)
+        team_id = create_team(writing, headers)
+        user_id = httpx.get(f"{writing}/api/auth/me", headers=headers).json()["user"]["sub"]
+        endpoint = f"{listening}/socket.io/?EIO=4&transport=polling"
+        handshake = httpx.get(endpoint).text
+        endpoint += f"&sid={json.loads(handshake[1:])['sid']}"
+        # Joins the team and user rooms on connect
+        assert httpx.post(endpoint, content="40" + json.dumps({"token": headers["Authorization"][7:]})).text == "OK"
+        assert httpx.get(endpoint, timeout=5).text.startswith("40")
+
+        for title in ("One", "Two", "Three", "Four", "Five"):
+            response = httpx.post(f"{writing}/api/todos", headers=headers, json={"title": title, "team_id": team_id})
+            assert response.status_code == 201
+        _wait_for(
+            lambda: httpx.get(f"{listening}/api/realtime/queues", headers=headers).json()["resyncs"] == 1,
+            "the client was not collapsed by its own worker",
+        )
+        events = [json.loads(packet[2:]) for packet in httpx.get(endpoint, timeout=5).text.split("\x1e")]
+        assert sorted(event[1]["room"] for event in events if event[0] == "resync.required") == [
+            f"team-{team_id}", f"user-{user_id}",
+        ]
+        assert [event[1]["title"] for event in events if event[0] == "todo.created"] == ["Five"]
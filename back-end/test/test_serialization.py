@@ -0,0 +1,47 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+from app.core.serialization import OrjsonSocketIOJson, todo_to_dict, todo_to_json, todos_to_json
+from app.models.team import Team
+from app.models.todo import Todo, TodoStatus
+from app.models.user import User
+from app.schemas.todo import TodoResponse
+
+
+def build_todos() -> list[Todo]:
+    """Build transient todos sharing one team, with and without assignee/due date"""
+    now = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    owner = User(id=uuid4(), email="owner@example.com", name="Owner", created_at=now, updated_at=now)
+    team = Team(id=uuid4(), name="Team", description=None, owner_id=owner.id, created_at=now, updated_at=now)
+    team.owner = owner
+    todos = []
+    for index, (due_date, assignee) in enumerate([(datetime(2030, 1, 1), owner), (None, None)]):
+        todo = Todo(
+            id=uuid4(), title=f"Todo {index}", description=None, due_date=due_date,
+            status=TodoStatus.BLOCKED, team_id=team.id,
+            assignee_id=assignee.id if assignee else None, created_at=now, updated_at=now, version=index + 1,
+        )
+        todo.team = team
+        todo.assignee = assignee
+        todos.append(todo)
+    return todos
+
+
+def test_todos_to_json_should_match_todo_response_schema():
+    """Test the list fast path should produce exactly what TodoResponse would"""
+    todos = build_todos()
+    expected = [TodoResponse.model_validate(todo).model_dump(mode="json") for todo in todos]
+
+    assert json.loads(todos_to_json(todos)) == expected
+    assert [json.loads(todo_to_json(todo)) for todo in todos] == expected
+    assert [todo_to_dict(todo) for todo in todos] == expected
+
+
+def test_socketio_json_should_roundtrip_payloads():
+    """Test the orjson stand-in should accept json.dumps keyword arguments"""
+    payload = {"id": "1", "team": {"owner": None}, "items": [1, 2.5, True]}
+
+    encoded = OrjsonSocketIOJson.dumps(payload, separators=(",", ":"))
+
+    assert isinstance(encoded, str)
+    assert OrjsonSocketIOJson.loads(encoded) == payload
@@ -76,3 +76,210 @@ def test_invite_team_member_should_invite_member(client: TestClient, auth_header
     data = response.json()
     assert "id" in data
 
+
+
+def test_adding_a_member_should_move_their_sockets_into_the_team_room(
+    client: TestClient, auth_headers, team_id, drain_outbox
+):
+    """Test add and invite should queue team.added for the new member, dispatched as a room join"""
+    drain_outbox()
+    joins = []
+
+    class RoomJoinGateway:
+        async def join_team_rooms(self, event, payloads):
+            joins.extend((event, str(user_id), payload) for user_id, payload in payloads)
+
+    added = client.post(
+        f"/api/teams/{team_id}/members", headers=auth_headers,
+        json={"email": f"teams-join+{pytest.current_time}@example.com", "name": "Joining Member"},
+    ).json()
+    invited = client.post(
+        f"/api/teams/{team_id}/invite", headers=auth_headers,
+        json={"email": f"teams-join-invite+{pytest.current_time}@example.com", "name": "Joining Invitee"},
+    ).json()
+    drain_outbox(RoomJoinGateway())
+
+    assert joins == [
+        ("team.added", added["user_id"], {"teamId": team_id}),
+        ("team.added", invited["user_id"], {"teamId": team_id}),
+    ]
+
+
+def test_get_team_ids_for_user_should_warm_the_membership_cache(app_client, db_session, team_id, auth_headers, client):
+    """Test the connect-time membership query should return the user's teams and cache each membership"""
+    from uuid import UUID
+    from app.services.team_service import TeamService, membership_cache
+
+    user_id = UUID(client.get("/api/auth/me", headers=auth_headers).json()["user"]["sub"])
+    membership_cache.invalidate((UUID(team_id), user_id))
+
+    team_ids = app_client.portal.call(TeamService.get_team_ids_for_user, db_session, user_id)
+
+    assert UUID(team_id) in team_ids
+    assert membership_cache.get((UUID(team_id), user_id)) is not None
+
+
+def test_membership_checks_should_be_served_from_cache(client: TestClient, auth_headers, team_id):
+    """Test repeated membership checks for the same user/team should hit the cache"""
+    from app.services.team_service import membership_cache
+
+    assert client.get(f"/api/teams/{team_id}/members", headers=auth_headers).status_code == 200
+    before = membership_cache.stats()
+    assert client.get(f"/api/teams/{team_id}/members", headers=auth_headers).status_code == 200
+
+    after = membership_cache.stats()
+    assert after["misses"] == before["misses"]
+    assert after["hits"] > before["hits"]
+
+
+def test_get_team_members_should_answer_304_until_membership_changes(client: TestClient, auth_headers, team_id):
+    """Test GET /api/teams/:id/members should honour If-None-Match until a member is added"""
+    first = client.get(f"/api/teams/{team_id}/members", headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get(f"/api/teams/{team_id}/members", headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    added = client.post(
+        f"/api/teams/{team_id}/members",
+        headers=auth_headers,
+        json={"email": f"etag-member+{pytest.current_time}@example.com", "name": "ETag Member"},
+    )
+    assert added.status_code == 200
+    changed = client.get(f"/api/teams/{team_id}/members", headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
+
+
+def _summary_from_list(client: TestClient, auth_headers, team_id):
+    """Count the team's todos the slow way, from the full list"""
+    todos = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id}).json()
+    overdue = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id, "overdue": "true"}).json()
+    by_status = {status: 0 for status in ("backlog", "in_progress", "done", "blocked")}
+    by_assignee = {}
+    for todo in todos:
+        by_status[todo["status"]] += 1
+        if todo["assignee_id"]:
+            by_assignee[todo["assignee_id"]] = by_assignee.get(todo["assignee_id"], 0) + 1
+    return {
+        "team_id": team_id,
+        "total": len(todos),
+        "by_status": by_status,
+        "by_assignee": by_assignee,
+        "unassigned": sum(1 for todo in todos if not todo["assignee_id"]),
+        "overdue": len(overdue),
+    }
+
+
+def test_team_summary_should_follow_todo_changes(client: TestClient, auth_headers, team_id, query_counter):
+    """Test GET /api/teams/:id/summary should stay equal to counting the todo list after every kind of change"""
+    member = client.post(
+        f"/api/teams/{team_id}/members",
+        headers=auth_headers,
+        json={"email": f"summary-member+{pytest.current_time}@example.com", "name": "Summary Member"},
+    )
+    assert member.status_code == 200
+    member_id = member.json()["user_id"]
+    seeds = [
+        {"title": "Late work", "status": "in_progress", "assignee_id": member_id, "due_date": "2000-01-01T00:00:00"},
+        {"title": "Future work", "status": "backlog", "due_date": "2999-01-01T00:00:00"},
+        {"title": "Late but done", "status": "done", "assignee_id": member_id, "due_date": "2000-01-01T00:00:00"},
+        {"title": "Stuck work", "status": "blocked"},
+    ]
+    ids = {}
+    for seed in seeds:
+        response = client.post("/api/todos", headers=auth_headers, json={**seed, "team_id": team_id})
+        assert response.status_code == 201
+        ids[seed["title"]] = response.json()["id"]
+
+    query_counter.clear()
+    summary = client.get(f"/api/teams/{team_id}/summary", headers=auth_headers)
+    assert summary.status_code == 200
+    assert len(query_counter) <= 3, query_counter
+    assert summary.json() == _summary_from_list(client, auth_headers, team_id)
+    assert summary.json()["overdue"] == 1
+    assert summary.json()["by_assignee"] == {member_id: 2}
+
+    assert client.patch(f"/api/todos/{ids['Late work']}", headers=auth_headers, json={"status": "done"}).status_code == 200
+    assert client.patch(f"/api/todos/{ids['Stuck work']}", headers=auth_headers, json={"assignee_id": member_id}).status_code == 200
+    assert client.patch(f"/api/todos/{ids['Future work']}", headers=auth_headers, json={"due_date": "2001-01-01T00:00:00"}).status_code == 200
+    assert client.delete(f"/api/todos/{ids['Late but done']}", headers=auth_headers).status_code == 200
+    bulk = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={
+            "team_id": team_id,
+            "operations": [
+                {"op": "create", "title": "Bulk late", "due_date": "2000-06-01T00:00:00"},
+                {"op": "update", "id": ids["Late work"], "status": "blocked"},
+            ],
+        },
+    )
+    assert bulk.status_code == 200
+
+    summary = client.get(f"/api/teams/{team_id}/summary", headers=auth_headers).json()
+    assert summary == _summary_from_list(client, auth_headers, team_id)
+    assert summary["overdue"] == 3
+    assert summary["by_status"]["blocked"] == 2
+
+
+async def _counter_writes(db) -> int:
+    """Rows this transaction has written to the team counter tables so far"""
+    from sqlalchemy import text
+
+    return await db.scalar(
+        text(
+            "SELECT coalesce(sum(n_tup_ins + n_tup_upd + n_tup_del), 0) FROM pg_stat_xact_user_tables"
+            " WHERE relname IN ('team_todo_counts', 'team_todo_due_counts')"
+        )
+    )
+
+
+def test_team_counters_should_be_written_once_per_key_and_statement(
+    client: TestClient, auth_headers, team_id, app_client, db_session
+):
+    """Test a bulk request should apply its summed changes to each counter row once, whatever the number of todos"""
+    created = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={
+            "team_id": team_id,
+            "operations": [{"op": "create", "title": f"Swap {i}", "status": "done" if i % 2 else "backlog"} for i in range(20)],
+        },
+    ).json()["created"]
+
+    # Ten cards move each way in one UPDATE: the status counts net out and are left alone
+    before = app_client.portal.call(_counter_writes, db_session)
+    swapped = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={
+            "team_id": team_id,
+            "operations": [
+                {"op": "update", "id": todo["id"], "status": "backlog" if todo["status"] == "done" else "done"}
+                for todo in created
+            ],
+        },
+    )
+    assert swapped.status_code == 200
+    assert app_client.portal.call(_counter_writes, db_session) == before
+
+    before = app_client.portal.call(_counter_writes, db_session)
+    moved = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={
+            "team_id": team_id,
+            "operations": [{"op": "update", "id": todo["id"], "status": "blocked"} for todo in created],
+        },
+    )
+    assert moved.status_code == 200
+    # BACKLOG and DONE drop to zero and are removed, BLOCKED is inserted: one write per key and step
+    assert app_client.portal.call(_counter_writes, db_session) - before == 5
+
+    summary = client.get(f"/api/teams/{team_id}/summary", headers=auth_headers).json()
+    assert summary == _summary_from_list(client, auth_headers, team_id)
+    assert summary["by_status"]["blocked"] == 20
@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 
 
 @pytest.fixture
@@ -39,6 +40,17 @@ def test_create_todo_should_create_todo_in_team(client: TestClient, auth_headers
     assert todo_id is not None
 
 
+def test_create_todo_should_store_offset_due_dates_as_utc(client: TestClient, auth_headers, team_id):
+    """Test POST /api/todos should accept due dates with a UTC offset or Z, as the front-end sends them"""
+    for due_date in ("2030-01-01T10:00:00+02:00", "2030-01-01T08:00:00.000Z"):
+        response = client.post(
+            "/api/todos", headers=auth_headers, json={"title": "Offset due", "team_id": team_id, "due_date": due_date}
+        )
+
+        assert response.status_code == 201
+        assert response.json()["due_date"].startswith("2030-01-01T08:00:00")
+
+
 def test_get_todos_should_list_todos_for_team(client: TestClient, auth_headers, team_id, todo_id):
     """Test GET /api/todos should list todos for the team"""
     response = client.get(
@@ -86,3 +98,559 @@ def test_delete_todo_should_delete_todo(client: TestClient, auth_headers, todo_i
     data = response.json()
     assert data["deleted"] is True
 
+
+
+def test_get_todos_should_page_with_cursor(client: TestClient, auth_headers, team_id):
+    """Test GET /api/todos with limit should walk every todo once via X-Next-Cursor"""
+    created = set()
+    for index, due_date in enumerate([None, "2030-01-02T00:00:00", None, "2030-01-01T00:00:00", None]):
+        response = client.post(
+            "/api/todos",
+            headers=auth_headers,
+            json={"title": f"Paged todo {index}", "team_id": team_id, "due_date": due_date},
+        )
+        assert response.status_code == 201
+        created.add(response.json()["id"])
+
+    full = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id})
+    assert "X-Next-Cursor" not in full.headers
+
+    seen = []
+    params = {"teamId": team_id, "limit": 2}
+    while True:
+        response = client.get("/api/todos", headers=auth_headers, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(todo["id"] for todo in page)
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params["cursor"] = next_cursor
+
+    assert seen == [todo["id"] for todo in full.json()]
+    assert set(seen) == created
+
+
+def test_get_todos_should_reject_invalid_cursor(client: TestClient, auth_headers, team_id):
+    """Test GET /api/todos should return 400 for a malformed cursor"""
+    response = client.get(
+        "/api/todos",
+        headers=auth_headers,
+        params={"teamId": team_id, "limit": 10, "cursor": "not-a-cursor"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_todo_lifecycle_should_work_with_assignee(client: TestClient, auth_headers, team_id):
+    """Test create/update/delete of a todo assigned to another team member"""
+    member = client.post(
+        f"/api/teams/{team_id}/members",
+        headers=auth_headers,
+        json={
+            "email": f"todos-assignee+{pytest.current_time}@example.com",
+            "name": "Todos Assignee",
+        },
+    )
+    assert member.status_code == 200
+    assignee_id = member.json()["user_id"]
+
+    created = client.post(
+        "/api/todos",
+        headers=auth_headers,
+        json={"title": "Assigned todo", "team_id": team_id, "assignee_id": assignee_id},
+    )
+    assert created.status_code == 201
+    assert created.json()["assignee"]["id"] == assignee_id
+    todo_id = created.json()["id"]
+
+    updated = client.patch(
+        f"/api/todos/{todo_id}",
+        headers=auth_headers,
+        json={"status": "in_progress"},
+    )
+    assert updated.status_code == 200
+    assert updated.json()["status"] == "in_progress"
+    assert updated.json()["team"]["id"] == team_id
+
+    deleted = client.delete(f"/api/todos/{todo_id}", headers=auth_headers)
+    assert deleted.status_code == 200
+    assert client.get(f"/api/todos/{todo_id}", headers=auth_headers).status_code == 404
+
+
+def test_todo_change_should_roll_back_when_its_notification_fails(client: TestClient, auth_headers, team_id, monkeypatch):
+    """Test a todo and its assignee's notification should be written in one transaction"""
+    from app.services.notification_service import NotificationService
+
+    member = client.post(
+        f"/api/teams/{team_id}/members",
+        headers=auth_headers,
+        json={"email": f"todos-atomic+{pytest.current_time}@example.com", "name": "Atomic Assignee"},
+    )
+    assert member.status_code == 200
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("notification write failed")
+
+    monkeypatch.setattr(NotificationService, "create_for_users", staticmethod(fail))
+    with pytest.raises(RuntimeError):
+        client.post(
+            "/api/todos",
+            headers=auth_headers,
+            json={"title": "Never stored", "team_id": team_id, "assignee_id": member.json()["user_id"]},
+        )
+
+    listed = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id})
+    assert [todo["title"] for todo in listed.json()] == []
+
+
+def test_create_todo_should_stay_within_query_budget(client: TestClient, auth_headers, team_id, query_counter):
+    """Test POST /api/todos should cost membership check + INSERT RETURNING + version bump + one fetch + outbox INSERT"""
+    from app.services.team_service import membership_cache
+
+    membership_cache.clear()
+    query_counter.clear()
+    response = client.post(
+        "/api/todos",
+        headers=auth_headers,
+        json={"title": "Budgeted todo", "team_id": team_id},
+    )
+
+    assert response.status_code == 201
+    assert len(query_counter) <= 5, query_counter
+
+
+def test_update_todo_should_stay_within_query_budget(client: TestClient, auth_headers, todo_id, query_counter):
+    """Test PATCH /api/todos/:id should cost lookup + membership check + UPDATE RETURNING + version bump + one fetch + outbox INSERT"""
+    from app.services.team_service import membership_cache
+
+    membership_cache.clear()
+    query_counter.clear()
+    response = client.patch(
+        f"/api/todos/{todo_id}",
+        headers=auth_headers,
+        json={"status": "done"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+    assert len(query_counter) <= 6, query_counter
+
+
+def test_create_todo_should_broadcast_rest_body_with_team_owner(client: TestClient, auth_headers, team_id, drain_outbox, monkeypatch):
+    """Test the todo.created payload should be the REST body plus the team owner"""
+    from app.realtime.gateway import get_realtime_gateway
+
+    events = []
+
+    async def capture(team_id, event, payload):
+        events.append((event, payload))
+
+    monkeypatch.setattr(get_realtime_gateway(), "broadcast_todo_change", capture)
+    response = client.post(
+        "/api/todos",
+        headers=auth_headers,
+        json={"title": "Broadcast todo", "team_id": team_id},
+    )
+    assert events == []
+    drain_outbox()
+
+    assert response.status_code == 201
+    body = response.json()
+    assert [event for event, _ in events] == ["todo.created"]
+    payload = events[0][1]
+    owner = payload["team"].pop("owner")
+    assert payload == body
+    assert owner["id"] == body["team"]["owner_id"]
+
+
+def test_update_todo_should_broadcast_changed_fields_in_delta_mode(
+    client: TestClient, auth_headers, team_id, todo_id, drain_outbox, monkeypatch
+):
+    """Test with deltas on, todo.delta should carry only the changed fields and a no-op PATCH nothing"""
+    from app.core.config import settings
+    from app.realtime.gateway import get_realtime_gateway
+
+    events = []
+
+    async def capture(team_id, event, payload):
+        events.append((event, payload))
+
+    drain_outbox()
+    monkeypatch.setattr(settings, "REALTIME_TODO_DELTAS", True)
+    monkeypatch.setattr(get_realtime_gateway(), "broadcast_todo_change", capture)
+    changed = client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"status": "done", "title": "Todos e2e todo"})
+    unchanged = client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"status": "done"})
+    drain_outbox()
+
+    assert changed.json()["version"] == 2
+    assert unchanged.json()["version"] == 2
+    assert unchanged.json()["updated_at"] == changed.json()["updated_at"]
+    assert events == [(
+        "todo.delta",
+        {
+            "id": todo_id,
+            "team_id": team_id,
+            "base_version": 1,
+            "version": 2,
+            "changes": {"status": "done", "updated_at": changed.json()["updated_at"]},
+        },
+    )]
+
+
+def test_bulk_todos_should_apply_all_operations_with_one_event(client: TestClient, auth_headers, team_id, todo_id, drain_outbox, monkeypatch):
+    """Test POST /api/todos/bulk should create, update and delete together and broadcast once"""
+    from app.realtime.gateway import get_realtime_gateway
+
+    member = client.post(
+        f"/api/teams/{team_id}/members",
+        headers=auth_headers,
+        json={"email": f"bulk-assignee+{pytest.current_time}@example.com", "name": "Bulk Assignee"},
+    )
+    assert member.status_code == 200
+    assignee_id = member.json()["user_id"]
+    doomed = client.post("/api/todos", headers=auth_headers, json={"title": "Doomed todo", "team_id": team_id})
+    assert doomed.status_code == 201
+
+    events = []
+    notified = []
+
+    async def capture(team_id, event, payload):
+        events.append((event, payload))
+
+    async def capture_users(event, payloads):
+        notified.extend(payload["message"] for _, payload in payloads)
+
+    drain_outbox()
+    gateway = get_realtime_gateway()
+    monkeypatch.setattr(gateway, "broadcast_todo_change", capture)
+    monkeypatch.setattr(gateway, "notify_users", capture_users)
+    response = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={
+            "team_id": team_id,
+            "operations": [
+                {"op": "create", "title": "Bulk one", "assignee_id": assignee_id},
+                {"op": "create", "title": "Bulk two", "status": "in_progress"},
+                {"op": "update", "id": todo_id, "status": "done", "assignee_id": assignee_id},
+                {"op": "delete", "id": doomed.json()["id"]},
+            ],
+        },
+    )
+    drain_outbox()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [todo["title"] for todo in body["created"]] == ["Bulk one", "Bulk two"]
+    assert body["created"][0]["assignee"]["id"] == assignee_id
+    assert body["created"][1]["status"] == "in_progress"
+    assert body["updated"][0]["status"] == "done"
+    assert body["updated"][0]["title"] == "Todos e2e todo"
+    assert body["deleted"] == [doomed.json()["id"]]
+
+    assert [event for event, _ in events] == ["todo.bulk"]
+    assert [todo["id"] for todo in events[0][1]["created"]] == [todo["id"] for todo in body["created"]]
+    assert sorted(notified) == sorted([
+        'You were assigned task "Bulk one"',
+        'You were assigned task "Todos e2e todo"',
+    ])
+
+    todos = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id}).json()
+    assert {todo["title"] for todo in todos} == {"Bulk one", "Bulk two", "Todos e2e todo"}
+
+
+def test_bulk_todos_should_roll_back_when_any_operation_fails(client: TestClient, auth_headers, team_id, todo_id):
+    """Test a missing todo should fail the whole batch without applying the other operations"""
+    response = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={
+            "team_id": team_id,
+            "operations": [
+                {"op": "create", "title": "Never stored"},
+                {"op": "update", "id": todo_id, "status": "done"},
+                {"op": "delete", "id": "00000000-0000-0000-0000-000000000000"},
+            ],
+        },
+    )
+
+    assert response.status_code == 404
+    todos = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id}).json()
+    assert [(todo["title"], todo["status"]) for todo in todos] == [("Todos e2e todo", "backlog")]
+
+
+def test_bulk_todos_should_store_offset_due_dates_as_utc(client: TestClient, auth_headers, team_id, todo_id):
+    """Test bulk create and update should accept due dates with a UTC offset or Z"""
+    response = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={
+            "team_id": team_id,
+            "operations": [
+                {"op": "create", "title": "Bulk offset", "due_date": "2030-01-01T10:00:00+02:00"},
+                {"op": "update", "id": todo_id, "due_date": "2030-02-01T08:00:00Z"},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"][0]["due_date"].startswith("2030-01-01T08:00:00")
+    assert body["updated"][0]["due_date"].startswith("2030-02-01T08:00:00")
+
+
+def test_bulk_todos_should_use_a_fixed_number_of_queries(client: TestClient, auth_headers, team_id, query_counter):
+    """Test the query count of a bulk request should not grow with the number of operations"""
+    created = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={"team_id": team_id, "operations": [{"op": "create", "title": f"Card {i}"} for i in range(40)]},
+    )
+    assert created.status_code == 200
+    ids = [todo["id"] for todo in created.json()["created"]]
+
+    query_counter.clear()
+    response = client.post(
+        "/api/todos/bulk",
+        headers=auth_headers,
+        json={
+            "team_id": team_id,
+            "operations": [{"op": "create", "title": f"New card {i}"} for i in range(20)]
+            + [{"op": "update", "id": todo_id, "status": "done"} for todo_id in ids[:20]]
+            + [{"op": "delete", "id": todo_id} for todo_id in ids[20:]],
+        },
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["updated"]) == 20
+    assert len(query_counter) <= 8, query_counter
+
+
+async def _backdate_todos(db, team_id: str):
+    """Move the team's todos an hour into the past, before any sync cursor taken now"""
+    await db.execute(
+        text("UPDATE todos SET updated_at = updated_at - INTERVAL '1 hour' WHERE team_id = CAST(:team_id AS UUID)"),
+        {"team_id": team_id},
+    )
+    await db.commit()
+
+
+def test_todo_changes_should_return_only_changes_and_tombstones_since_cursor(
+    client: TestClient, auth_headers, team_id, app_client, db_session
+):
+    """Test GET /api/todos/changes should return updated and created todos plus deleted ids"""
+    titles = ["Sync kept", "Sync edited", "Sync deleted"]
+    ids = {}
+    for title in titles:
+        response = client.post("/api/todos", headers=auth_headers, json={"title": title, "team_id": team_id})
+        assert response.status_code == 201
+        ids[title] = response.json()["id"]
+    app_client.portal.call(_backdate_todos, db_session, team_id)
+
+    snapshot = client.get("/api/todos/changes", headers=auth_headers, params={"teamId": team_id})
+    assert snapshot.status_code == 200
+    assert {todo["title"] for todo in snapshot.json()["todos"]} == set(titles)
+    assert snapshot.json()["deleted"] == []
+    assert snapshot.json()["snapshot"] is True
+
+    assert client.patch(f"/api/todos/{ids['Sync edited']}", headers=auth_headers, json={"status": "done"}).status_code == 200
+    assert client.delete(f"/api/todos/{ids['Sync deleted']}", headers=auth_headers).status_code == 200
+    created = client.post("/api/todos", headers=auth_headers, json={"title": "Sync created", "team_id": team_id})
+    assert created.status_code == 201
+
+    delta = client.get(
+        "/api/todos/changes",
+        headers=auth_headers,
+        params={"teamId": team_id, "since": snapshot.json()["cursor"]},
+    )
+    assert delta.status_code == 200
+    body = delta.json()
+    assert {todo["title"] for todo in body["todos"]} == {"Sync edited", "Sync created"}
+    assert body["deleted"] == [ids["Sync deleted"]]
+    assert body["cursor"]
+    assert body["snapshot"] is False
+
+
+def test_todo_changes_should_send_a_snapshot_for_cursors_past_tombstone_retention(
+    client: TestClient, auth_headers, team_id, todo_id
+):
+    """Test a cursor older than the tombstone retention should get every todo, flagged as a snapshot"""
+    from datetime import datetime, timedelta, timezone
+    from app.core.config import settings
+    from app.core.pagination import encode_cursor
+
+    stale = datetime.now(timezone.utc) - timedelta(days=settings.TODO_TOMBSTONE_RETENTION_DAYS, hours=1)
+    response = client.get(
+        "/api/todos/changes",
+        headers=auth_headers,
+        params={"teamId": team_id, "since": encode_cursor([stale.isoformat()])},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["snapshot"] is True
+    assert [todo["id"] for todo in body["todos"]] == [todo_id]
+    assert body["deleted"] == []
+
+
+def test_prune_tombstones_should_delete_only_those_past_retention(
+    client: TestClient, auth_headers, team_id, app_client, db_session
+):
+    """Test prune_tombstones should keep tombstones within TODO_TOMBSTONE_RETENTION_DAYS"""
+    from sqlalchemy import select, text
+    from app.core.config import settings
+    from app.models.todo import TodoTombstone
+    from app.services.todo_service import TodoService
+
+    ids = []
+    for title in ("Pruned", "Kept"):
+        todo = client.post("/api/todos", headers=auth_headers, json={"title": title, "team_id": team_id}).json()
+        assert client.delete(f"/api/todos/{todo['id']}", headers=auth_headers).status_code == 200
+        ids.append(todo["id"])
+
+    async def prune():
+        await db_session.execute(
+            text(
+                "UPDATE todo_tombstones SET deleted_at = now() - make_interval(days => :days + 1)"
+                " WHERE id = CAST(:id AS UUID)"
+            ),
+            {"days": settings.TODO_TOMBSTONE_RETENTION_DAYS, "id": ids[0]},
+        )
+        pruned = await TodoService.prune_tombstones(await db_session.connection())
+        remaining = (await db_session.scalars(select(TodoTombstone.id).where(TodoTombstone.team_id == team_id))).all()
+        return pruned, [str(tombstone_id) for tombstone_id in remaining]
+
+    assert app_client.portal.call(prune) == (1, [ids[1]])
+
+
+def test_todo_changes_should_reject_invalid_cursor(client: TestClient, auth_headers, team_id):
+    """Test GET /api/todos/changes should return 400 for a malformed since cursor"""
+    response = client.get(
+        "/api/todos/changes",
+        headers=auth_headers,
+        params={"teamId": team_id, "since": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+
+
+def test_get_todos_should_answer_304_until_the_team_changes(client: TestClient, auth_headers, team_id, todo_id, query_counter):
+    """Test GET /api/todos should honour If-None-Match without loading todos, until a mutation"""
+    first = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    query_counter.clear()
+    cached = client.get("/api/todos", headers={**auth_headers, "If-None-Match": etag}, params={"teamId": team_id})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert not any("FROM todos" in statement for statement in query_counter), query_counter
+
+    paged = client.get("/api/todos", headers={**auth_headers, "If-None-Match": etag}, params={"teamId": team_id, "limit": 1})
+    assert paged.status_code == 200
+
+    assert client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"status": "done"}).status_code == 200
+    changed = client.get("/api/todos", headers={**auth_headers, "If-None-Match": etag}, params={"teamId": team_id})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()[0]["status"] == "done"
+
+
+def test_get_todos_should_not_answer_304_for_the_overdue_view(client: TestClient, auth_headers, team_id, todo_id):
+    """Test the overdue list should carry no ETag, since todos turn overdue without any write"""
+    params = {"teamId": team_id, "overdue": "true"}
+    first = client.get("/api/todos", headers=auth_headers, params=params)
+    assert first.status_code == 200
+    assert "ETag" not in first.headers
+
+    plain_etag = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id}).headers["ETag"]
+    for if_none_match in ("*", plain_etag):
+        again = client.get("/api/todos", headers={**auth_headers, "If-None-Match": if_none_match}, params=params)
+        assert again.status_code == 200
+
+
+def test_get_todos_should_filter_on_the_server(client: TestClient, auth_headers, team_id):
+    """Test GET /api/todos should filter by status, assignee, unassigned, overdue and due window"""
+    member = client.post(
+        f"/api/teams/{team_id}/members",
+        headers=auth_headers,
+        json={"email": f"filter-assignee+{pytest.current_time}@example.com", "name": "Filter Assignee"},
+    )
+    assert member.status_code == 200
+    assignee_id = member.json()["user_id"]
+    seeds = [
+        {"title": "Late mine", "status": "in_progress", "assignee_id": assignee_id, "due_date": "2000-01-01T00:00:00"},
+        {"title": "Future open", "status": "in_progress", "due_date": "2999-06-01T00:00:00"},
+        {"title": "Late done", "status": "done", "assignee_id": assignee_id, "due_date": "2000-01-01T00:00:00"},
+        {"title": "Undated", "status": "backlog"},
+    ]
+    for seed in seeds:
+        assert client.post("/api/todos", headers=auth_headers, json={**seed, "team_id": team_id}).status_code == 201
+
+    def titles(**params):
+        response = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id, **params})
+        assert response.status_code == 200, response.text
+        return {todo["title"] for todo in response.json()}
+
+    assert titles(status="in_progress", assigneeId=assignee_id) == {"Late mine"}
+    assert titles(status=["in_progress", "done"]) == {"Late mine", "Future open", "Late done"}
+    assert titles(unassigned="true") == {"Future open", "Undated"}
+    assert titles(overdue="true") == {"Late mine"}
+    assert titles(dueAfter="2999-01-01T00:00:00Z", dueBefore="3000-01-01T00:00:00Z") == {"Future open"}
+
+    conflicting = client.get(
+        "/api/todos",
+        headers=auth_headers,
+        params={"teamId": team_id, "assigneeId": assignee_id, "unassigned": "true"},
+    )
+    assert conflicting.status_code == 400
+
+
+async def _spread_timestamps(db, team_id: str):
+    """Give the team's todos distinct created_at/updated_at values in a shuffled order"""
+    await db.execute(
+        text(
+            "UPDATE todos SET created_at = created_at - random() * INTERVAL '1 day',"
+            " updated_at = updated_at - random() * INTERVAL '1 day'"
+            " WHERE team_id = CAST(:team_id AS UUID)"
+        ),
+        {"team_id": team_id},
+    )
+    await db.commit()
+
+
+@pytest.mark.parametrize("sort", ["created_at", "updated_at"])
+def test_get_todos_should_page_through_newest_first_sorts(client: TestClient, auth_headers, team_id, app_client, db_session, sort):
+    """Test GET /api/todos?sort= should walk every todo newest first with its cursors"""
+    for i in range(5):
+        assert client.post("/api/todos", headers=auth_headers, json={"title": f"Sorted {i}", "team_id": team_id}).status_code == 201
+    app_client.portal.call(_spread_timestamps, db_session, team_id)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"teamId": team_id, "limit": 2, "sort": sort}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/todos", headers=auth_headers, params=params)
+        assert response.status_code == 200
+        seen.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len({todo["id"] for todo in seen}) == 5
+    keys = [(todo[sort], todo["id"]) for todo in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_get_todos_should_reject_cursor_from_another_sort(client: TestClient, auth_headers, team_id):
+    """Test a cursor issued for one sort should be rejected by another"""
+    for i in range(3):
+        assert client.post("/api/todos", headers=auth_headers, json={"title": f"Cursor {i}", "team_id": team_id}).status_code == 201
+    first = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id, "limit": 1, "sort": "created_at"})
+    cursor = first.headers["X-Next-Cursor"]
+
+    response = client.get("/api/todos", headers=auth_headers, params={"teamId": team_id, "limit": 1, "cursor": cursor})
+    assert response.status_code == 400
@@ -87,6 +87,7 @@ export const TopBar = () => {
                     sx={{ fontWeight: notification.read ? 400 : 600 }}
                   >
                     {notification.message}
+                    {notification.count > 1 && ` (×${notification.count})`}
                   </Typography>
                   <Typography variant="caption" color="text.secondary">
                     {new Date(notification.createdAt).toLocaleString()}
@@ -1,8 +1,13 @@
 import { useEffect, useRef } from 'react';
 import { io, Socket } from 'socket.io-client';
 import { useAppDispatch, useAppSelector } from '.';
-import { todoDeleted, todoUpserted } from '../store/slices/todosSlice';
-import { notificationReceived, type Notification } from '../store/slices/notificationsSlice';
+import { applyTodoDelta, fetchTodos, todoDeleted, todoUpserted } from '../store/slices/todosSlice';
+import { fetchTeams } from '../store/slices/teamsSlice';
+import {
+  fetchNotifications,
+  notificationReceived,
+  type Notification,
+} from '../store/slices/notificationsSlice';
 import type { Todo } from '../types';
 
 const apiUrl = import.meta.env.VITE_API_URL ?? 'http://localhost:5001/api';
@@ -50,13 +55,42 @@ const transformTodo = (data: any): Todo => {
         },
     createdAt: data.created_at || data.createdAt,
     updatedAt: data.updated_at || data.updatedAt,
+    version: data.version,
   };
 };
 
+// todo.delta carries only the changed fields, keyed as in the REST body
+const deltaFields: Record<string, (value: any) => Partial<Todo>> = {
+  title: (value) => ({ title: value }),
+  description: (value) => ({ description: value }),
+  status: (value) => ({ status: value }),
+  due_date: (value) => ({ dueDate: value }),
+  assignee: (value) => ({
+    assignee: value ? { id: value.id, email: value.email, name: value.name } : null,
+  }),
+  updated_at: (value) => ({ updatedAt: value }),
+};
+
+const transformTodoChanges = (changes: Record<string, any>): Partial<Todo> =>
+  Object.entries(changes).reduce<Partial<Todo>>(
+    (result, [key, value]) => ({ ...result, ...deltaFields[key]?.(value) }),
+    {},
+  );
+
+// Second argument of room events while the server keeps a replay buffer
+type SequenceMeta = { room: string; seq: number; epoch: string };
+
 export const useRealtime = (teamId?: string) => {
   const token = useAppSelector((state) => state.auth.token);
   const dispatch = useAppDispatch();
   const socketRef = useRef<Socket | null>(null);
+  // Last sequence seen per room, so a reconnect resumes instead of reloading
+  const positionsRef = useRef<Record<string, { epoch: string; seq: number }>>({});
+  const teamIdRef = useRef(teamId);
+  teamIdRef.current = teamId;
+  const teams = useAppSelector((state) => state.teams.teams);
+  const teamIdsRef = useRef(new Set<string>());
+  teamIdsRef.current = new Set(teams.map((team) => team.id));
 
   useEffect(() => {
     if (!token) {
@@ -114,66 +148,125 @@ export const useRealtime = (teamId?: string) => {
     
     socketRef.current = socket;
     
-    socket.on('todo.created', (data: any) => {
-      console.log('✅ Received todo.created event:', data);
-      const transformed = transformTodo(data);
-      dispatch(todoUpserted(transformed));
+    const todoHandlers: Record<string, (data: any) => void> = {
+      'todo.created': (data: any) => {
+        dispatch(todoUpserted(transformTodo(data)));
+      },
+      'todo.updated': (data: any) => {
+        dispatch(todoUpserted(transformTodo(data)));
+      },
+      'todo.delta': (delta: { id: string; base_version: number; version: number; changes: Record<string, any> }) => {
+        dispatch(
+          applyTodoDelta({
+            id: delta.id,
+            baseVersion: delta.base_version,
+            version: delta.version,
+            changes: transformTodoChanges(delta.changes),
+          }),
+        );
+      },
+      'todo.deleted': (payload: { id: string }) => {
+        dispatch(todoDeleted(payload.id));
+      },
+      'todo.bulk': (data: { created: any[]; updated: any[]; deleted: string[] }) => {
+        [...data.created, ...data.updated].forEach((todo) => {
+          dispatch(todoUpserted(transformTodo(todo)));
+        });
+        data.deleted.forEach((id) => {
+          dispatch(todoDeleted(id));
+        });
+      },
+    };
+
+    const track = (meta?: SequenceMeta) => {
+      if (meta) {
+        positionsRef.current[meta.room] = { epoch: meta.epoch, seq: meta.seq };
+      }
+    };
+
+    // The socket is in every team's room; only the open board's todos are kept
+    const forCurrentTeam = (data: any) => !data?.team_id || data.team_id === teamIdRef.current;
+
+    Object.entries(todoHandlers).forEach(([event, handler]) => {
+      socket.on(event, (data: any, meta?: SequenceMeta) => {
+        console.log(`✅ Received ${event} event:`, data);
+        track(meta);
+        if (forCurrentTeam(data)) {
+          handler(data);
+        }
+      });
     });
-    
-    socket.on('todo.updated', (data: any) => {
-      console.log('✅ Received todo.updated event:', data);
-      const transformed = transformTodo(data);
-      dispatch(todoUpserted(transformed));
+
+    // With REALTIME_BATCH_INTERVAL_MS set, a team room's events arrive together, in order
+    socket.on('todo.batch', (batch: { events: { event: string; payload: any }[] }, meta?: SequenceMeta) => {
+      console.log(`✅ Received todo.batch event with ${batch.events.length} events`);
+      track(meta);
+      batch.events
+        .filter(({ payload }) => forCurrentTeam(payload))
+        .forEach(({ event, payload }) => todoHandlers[event]?.(payload));
     });
-    
-    socket.on('todo.deleted', (payload: { id: string }) => {
-      console.log('✅ Received todo.deleted event:', payload);
-      dispatch(todoDeleted(payload.id));
+
+    // The server joins every team room on connect; after a reconnect, pass the
+    // last sequence seen so it replays only what was missed
+    socket.io.on('reconnect', () => {
+      const positions = positionsRef.current;
+      const userRoom = Object.keys(positions).find((room) => room.startsWith('user-'));
+      if (userRoom) {
+        socket.emit('resume', positions[userRoom]);
+      }
+      const currentTeamId = teamIdRef.current;
+      if (currentTeamId) {
+        socket.emit('joinTeam', { teamId: currentTeamId, ...positions[`team-${currentTeamId}`] });
+      }
     });
-    
+
+    // The missed events are no longer buffered: reload what the room covers
+    socket.on('resync.required', ({ room }: { room: string }) => {
+      console.log('Replay unavailable, reloading:', room);
+      delete positionsRef.current[room];
+      if (room.startsWith('team-')) {
+        dispatch(fetchTodos(room.slice('team-'.length)));
+      } else {
+        dispatch(fetchNotifications());
+      }
+    });
+
     socket.on('team.joined', (data: any) => {
       console.log('✅ Successfully joined team room:', data);
     });
+
+    // Pushed when the user creates or is added to a team, which may not be listed yet
+    socket.on('team.added', (data: { teamId: string }) => {
+      console.log('✅ Added to team room:', data);
+      if (!teamIdsRef.current.has(data.teamId)) {
+        dispatch(fetchTeams());
+      }
+    });
     
-    socket.on('notification.created', (notification: any) => {
+    const onNotification = (notification: any) => {
       const transformed: Notification = {
         id: notification.id,
         type: notification.type,
         message: notification.message,
         read: notification.read,
+        count: notification.count ?? 1,
         createdAt: notification.created_at || notification.createdAt,
       };
       dispatch(notificationReceived(transformed));
-    });
+    };
+
+    const onUserEvent = (notification: any, meta?: SequenceMeta) => {
+      track(meta);
+      onNotification(notification);
+    };
+
+    socket.on('notification.created', onUserEvent);
+    socket.on('notification.updated', onUserEvent);
     
     return () => {
       socket.disconnect();
       socketRef.current = null;
     };
   }, [dispatch, token]);
-
-  useEffect(() => {
-    if (!teamId) {
-      return;
-    }
-    
-    const joinTeam = () => {
-      if (socketRef.current?.connected) {
-        console.log('Joining team room:', teamId);
-        socketRef.current.emit('joinTeam', { teamId }, (response: any) => {
-          console.log('Join team response:', response);
-        });
-      }
-    };
-    
-    if (socketRef.current?.connected) {
-      joinTeam();
-    } else if (socketRef.current) {
-      socketRef.current.once('connect', () => {
-        console.log('Socket connected, joining team:', teamId);
-        joinTeam();
-      });
-    }
-  }, [teamId]);
 };
 
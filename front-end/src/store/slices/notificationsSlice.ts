@@ -7,6 +7,7 @@ export type Notification = {
   type: 'todo.created' | 'todo.updated' | 'todo.deleted';
   message: string;
   read: boolean;
+  count: number;
   createdAt: string;
 };
 
@@ -28,6 +29,7 @@ const transformNotification = (data: any): Notification => {
     type: data.type,
     message: data.message,
     read: data.read,
+    count: data.count ?? 1,
     createdAt: data.created_at || data.createdAt,
   };
 };
@@ -51,7 +53,9 @@ const notificationsSlice = createSlice({
   initialState,
   reducers: {
     notificationReceived(state, action: PayloadAction<Notification>) {
-      state.items = [action.payload, ...state.items].slice(0, 50);
+      // Coalesced notifications arrive again with the same id and a higher count
+      const others = state.items.filter((item) => item.id !== action.payload.id);
+      state.items = [action.payload, ...others].slice(0, 50);
     },
     clearNotifications(state) {
       state.items = [];
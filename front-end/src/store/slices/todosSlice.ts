@@ -94,6 +94,34 @@ export const deleteTodo = createAsyncThunk<string, string>(
   },
 );
 
+export type TodoDelta = {
+  id: string;
+  baseVersion: number;
+  version: number;
+  changes: Partial<Todo>;
+};
+
+// A todo still at the delta's base version takes the changes; one at another
+// version missed a change, so it is refetched instead
+export const applyTodoDelta = createAsyncThunk<Todo | null, TodoDelta, { state: { todos: TodosState } }>(
+  'todos/applyDelta',
+  async (delta, { getState, rejectWithValue }) => {
+    const current = getState().todos.items.find((todo) => todo.id === delta.id);
+    if (!current || (current.version ?? 0) >= delta.version) {
+      return null;
+    }
+    if (current.version === delta.baseVersion) {
+      return { ...current, ...delta.changes, version: delta.version };
+    }
+    try {
+      const { data } = await apiClient.get<Todo>(`/todos/${delta.id}`);
+      return data;
+    } catch (error: any) {
+      return rejectWithValue(error.response?.data?.message ?? 'Unable to resync todo');
+    }
+  },
+);
+
 const upsertTodo = (items: Todo[], todo: Todo) => {
   const idx = items.findIndex((item) => item.id === todo.id);
   if (idx >= 0) {
@@ -138,6 +166,11 @@ const todosSlice = createSlice({
       .addCase(updateTodo.fulfilled, (state, action) => {
         upsertTodo(state.items, action.payload);
       })
+      .addCase(applyTodoDelta.fulfilled, (state, action) => {
+        if (action.payload) {
+          upsertTodo(state.items, action.payload);
+        }
+      })
       .addCase(deleteTodo.fulfilled, (state, action) => {
         state.items = state.items.filter((todo) => todo.id !== action.payload);
       });
@@ -33,6 +33,7 @@ export type Todo = {
   team: Team;
   createdAt?: string;
   updatedAt?: string;
+  version?: number;
 };
 
 export type AuthResponse = {